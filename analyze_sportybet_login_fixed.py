@@ -16,17 +16,19 @@ if not os.environ.get('VIRTUAL_ENV'):
 
 # Now we're in the virtual environment, import normally
 import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from datetime import datetime
 import json
 
+sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
+from html_parser import load_document
+from http_transport import create_session
+from rate_limiter import get_scheduler
+
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
+    from driver_pool import get_driver_pool
+    from page_readiness import navigate_and_wait, page_settled
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
@@ -55,6 +57,7 @@ def analyze_sportybet_comprehensive():
     ]
     
     analysis_results = []
+    session = create_session(headers)
     
     print("\n📊 STATIC ANALYSIS WITH REQUESTS")
     print("-" * 40)
@@ -62,7 +65,7 @@ def analyze_sportybet_comprehensive():
     for name, url in urls_to_analyze:
         try:
             print(f"\n🌐 Testing {name}: {url}")
-            response = requests.get(url, headers=headers, timeout=30)
+            response = session.get(url)
             
             if response.status_code == 200:
                 print(f"✅ Success: {response.status_code}")
@@ -74,18 +77,18 @@ def analyze_sportybet_comprehensive():
                     f.write(response.text)
                 
                 # Analyze
-                soup = BeautifulSoup(response.text, 'html.parser')
+                document = load_document(response.text)
                 
                 page_analysis = {
                     'name': name,
                     'url': url,
                     'status': response.status_code,
-                    'title': soup.title.string if soup.title else 'No title',
-                    'has_app_div': bool(soup.find('div', {'id': 'app'})),
+                    'title': document.title or 'No title',
+                    'has_app_div': bool(document.select('div[id="app"]')),
                     'is_spa': 'logoLoading' in response.text or 'react' in response.text.lower(),
-                    'scripts': len(soup.find_all('script')),
-                    'forms': len(soup.find_all('form')),
-                    'inputs': len(soup.find_all('input')),
+                    'scripts': document.count('script'),
+                    'forms': document.count('form'),
+                    'inputs': document.count('input'),
                     'html_file': str(html_file)
                 }
                 
@@ -133,20 +136,15 @@ def analyze_with_selenium(url):
         
     print(f"\n🤖 Selenium analysis of: {url}")
     
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
+    pool = get_driver_pool(blocking='interactive')
     driver = None
+    broken = False
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
+        driver = pool.acquire()
         
         print("⏳ Waiting for JavaScript to load...")
-        import time
-        time.sleep(15)  # Wait for SPA to fully load
+        readiness = navigate_and_wait(driver, url, page_settled("#app"), scheduler=get_scheduler())
+        print(f"⏱️ SPA ready: {readiness.ready} after {readiness.waited:.1f}s")
         
         # Look for login-related elements after JavaScript loads
         login_selectors = [
@@ -197,10 +195,10 @@ def analyze_with_selenium(url):
         
     except Exception as e:
         print(f"❌ Selenium error: {e}")
+        broken = True
         return None
     finally:
-        if driver:
-            driver.quit()
+        pool.release(driver, broken=broken)
 
 def generate_authentication_solution(analysis_results):
     """Generate specific authentication solution based on analysis"""
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Benchmark
+Parse + query time of each html_parser backend over the saved pages in temp/,
+running the same lookups the scrapers do (app div, scripts, selector probes).
+Probes go through SelectorIndex; --no-index runs one select() per selector.
+--scripts instead compares pulling out the <script> bodies from a full parse
+against iter_scripts(), by time and peak Python memory
+
+  python benchmarks/bench_html_parsers.py
+  python benchmarks/bench_html_parsers.py --runs 10 --backend selectolax --backend html.parser
+  python benchmarks/bench_html_parsers.py --no-index
+  python benchmarks/bench_html_parsers.py --scripts
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from html_parser import BACKENDS, SelectorIndex, iter_scripts, parse_html, resolve_backend  # noqa: E402
+
+# The union of the selectors parse_matches / parse_matches_selenium probe
+SELECTORS = [
+    '.match', '.game', '.fixture', '.event', 'tbody tr', 'li[class*="event"]',
+    "tr[class*='match']", "div[class*='match']", "div[class*='event']", "div[class*='game']",
+    '[class*="match"]', '[class*="event"]', '[data-match]', '[data-event]', '[data-fixture]'
+]
+
+
+def workload(html, backend, use_index=True):
+    soup = parse_html(html, backend)
+    soup.find('div', {'id': 'app'})
+    scripts = [s.string for s in soup.find_all('script') if s.string]
+    total = len(soup.find_all())
+    probe = SelectorIndex(soup) if use_index else soup
+    hits = sum(len(probe.select(selector)) for selector in SELECTORS)
+    return total, len(scripts), hits
+
+
+def measure(html, backend, runs, use_index=True):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = workload(html, backend, use_index)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def script_bodies(html, backend):
+    if backend == 'scan':
+        return [s.text for s in iter_scripts(html) if s.text]
+    return [s.string for s in parse_html(html, backend).find_all('script') if s.string]
+
+
+def measure_scripts(html, backend, runs):
+    """(median seconds, peak traced bytes, script count); selectolax's own C
+    allocations are invisible to tracemalloc, so its peak is a lower bound"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        bodies = script_bodies(html, backend)
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    script_bodies(html, backend)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples), peak, len(bodies)
+
+
+def scripts_report(pages, backends, runs):
+    modes = backends + ['scan']
+    print(f"\n📜 Script extraction, median of {runs} runs: ms / peak traced MB")
+    print(f"{'page':40} {'KB':>7}" + ''.join(f" {m:>18}" for m in modes) + "   scripts")
+    for page in pages:
+        html = page.read_text(encoding='utf-8', errors='replace')
+        row = f"{page.name[:40]:40} {len(html) / 1024:>7.0f}"
+        counts = set()
+        for mode in modes:
+            seconds, peak, count = measure_scripts(html, mode, runs)
+            counts.add(count)
+            row += f" {seconds * 1000:>9.1f} / {peak / 1e6:>6.1f}"
+        print(row + "   " + '/'.join(map(str, sorted(counts))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends on saved pages')
+    parser.add_argument('--fixtures', default=str(ROOT / 'temp'), help='Directory of saved .html pages')
+    parser.add_argument('--runs', type=int, default=5, help='Repetitions per page and backend')
+    parser.add_argument('--backend', action='append', choices=BACKENDS, help='Backends to compare (default: all installed)')
+    parser.add_argument('--no-index', action='store_true', help='Probe with one select() per selector')
+    parser.add_argument('--scripts', action='store_true', help='Compare script-only extraction instead')
+    args = parser.parse_args()
+
+    backends = []
+    for backend in args.backend or BACKENDS:
+        try:
+            backends.append(resolve_backend(backend))
+        except ImportError as e:
+            print(f"⚠️ Skipping {backend}: {e}")
+
+    pages = sorted(Path(args.fixtures).glob('*.html'))
+    if not pages:
+        print(f"❌ No .html fixtures in {args.fixtures}")
+        return
+    if args.scripts:
+        scripts_report(pages, backends, args.runs)
+        return
+
+    print(f"\n⏱️ Parse + query time, median of {args.runs} runs (ms)")
+    print(f"{'page':40} {'KB':>7}" + ''.join(f" {b:>12}" for b in backends) + "   elements/scripts/hits")
+    totals = {b: 0.0 for b in backends}
+    for page in pages:
+        html = page.read_text(encoding='utf-8', errors='replace')
+        row = f"{page.name[:40]:40} {len(html) / 1024:>7.0f}"
+        counts = {}
+        for backend in backends:
+            seconds, counts[backend] = measure(html, backend, args.runs, not args.no_index)
+            totals[backend] += seconds
+            row += f" {seconds * 1000:>12.1f}"
+        print(row + "   " + "  ".join('/'.join(map(str, c)) for c in counts.values()))
+
+    baseline = totals.get('html.parser')
+    print(f"{'total':48}" + ''.join(f" {totals[b] * 1000:>12.1f}" for b in backends))
+    if baseline:
+        print(f"{'speedup vs html.parser':48}" + ''.join(f" {baseline / totals[b]:>11.1f}x" for b in backends))
+
+
+if __name__ == "__main__":
+    main()
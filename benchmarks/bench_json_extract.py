@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Embedded JSON Extraction Benchmark
+The old non-greedy regex + json.loads extraction against json_extract's
+raw_decode scanner, over the saved pages in temp/ plus a synthetic page
+whose scripts carry a megabyte-sized state blob and a `matches = [...]`
+assignment (the shape the extraction is meant for)
+
+  python benchmarks/bench_json_extract.py
+  python benchmarks/bench_json_extract.py --runs 5 --matches 20000
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from html_parser import iter_scripts  # noqa: E402
+from json_extract import iter_json_assignments, iter_json_values  # noqa: E402
+
+NAMES = ('matches', 'events', 'fixtures', 'data')
+KEYWORDS = ('match', 'event', 'odds', 'team', 'fixture')
+
+# What parse_authenticated_page and find_api_endpoints_from_source used to run
+LEGACY_ASSIGNMENTS = [
+    r'matches\s*[:=]\s*(\[.*?\])',
+    r'events\s*[:=]\s*(\[.*?\])',
+    r'fixtures\s*[:=]\s*(\[.*?\])',
+    r'data\s*[:=]\s*(\{.*?\})'
+]
+LEGACY_OBJECTS = [
+    r'\{[^{}]*(?:"(?:match|event|odds|team|fixture)")[^{}]*\}',
+    r'\[[^\[\]]*(?:"(?:match|event|odds|team|fixture)")[^\[\]]*\]'
+]
+
+
+def synthetic_page(count, seed=7):
+    rng = random.Random(seed)
+    matches = [{
+        'eventId': f"sr:match:{40000000 + i}", 'homeTeamName': f"Home {i}", 'awayTeamName': f"Away {i}",
+        'estimateStartTime': 1751630000000 + i * 60000, 'status': rng.choice([0, 1]),
+        'markets': [{'id': m, 'desc': f"Market {m}", 'outcomes': [
+            {'id': str(o), 'desc': f"Outcome {o}", 'odds': f"{rng.uniform(1.01, 15):.2f}", 'isActive': 1}
+            for o in range(3)]} for m in range(4)]
+    } for i in range(count)]
+    state = {'config': {'country': 'ng', 'currency': 'NGN'}, 'sport': {'tournaments': [
+        {'id': f"sr:tournament:{t}", 'events': matches[t::20]} for t in range(20)]}}
+    return (
+        "<html><head><script>var __debug__ = false; var cfg = {prefix:'ng'};</script></head><body>"
+        f"<script>window.__INITIAL_STATE__ = {json.dumps(state)};</script>"
+        f"<script>var matches = {json.dumps(matches[:count // 4])}; var data = {{\"total\": {count}}};</script>"
+        "</body></html>"
+    )
+
+
+def legacy(scripts):
+    decoded = failed = 0
+    for script in scripts:
+        for pattern in LEGACY_ASSIGNMENTS:
+            for text in re.findall(pattern, script, re.DOTALL):
+                try:
+                    json.loads(text)
+                    decoded += 1
+                except ValueError:
+                    failed += 1
+        if any(keyword in script.lower() for keyword in KEYWORDS):
+            for pattern in LEGACY_OBJECTS:
+                for text in re.findall(pattern, script, re.IGNORECASE):
+                    try:
+                        json.loads(text)
+                        decoded += 1
+                    except ValueError:
+                        failed += 1
+    return decoded, failed
+
+
+def scanner(scripts):
+    decoded = 0
+    for script in scripts:
+        decoded += sum(1 for _ in iter_json_assignments(script, NAMES))
+        if any(keyword in script.lower() for keyword in KEYWORDS):
+            decoded += sum(1 for _ in iter_json_values(script, KEYWORDS))
+    return decoded, 0
+
+
+def timed(function, scripts, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(scripts)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare regex and raw_decode JSON extraction')
+    parser.add_argument('--fixtures', default=str(ROOT / 'temp'), help='Directory of saved .html pages')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--matches', type=int, default=8000, help='Matches in the synthetic page')
+    args = parser.parse_args()
+
+    pages = [(p.name, p.read_text(encoding='utf-8', errors='replace'))
+             for p in sorted(Path(args.fixtures).glob('*.html'))]
+    pages.append((f"synthetic ({args.matches} matches)", synthetic_page(args.matches)))
+
+    print(f"\n⏱️ JSON extraction over script bodies, median of {args.runs} runs")
+    print(f"{'page':40} {'KB':>7} {'regex ms':>10} {'ok/bad':>10} {'scan ms':>10} {'ok':>6} {'speedup':>8}")
+    for name, html in pages:
+        scripts = [s.text for s in iter_scripts(html) if s.text]
+        old_seconds, (old_ok, old_bad) = timed(legacy, scripts, args.runs)
+        new_seconds, (new_ok, _) = timed(scanner, scripts, args.runs)
+        print(f"{name[:40]:40} {len(html) / 1024:>7.0f} {old_seconds * 1000:>10.1f} {f'{old_ok}/{old_bad}':>10} "
+              f"{new_seconds * 1000:>10.1f} {new_ok:>6} {old_seconds / max(new_seconds, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
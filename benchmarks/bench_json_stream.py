@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+JSON Stream Benchmark
+Serves the synthetic all-sports feed from a local HTTP server and reads it
+twice: response.json() plus a walk of the decoded body, as the scrapers did,
+and json_stream's incremental reader. Reports total time, time to the first
+match record and peak Python memory (tracemalloc, with each record handed on
+rather than kept) for each, and whether both found the same matches. A
+chunk-boundary check then feeds a small feed with one team key per match,
+compact and with spaced separators, in random 1-64 character pieces and compares every read with
+iter_match_objects over the decoded body
+
+  python benchmarks/bench_json_stream.py
+  python benchmarks/bench_json_stream.py --mb 50 --rate 20
+  python benchmarks/bench_json_stream.py --fuzz-runs 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from bench_match_walker import synthetic_feed  # noqa: E402
+from json_stream import MatchStream, iter_response_matches  # noqa: E402
+from match_walker import iter_match_objects  # noqa: E402
+
+
+def serve(body, rate):
+    """A local server sending `body` in 16 KB writes, throttled to `rate` MB/s (0 = unthrottled)"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            for i in range(0, len(body), 16384):
+                self.wfile.write(body[i:i + 16384])
+                if rate:
+                    time.sleep(16384 / (rate * 1e6))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def whole_body(url, keep):
+    started = time.perf_counter()
+    response = requests.get(url)
+    found, first = [], None
+    for obj in iter_match_objects(response.json()):
+        first = first or time.perf_counter() - started
+        if keep:
+            found.append(obj)
+    return found, first, None
+
+
+def streamed(url, keep):
+    started = time.perf_counter()
+    stream = MatchStream()
+    found, first = [], None
+    for obj in iter_response_matches(requests.get(url, stream=True), stream=stream):
+        first = first or time.perf_counter() - started
+        if keep:
+            found.append(obj)
+    return found, first, stream
+
+
+def chunked(text, rng, largest=64):
+    """Feed `text` to a fresh MatchStream in random pieces of 1 to `largest` characters"""
+    stream = MatchStream()
+    found = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, largest)
+        found.extend(stream.feed(text[position:position + size], final=position + size >= len(text)))
+        position += size
+    return found
+
+
+def chunk_parity(runs, seed=7):
+    """Reads out of `runs` random chunkings, per separator style, that match the decoded walk"""
+    rng = random.Random(seed)
+    data = json.loads(synthetic_feed(0.2))
+    # With a single team key per match, one misread key is enough to lose it
+    for tournament in data['data']['tournaments']:
+        for event in tournament['events']:
+            del event['awayTeam']
+    expected = list(iter_match_objects(data))
+    results = {}
+    for name, separators in (('compact', (',', ':')), ('spaced', (' , ', ' : '))):
+        text = json.dumps(data, separators=separators)
+        results[name] = sum(chunked(text, rng) == expected for _ in range(runs))
+    return results, len(expected)
+
+
+def peak_memory(reader, url):
+    """Peak traced memory of a read that hands each record on instead of keeping it"""
+    tracemalloc.start()
+    reader(url, keep=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare whole-body and streaming JSON match reads')
+    parser.add_argument('--mb', type=float, default=20, help='Synthetic feed size in MB of JSON')
+    parser.add_argument('--rate', type=float, default=0, help='Server send rate in MB/s, 0 = as fast as possible')
+    parser.add_argument('--fuzz-runs', type=int, default=20, help='Random chunkings per separator style')
+    args = parser.parse_args()
+
+    body = synthetic_feed(args.mb).encode()
+    server = serve(body, args.rate)
+    url = f"http://127.0.0.1:{server.server_port}/feed"
+    print(f"\n📦 Synthetic feed: {len(body) / 1e6:.1f} MB" + (f" at {args.rate} MB/s" if args.rate else ""))
+
+    print(f"{'reader':12} {'seconds':>9} {'first (s)':>10} {'peak MB':>9} {'matches':>9}")
+    results = {}
+    for name, reader in (('whole body', whole_body), ('streamed', streamed)):
+        started = time.perf_counter()
+        found, first, stream = reader(url, keep=True)
+        seconds = time.perf_counter() - started
+        results[name] = found
+        print(f"{name:12} {seconds:>9.2f} {first:>10.3f} {peak_memory(reader, url) / 1e6:>9.1f} {len(found):>9,}")
+        if stream:
+            print(f"{'':12} largest buffer held: {stream.peak_buffer / 1e3:.0f} KB of {stream.received / 1e6:.1f} MB")
+    print(f"identical matches: {results['whole body'] == results['streamed']}")
+    server.shutdown()
+
+    parity, matches = chunk_parity(args.fuzz_runs)
+    print(f"\n✂️ Random 1-64 character chunks, {matches} matches per read")
+    for name, identical in parity.items():
+        print(f"{name:12} {identical}/{args.fuzz_runs} reads identical to the decoded walk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Match Walker Benchmark
+Time over one payload of the old recursive parse_json_matches walk against
+match_walker.iter_match_objects on a synthetic all-sports feed
+of the requested size, plus a deeply nested payload the recursive walk
+cannot finish, and repeated polls read through a learned MatchLayout against
+a full walk each time (finding the matches alone, then with extraction).
+Nodes/s divides the same payload total by each walk's time; the visited
+column shows how many of those nodes each walk reached (the iterative walk
+skips its matches' detail subtrees)
+
+  python benchmarks/bench_match_walker.py
+  python benchmarks/bench_match_walker.py --mb 50 --runs 3
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from match_walker import CONTAINERS, DETAIL_KEYS, TEAM_KEYS, MatchLayout, count_nodes, field_plan  # noqa: E402
+from match_walker import iter_match_objects  # noqa: E402
+
+
+def legacy_walk(data):
+    """The walk parse_json_matches used to do: recursion plus a path string per node"""
+    found = []
+
+    def extract_matches_recursive(obj, path=""):
+        if isinstance(obj, dict):
+            if any(key in obj for key in ['home', 'away', 'team1', 'team2', 'homeTeam', 'awayTeam']):
+                found.append(obj)
+            for key, value in obj.items():
+                extract_matches_recursive(value, f"{path}.{key}" if path else key)
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                extract_matches_recursive(item, f"{path}[{i}]" if path else f"[{i}]")
+
+    extract_matches_recursive(data)
+    return found
+
+
+def iterative_walk(data):
+    return list(iter_match_objects(data))
+
+
+def visited_nodes(data):
+    """Values iter_match_objects reaches: all of them, less whatever sits
+    under a match's detail keys (each skipped subtree still counts itself)"""
+    count = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, dict):
+            if TEAM_KEYS.isdisjoint(node):
+                stack.extend(node.values())
+            else:
+                count += sum(1 for k, v in node.items() if k in DETAIL_KEYS or not isinstance(v, CONTAINERS))
+                stack.extend(v for k, v in node.items() if k not in DETAIL_KEYS and isinstance(v, CONTAINERS))
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def walk_and_extract(data):
+    """A poll without a layout: full walk, field choice per object"""
+    matches = []
+    for obj in iter_match_objects(data):
+        plan = field_plan(obj)
+        if plan:
+            matches.append({field: str(obj[key]) if stringify else obj[key] for field, key, stringify in plan})
+    return matches
+
+
+def layout_extract(layout):
+    def poll(data):
+        return [fields for fields in map(layout.extract, layout.locate(data)) if fields]
+    return poll
+
+
+def synthetic_feed(megabytes, seed=11):
+    """JSON text of roughly `megabytes` MB: tournaments -> events -> markets -> outcomes"""
+    rng = random.Random(seed)
+    tournaments = []
+    size = 0
+    event_id = 0
+    while size < megabytes * 1_000_000:
+        events = []
+        for _ in range(50):
+            event_id += 1
+            events.append({
+                'id': f"sr:match:{event_id}", 'homeTeam': f"Home {event_id}", 'awayTeam': f"Away {event_id}",
+                'startTime': 1751630000000 + event_id * 60000, 'status': rng.choice([0, 1]),
+                'score': {'home': rng.randint(0, 4), 'away': rng.randint(0, 4)},
+                'markets': [{'id': m, 'desc': f"Market {m}", 'status': 0, 'outcomes': [
+                    {'id': str(o), 'desc': f"Outcome {o}", 'odds': f"{rng.uniform(1.01, 15):.2f}", 'isActive': 1}
+                    for o in range(3)]} for m in range(6)]
+            })
+        tournament = {'id': f"sr:tournament:{len(tournaments)}", 'name': f"Tournament {len(tournaments)}",
+                      'events': events}
+        size += len(json.dumps(tournament))
+        tournaments.append(tournament)
+    return json.dumps({'bizCode': 10000, 'data': {'tournaments': tournaments}})
+
+
+def deep_payload(depth):
+    data = {'homeTeam': 'Deep Home', 'awayTeam': 'Deep Away'}
+    for _ in range(depth):
+        data = {'data': [data]}
+    return data
+
+
+def timed(function, data, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(data)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare recursive and iterative match walks')
+    parser.add_argument('--mb', type=float, default=50, help='Synthetic feed size in MB of JSON')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--depth', type=int, default=5000, help='Nesting depth of the deep payload')
+    args = parser.parse_args()
+
+    text = synthetic_feed(args.mb)
+    data = json.loads(text)
+    nodes = count_nodes(data)
+    print(f"\n📦 Synthetic feed: {len(text) / 1e6:.1f} MB, {nodes:,} nodes")
+
+    print(f"{'walker':12} {'seconds':>9} {'visited':>12} {'nodes/s':>14} {'candidates':>11}")
+    baseline = None
+    walks = (('recursive', legacy_walk, nodes), ('iterative', iterative_walk, visited_nodes(data)))
+    for name, walker, visited in walks:
+        seconds, found = timed(walker, data, args.runs)
+        baseline = baseline or seconds
+        print(f"{name:12} {seconds:>9.2f} {visited:>12,} {nodes / seconds:>14,.0f} {len(found):>11,}  "
+              f"{baseline / seconds:.1f}x")
+
+    layout, _ = MatchLayout.learn(data)
+    print(f"\n🔁 Repeated polls, full walk vs learned layout (finding the matches, then with extraction)")
+    print(f"{'poll':12} {'seconds':>9} {'matches':>11}")
+    polls = (('walk', iterative_walk), ('locate', layout.locate),
+             ('full walk', walk_and_extract), ('layout', layout_extract(layout)))
+    for index, (name, poll) in enumerate(polls):
+        seconds, matches = timed(poll, data, args.runs)
+        if index % 2 == 0:
+            baseline = seconds
+        print(f"{name:12} {seconds:>9.4f} {len(matches):>11,}  {baseline / seconds:.1f}x")
+    print(f"identical output: {walk_and_extract(data) == layout_extract(layout)(data)}")
+
+    deep = deep_payload(args.depth)
+    print(f"\n🕳️ Payload nested {args.depth} levels deep")
+    for name, walker in (('recursive', legacy_walk), ('iterative', iterative_walk)):
+        try:
+            print(f"{name:12} {len(walker(deep))} match found")
+        except RecursionError as e:
+            print(f"{name:12} RecursionError: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking Benchmark
+Measures what the shared blocking profile saves on the saved temp/*.html pages
+
+  python benchmarks/bench_resource_blocking.py            # static: resources referenced vs blocked
+  python benchmarks/bench_resource_blocking.py --sizes    # + bytes, via HEAD/GET of each resource
+  python benchmarks/bench_resource_blocking.py --browser  # + render time and bytes in headless Chrome
+
+The static counts only say which references the profile would block. The
+before/after page-load time (loadEventEnd - navigationStart) and bytes over
+the wire (the encodedDataLength of every Network.loadingFinished event in the
+performance log) come from --browser alone, which needs Chrome and network
+access to the pages' asset hosts.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'scripts'))
+
+from resource_blocking import BlockingProfile
+
+
+class ResourceCollector(HTMLParser):
+    """Collect subresource URLs a browser would request while rendering the page"""
+
+    def __init__(self):
+        super().__init__()
+        self.resources = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        url = None
+        if tag in ('script', 'img', 'source', 'video', 'audio', 'iframe'):
+            url = attrs.get('src')
+        elif tag == 'link':
+            rel = (attrs.get('rel') or '').lower()
+            if any(kind in rel for kind in ('stylesheet', 'icon', 'preload', 'prefetch')):
+                url = attrs.get('href')
+        if url and not url.startswith('data:'):
+            if url.startswith('//'):
+                url = 'https:' + url
+            self.resources.append((tag, url))
+
+
+def collect_resources(html):
+    collector = ResourceCollector()
+    collector.feed(html)
+    return collector.resources
+
+
+def resource_sizes(urls):
+    """Content-Length per URL (HEAD, falling back to a GET), fetched concurrently"""
+    from fetch_engine import FetchEngine
+    from http_transport import create_session
+    from rate_limiter import RequestScheduler
+
+    # One-off measurement: no pacing, no retries
+    session = create_session(max_retries=0, deadline=15, scheduler=RequestScheduler(delay=0))
+
+    def size_of(url):
+        response = session.head(url, allow_redirects=True)
+        length = response.headers.get('Content-Length')
+        if length is None:
+            length = len(session.get(url).content)
+        return str(length), response.status_code
+
+    with FetchEngine(fetcher=size_of) as engine:
+        results = asyncio.run(engine.fetch_many(urls))
+    return {r.url: int(r.text) if r.ok else 0 for r in results}
+
+
+def static_report(pages, profile, with_sizes):
+    print(f"\n📊 Static analysis ({profile})")
+    print(f"{'page':42} {'resources':>9} {'blocked':>8} {'bytes':>11} {'blocked bytes':>14}")
+    page_urls = {}
+    for page in pages:
+        resources = collect_resources(page.read_text(encoding='utf-8', errors='replace'))
+        page_urls[page] = list(dict.fromkeys(url for _, url in resources))
+    sizes = {}
+    if with_sizes:
+        sizes = resource_sizes(list({url for urls in page_urls.values() for url in urls}))
+
+    totals = [0, 0, 0, 0]
+    for page, urls in page_urls.items():
+        blocked = [url for url in urls if profile.is_blocked(url)]
+        all_bytes = sum(sizes.get(url, 0) for url in urls)
+        blocked_bytes = sum(sizes.get(url, 0) for url in blocked)
+        row = [len(urls), len(blocked), all_bytes, blocked_bytes]
+        totals = [t + r for t, r in zip(totals, row)]
+        print(f"{page.name[:42]:42} {row[0]:>9} {row[1]:>8} {row[2] if with_sizes else '-':>11} {row[3] if with_sizes else '-':>14}")
+    print(f"{'TOTAL':42} {totals[0]:>9} {totals[1]:>8} {totals[2] if with_sizes else '-':>11} {totals[3] if with_sizes else '-':>14}")
+
+
+LOAD_MS_JS = "var t = performance.timing; return t.loadEventEnd - t.navigationStart;"
+
+
+def network_totals(driver):
+    """(requests finished, bytes over the wire, requests blocked) from the
+    Network.* events in Chrome's performance log since it was last read;
+    bytes are the encodedDataLength of each Network.loadingFinished"""
+    finished = transferred = blocked = 0
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            finished += 1
+            transferred += int(message['params'].get('encodedDataLength', 0))
+        elif message['method'] == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            blocked += 1
+    return finished, transferred, blocked
+
+
+def browser_report(pages, runs):
+    from driver_pool import DriverPool
+    from page_readiness import wait_until, page_settled
+
+    print(f"\n🌐 Headless Chrome, median of {runs} run(s) per page")
+    print(f"{'page':42} {'profile':>8} {'load ms':>8} {'settled s':>9} {'requests':>8} {'blocked':>8} {'bytes':>11}")
+    totals = {}
+    for profile in ('none', 'scrape'):
+        pool = DriverPool(size=1, blocking=profile)
+        totals[profile] = [0, 0]
+        try:
+            for page in pages:
+                samples = []
+                for _ in range(runs):
+                    with pool.driver() as driver:
+                        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                        driver.get_log('performance')  # only this load's events
+                        started = time.monotonic()
+                        driver.get(page.resolve().as_uri())
+                        readiness = wait_until(driver, page_settled(), timeout=60)
+                        settled = readiness.waited if readiness.ready else time.monotonic() - started
+                        requests, transferred, blocked = network_totals(driver)
+                        samples.append({'load': driver.execute_script(LOAD_MS_JS), 'settled': settled,
+                                        'requests': requests, 'blocked': blocked, 'bytes': transferred})
+                samples.sort(key=lambda s: s['load'])
+                median = samples[len(samples) // 2]
+                totals[profile][0] += median['load']
+                totals[profile][1] += median['bytes']
+                print(f"{page.name[:42]:42} {profile:>8} {median['load']:>8} {median['settled']:>9.2f} "
+                      f"{median['requests']:>8} {median['blocked']:>8} {median['bytes']:>11}")
+        finally:
+            pool.close()
+
+    (before_ms, before_bytes), (after_ms, after_bytes) = totals['none'], totals['scrape']
+    print(f"\n⚖️ Before -> after blocking, summed over {len(pages)} pages: "
+          f"load {before_ms} -> {after_ms} ms, transferred {before_bytes:,} -> {after_bytes:,} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resource blocking benchmark over saved pages')
+    parser.add_argument('--pages', default=str(ROOT / 'temp'), help='Directory of saved .html pages')
+    parser.add_argument('--sizes', action='store_true', help='Fetch resource sizes over the network')
+    parser.add_argument('--browser', action='store_true', help='Load pages in headless Chrome with and without blocking')
+    parser.add_argument('--runs', type=int, default=3, help='Browser runs per page')
+    args = parser.parse_args()
+
+    pages = sorted(Path(args.pages).glob('*.html'))
+    if not pages:
+        print(f"❌ No saved pages in {args.pages}")
+        return
+
+    profile = BlockingProfile.named('scrape')
+    static_report(pages, profile, args.sizes)
+    if args.browser:
+        try:
+            browser_report(pages, args.runs)
+        except Exception as e:
+            print(f"❌ Browser comparison could not run (needs Chrome): {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Source Scan Benchmark
+The old find_api_endpoints_from_source scan (nine findall passes, a script
+regex, per-script keyword checks and JSON regexes) against source_scanner's
+single pass, over the saved pages in temp/ and the synthetic state-blob page,
+with the endpoints each one finds
+
+  python benchmarks/bench_source_scan.py
+  python benchmarks/bench_source_scan.py --runs 5 --matches 20000
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from bench_json_extract import synthetic_page  # noqa: E402
+from source_scanner import scan_source  # noqa: E402
+
+LEGACY_API_PATTERNS = [
+    r'["\']https?://[^"\']*api[^"\']*["\']',
+    r'["\']https?://[^"\']*ajax[^"\']*["\']',
+    r'["\']https?://[^"\']*data[^"\']*["\']',
+    r'["\']https?://[^"\']*match[^"\']*["\']',
+    r'["\']https?://[^"\']*event[^"\']*["\']',
+    r'["\']https?://[^"\']*odds[^"\']*["\']',
+    r'baseUrl["\']?\s*:\s*["\'][^"\']+["\']',
+    r'apiUrl["\']?\s*:\s*["\'][^"\']+["\']',
+    r'endpoint["\']?\s*:\s*["\'][^"\']+["\']'
+]
+LEGACY_JSON_PATTERNS = [
+    r'\{[^{}]*(?:"(?:match|event|odds|team|fixture)")[^{}]*\}',
+    r'\[[^\[\]]*(?:"(?:match|event|odds|team|fixture)")[^\[\]]*\]'
+]
+
+
+def legacy_scan(content):
+    endpoints = set()
+    for pattern in LEGACY_API_PATTERNS:
+        for match in re.findall(pattern, content, re.IGNORECASE):
+            endpoint = match.strip('\'"')
+            if endpoint.startswith('http'):
+                endpoints.add(endpoint)
+    script_data = []
+    for script in re.findall(r'<script[^>]*>(.*?)</script>', content, re.DOTALL):
+        if any(keyword in script.lower() for keyword in ['match', 'event', 'odds', 'team', 'fixture']):
+            for pattern in LEGACY_JSON_PATTERNS:
+                for text in re.findall(pattern, script, re.IGNORECASE):
+                    try:
+                        script_data.append(json.loads(text))
+                    except ValueError:
+                        pass
+    return endpoints, script_data
+
+
+def single_pass(content):
+    scan = scan_source(content)
+    return set(scan.endpoints), scan.json_values
+
+
+def timed(function, content, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(content)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare multi-pass and single-pass source scanning')
+    parser.add_argument('--fixtures', default=str(ROOT / 'temp'), help='Directory of saved .html pages')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--matches', type=int, default=8000, help='Matches in the synthetic page')
+    args = parser.parse_args()
+
+    pages = [(p.name, p.read_text(encoding='utf-8', errors='replace'))
+             for p in sorted(Path(args.fixtures).glob('*.html'))]
+    pages.append((f"synthetic ({args.matches} matches)", synthetic_page(args.matches)))
+
+    print(f"\n⏱️ Source scan, median of {args.runs} runs")
+    print(f"{'page':40} {'KB':>7} {'old ms':>9} {'new ms':>9} {'MB/s':>7} {'speedup':>8}  endpoints old/new/shared  json old/new")
+    for name, html in pages:
+        old_seconds, (old_endpoints, old_json) = timed(legacy_scan, html, args.runs)
+        new_seconds, (new_endpoints, new_json) = timed(single_pass, html, args.runs)
+        print(f"{name[:40]:40} {len(html) / 1024:>7.0f} {old_seconds * 1000:>9.1f} {new_seconds * 1000:>9.1f} "
+              f"{len(html) / 1e6 / new_seconds:>7.1f} {old_seconds / new_seconds:>7.1f}x  "
+              f"{len(old_endpoints)}/{len(new_endpoints)}/{len(old_endpoints & new_endpoints)}"
+              f"{'':14}{len(old_json)}/{len(new_json)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Import time of every entry point in a fresh interpreter, and which heavy
+modules (pandas, selenium, bs4) each import drags in
+
+  python benchmarks/bench_startup.py
+  python benchmarks/bench_startup.py --runs 10 --importtime   # + top cumulative imports per script
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = [
+    'sportybet_scraper', 'advanced_scraper', 'api_scraper', 'authenticated_scraper',
+    'authenticated_scraper_fixed', 'hybrid_scraper', 'odds_poller', 'live_feed',
+    'sharded_crawler'
+]
+HEAVY_MODULES = ('pandas', 'selenium', 'bs4')
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {scripts!r})
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, runs):
+    """Median import time over `runs` fresh interpreters"""
+    samples = []
+    heavy = []
+    for _ in range(runs):
+        code = PROBE.format(scripts=str(ROOT / 'scripts'), module=module, heavy=HEAVY_MODULES)
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, [], result.stderr.strip().splitlines()[-1:]
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(report['seconds'])
+        heavy = report['heavy']
+    return statistics.median(samples), heavy, []
+
+
+def top_imports(module, count=5):
+    """Slowest direct imports of `module`, by cumulative time from python -X importtime"""
+    code = f"import sys; sys.path.insert(0, {str(ROOT / 'scripts')!r}); import {module}"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # importtime indents by two spaces per level; the entry point itself sits at one
+        if len(name) - len(name.lstrip()) == 3:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time of each entry point')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per entry point')
+    parser.add_argument('--importtime', action='store_true', help="Also show each entry point's slowest direct imports")
+    args = parser.parse_args()
+
+    print(f"\n⏱️ Import time, median of {args.runs} fresh interpreters")
+    print(f"{'entry point':30} {'ms':>8}  heavy modules loaded")
+    for module in ENTRY_POINTS:
+        seconds, heavy, error = measure(module, args.runs)
+        if seconds is None:
+            print(f"{module:30} {'error':>8}  {error[0] if error else ''}")
+            continue
+        print(f"{module:30} {seconds * 1000:>8.1f}  {', '.join(heavy) or '-'}")
+        if args.importtime:
+            for cumulative, name in top_imports(module):
+                print(f"{'':32}{cumulative / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,5 +19,90 @@ TEST_BET_AMOUNT = 10  # Minimum bet amount in Naira
 MAX_RETRIES = 3
 TIMEOUT = 30
 
+# HTTP transport (scripts/http_transport.py)
+CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+REQUEST_DEADLINE = 60  # Seconds a single call may take, retries included
+BACKOFF_FACTOR = 0.5  # Base of the jittered exponential backoff
+BACKOFF_MAX = 10  # Longest sleep between retries
+POOL_CONNECTIONS = 10  # Hosts kept in the connection pool
+POOL_MAXSIZE = 16  # Keep-alive connections per host
+
+# Conditional-request cache (scripts/http_cache.py), opt-in
+HTTP_CACHE_ENABLED = False
+HTTP_CACHE_DIR = "data/cache/http"
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Request pacing (scripts/rate_limiter.py)
+# DELAY_BETWEEN_REQUESTS (seconds between page requests to one host) is set in
+# test_settings.py. There is no page budget unless a run asks for one
+# (--max-pages on the one-off scrapers)
+RATE_LIMIT_BURST = 3  # Page requests allowed back to back after an idle spell
+# JSON API calls (a /api/ path or an api.* host) get their own, faster budget:
+# 4 req/s sustained per host. A HYBRID_POLL_INTERVAL of 1s therefore keeps up
+# with at most 4 endpoints, and LIVE_POLL_INTERVAL of 5s with about 20 live
+# per-match sources; beyond that polls queue on the bucket and stretch out
+API_REQUEST_DELAY = 0.25
+API_RATE_LIMIT_BURST = 8
+
+# Concurrent fetching
+MAX_CONCURRENT_PER_HOST = 4  # Parallel requests allowed against one host
+MAX_FETCH_WORKERS = 16  # Worker threads shared by the fetch engine
+
+# WebDriver pool (scripts/driver_pool.py)
+DRIVER_POOL_SIZE = 2  # Chrome instances kept warm per profile
+DRIVER_MAX_USES = 20  # Checkouts before a driver is recycled
+
+# Resource blocking (scripts/resource_blocking.py)
+BLOCKED_URL_PATTERNS = None  # None = built-in "scrape" profile; or a list of CDP URL wildcards
+ALLOWED_URL_PATTERNS = []  # Globs exempting deny patterns, e.g. ['*.css*']
+
+# Page readiness (scripts/page_readiness.py)
+READY_TIMEOUT = 30  # Longest wait for a page to settle
+NETWORK_IDLE_SECONDS = 0.5  # No fetch/XHR/resource activity for this long
+DOM_QUIET_SECONDS = 0.5  # No DOM mutation for this long
+
+# API endpoint probing
+PROBE_TIMEOUT = 15  # Per-attempt timeout in seconds
+PROBE_TOTAL_TIMEOUT = 60  # Cap on the whole discovery probe in seconds
+
+# Hybrid scraping (scripts/hybrid_scraper.py)
+HYBRID_POLL_INTERVAL = 1  # Seconds between API polling cycles
+HYBRID_MAX_REBOOTSTRAPS = 3  # Back-to-back rejected polls before giving up
+
+# Odds deltas (scripts/odds_delta.py)
+DELTA_STATE_PATH = "data/state/odds_state.json"  # Last-seen prices, so reruns emit changes only
+
+# Adaptive odds polling (scripts/odds_poller.py)
+LIVE_POLL_INTERVAL = 5  # Seconds between polls of live matches
+NEAR_KICKOFF_POLL_INTERVAL = 15  # ... of matches starting within KICKOFF_WINDOW_MINUTES
+PREMATCH_POLL_INTERVAL = 300  # ... of other pre-match fixtures
+MIN_POLL_INTERVAL = 2  # Floor when odds keep moving
+KICKOFF_WINDOW_MINUTES = 30
+POLL_MAX_FAILURES = 5  # Failed polls in a row (with backoff) before a source is dropped
+MATCH_ODDS_URL = None  # Per-match odds API, e.g. ".../event?eventId={match_id}"; None = list endpoints only
+ODDS_STREAM_PATH = "data/stream/odds.jsonl"
+
+# Live odds feed (scripts/live_feed.py)
+FEED_IDLE_TIMEOUT = 30  # Seconds without a frame before the socket is considered dead
+FEED_MAX_RECONNECTS = 10  # Failed reconnects in a row before giving up
+
+# Sharded crawl (scripts/sharded_crawler.py)
+CRAWL_WORKERS = 0  # Worker processes, 0 = one per CPU
+CRAWL_SHARD_SIZE = 20  # Pages handed to a worker at a time
+CRAWL_MAX_DISCOVERY_PAGES = 200  # Cap on pages read while enumerating the category tree
+
+# Resident service (scripts/scraper_service.py)
+SERVICE_HOST = "127.0.0.1"  # Local only; the API has no authentication
+SERVICE_PORT = 8750
+SERVICE_DELTA_HISTORY = 10000  # Change records kept for GET /deltas
+
+# HTML parsing (scripts/html_parser.py)
+HTML_PARSER_BACKEND = "auto"  # auto, selectolax, lxml or html.parser
+HTML_DOCUMENT_CACHE_SIZE = 32  # Parsed pages kept for reuse across analysis steps
+
+# Streaming JSON responses (scripts/json_stream.py)
+JSON_STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read from the socket at a time
+JSON_STREAM_MATCH_WINDOW = 32 * 1024  # Characters into an object its first team key must appear within
+
 # SofaScore API settings
 SOFASCORE_API_BASE = "https://api.sofascore.com/api/v1"
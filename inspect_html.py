@@ -5,14 +5,18 @@ Use this to examine the HTML structure before implementing parsing
 """
 
 import requests
-from bs4 import BeautifulSoup
 import sys
 import os
 from pathlib import Path
 import json
 
-# Add config directory to path
+# Add config and scripts directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
+
+from html_parser import load_document
+from http_transport import create_session
+from rate_limiter import get_scheduler
 
 try:
     from settings import HEADERS, SPORTYBET_UPCOMING_URL, SPORTYBET_LIVE_URL
@@ -22,6 +26,9 @@ except ImportError:
     SPORTYBET_UPCOMING_URL = "https://sportybet.com/ng/sport/football/sr:category:1/today"
     SPORTYBET_LIVE_URL = "https://sportybet.com/ng/sport/football/sr:category:1/live"
 
+# One pooled session for every page we inspect
+session = create_session(HEADERS)
+
 def inspect_page(url, page_name):
     """Download and inspect page structure"""
     print(f"\n🔍 Inspecting {page_name}: {url}")
@@ -33,10 +40,12 @@ def inspect_page(url, page_name):
         temp_dir.mkdir(exist_ok=True)
         
         # Fetch the page
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        get_scheduler().claim_page(url)
+        response = session.get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Parsed once; every count and probe below reuses the same tree
+        document = load_document(response.text)
         
         # Save full HTML for manual inspection
         html_file = temp_dir / f"{page_name}_source.html"
@@ -44,17 +53,17 @@ def inspect_page(url, page_name):
             f.write(response.text)
         
         print(f"✅ Page downloaded successfully")
-        print(f"📄 Page title: {soup.title.string if soup.title else 'No title'}")
+        print(f"📄 Page title: {document.title or 'No title'}")
         print(f"📏 Page size: {len(response.text):,} characters")
         print(f"🏗️ HTML saved to: {html_file}")
         
         # Analyze page structure
         print(f"\n📊 Page Structure Analysis:")
-        print(f"  • Total elements: {len(soup.find_all())}")
-        print(f"  • Scripts: {len(soup.find_all('script'))}")
-        print(f"  • Links: {len(soup.find_all('a'))}")
-        print(f"  • Images: {len(soup.find_all('img'))}")
-        print(f"  • Divs: {len(soup.find_all('div'))}")
+        print(f"  • Total elements: {document.count()}")
+        print(f"  • Scripts: {document.count('script')}")
+        print(f"  • Links: {document.count('a')}")
+        print(f"  • Images: {document.count('img')}")
+        print(f"  • Divs: {document.count('div')}")
         
         # Look for potential match-related elements
         print(f"\n🔍 Looking for match-related elements...")
@@ -79,7 +88,7 @@ def inspect_page(url, page_name):
         
         for selector in selectors_to_try:
             try:
-                elements = soup.select(selector)
+                elements = document.select(selector)
                 if elements:
                     found_elements[selector] = len(elements)
                     print(f"✅ Found {len(elements)} elements with selector: {selector}")
@@ -105,7 +114,7 @@ def inspect_page(url, page_name):
             text_patterns = ['vs', 'v.', '-', 'against', ':', '|']
             for pattern in text_patterns:
                 elements_with_pattern = []
-                for elem in soup.find_all(text=True):
+                for elem in document.soup.find_all(string=True):
                     if pattern in elem.lower() and len(elem.strip()) > 5:
                         parent = elem.parent
                         if parent and parent.name != 'script':
@@ -119,12 +128,12 @@ def inspect_page(url, page_name):
         
         # Look for JavaScript data
         print(f"\n📜 Checking for JavaScript data...")
-        scripts = soup.find_all('script')
+        scripts = document.scripts
         js_data_found = False
         
         for script in scripts:
-            if script.string:
-                script_content = script.string
+            if script.text:
+                script_content = script.text
                 # Look for JSON-like data structures
                 if any(keyword in script_content for keyword in ['matches', 'events', 'odds', 'teams', 'fixtures']):
                     print(f"📜 Found potential match data in JavaScript")
@@ -142,9 +151,9 @@ def inspect_page(url, page_name):
         analysis_data = {
             'url': url,
             'page_name': page_name,
-            'title': soup.title.string if soup.title else None,
+            'title': document.title,
             'page_size': len(response.text),
-            'total_elements': len(soup.find_all()),
+            'total_elements': document.count(),
             'found_selectors': found_elements,
             'scripts_count': len(scripts),
             'has_potential_js_data': js_data_found
@@ -6,27 +6,24 @@ This handles JavaScript-heavy pages that load content dynamically
 
 import requests
 import json
-import time
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
-import pandas as pd
 from pathlib import Path
 import sys
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from fetch_engine import FetchEngine
+from html_parser import iter_scripts, load_document
+from driver_pool import get_driver_pool
+from page_readiness import navigate_and_wait, page_settled
+from http_transport import create_session
+from rate_limiter import get_scheduler
+
 try:
-    from settings import HEADERS, SPORTYBET_BASE_URL, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
+    from settings import HEADERS, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
 except ImportError as e:
     print(f"❌ Error importing settings: {e}")
     print("Using default settings...")
@@ -39,8 +36,9 @@ class AdvancedSportyBetScraper:
         self.use_selenium = use_selenium
         self.headless = headless
         self.driver = None
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = create_session()
+        self.fetch_engine = FetchEngine(session=self.session)
+        self.scheduler = get_scheduler()
         self.setup_logging()
         self.matches_data = []
         
@@ -60,50 +58,37 @@ class AdvancedSportyBetScraper:
         self.logger = logging.getLogger(__name__)
         
     def setup_selenium(self):
-        """Setup Selenium WebDriver"""
+        """Check out a warm WebDriver from the shared pool"""
         if self.driver:
             return True
             
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(f"--user-agent={HEADERS['User-Agent']}")
-            
-            # Try to use system Chrome first
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.logger.info("✅ Chrome WebDriver initialized")
-                return True
-            except Exception as e:
-                self.logger.error(f"❌ Failed to initialize Chrome: {e}")
-                self.logger.info("💡 Make sure Chrome is installed. On macOS: brew install --cask google-chrome")
-                return False
-                
+            self.driver = get_driver_pool(headless=self.headless).acquire()
+            self.logger.info("✅ Chrome WebDriver ready")
+            return True
         except Exception as e:
-            self.logger.error(f"❌ Error setting up Selenium: {e}")
+            self.logger.error(f"❌ Failed to initialize Chrome: {e}")
+            self.logger.info("💡 Make sure Chrome is installed. On macOS: brew install --cask google-chrome")
             return False
     
     def wait_for_content(self, url, timeout=30):
         """Wait for dynamic content to load"""
         if not self.driver:
             return None
+        
+        from selenium.common.exceptions import TimeoutException
             
         try:
             self.logger.info(f"Loading page: {url}")
-            self.driver.get(url)
             
-            # Wait for the main app container
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.ID, "app"))
-            )
-            
-            # Wait a bit more for dynamic content
-            time.sleep(5)
+            # Wait for the main app container, then for network and DOM to settle
+            readiness = navigate_and_wait(self.driver, url, page_settled("#app"),
+                                          timeout=timeout, scheduler=self.scheduler)
+            if not readiness.ready:
+                if not readiness.state or not readiness.state['counts'].get('#app'):
+                    self.logger.error(f"❌ Timeout waiting for page to load: {url}")
+                    return None
+                self.logger.warning("⚠️ Page still busy at timeout, using what has rendered")
             
             # Try to find common match-related elements
             potential_selectors = [
@@ -119,23 +104,17 @@ class AdvancedSportyBetScraper:
                 ".bet-item"
             ]
             
-            for selector in potential_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        self.logger.info(f"✅ Found {len(elements)} elements with selector: {selector}")
-                        # Log sample content
-                        for i, elem in enumerate(elements[:3]):
-                            try:
-                                text = elem.text[:100] if elem.text else elem.get_attribute('innerHTML')[:100]
-                                self.logger.info(f"  Sample {i+1}: {text}...")
-                            except:
-                                pass
-                        break
-                except:
-                    continue
+            # One page_source round trip, then every probe is answered locally
+            html = self.driver.page_source
+            selector, elements = load_document(html).index.first_match(potential_selectors)
+            if elements:
+                self.logger.info(f"✅ Found {len(elements)} elements with selector: {selector}")
+                # Log sample content
+                for i, elem in enumerate(elements[:3]):
+                    text = elem.get_text(strip=True)[:100] or str(elem)[:100]
+                    self.logger.info(f"  Sample {i+1}: {text}...")
             
-            return self.driver.page_source
+            return html
             
         except TimeoutException:
             self.logger.error(f"❌ Timeout waiting for page to load: {url}")
@@ -156,7 +135,8 @@ class AdvancedSportyBetScraper:
         """Fetch page using requests (for comparison)"""
         try:
             self.logger.info(f"Fetching with requests: {url}")
-            response = self.session.get(url, timeout=30)
+            self.scheduler.claim_page(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.text
         except requests.exceptions.RequestException as e:
@@ -165,7 +145,8 @@ class AdvancedSportyBetScraper:
     
     def parse_matches_selenium(self, html_content):
         """Parse matches from Selenium-rendered HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # wait_for_content has usually parsed this page already
+        document = load_document(html_content)
         matches = []
         
         self.logger.info("Parsing matches from Selenium HTML...")
@@ -194,7 +175,7 @@ class AdvancedSportyBetScraper:
         ]
         
         for selector, description in selectors_to_try:
-            elements = soup.select(selector)
+            elements = document.select(selector)
             if elements:
                 self.logger.info(f"✅ Found {len(elements)} {description}")
                 
@@ -260,14 +241,11 @@ class AdvancedSportyBetScraper:
     
     def parse_matches_requests(self, html_content):
         """Parse matches from requests HTML (minimal content)"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         self.logger.info("Parsing matches from requests HTML...")
         
         # For requests-based content, look for initial data or config
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and ('match' in script.string.lower() or 'event' in script.string.lower()):
+        for script in iter_scripts(html_content):
+            if script.text and ('match' in script.text.lower() or 'event' in script.text.lower()):
                 self.logger.info("Found potential match data in script tag")
                 # You could try to parse JavaScript variables here
                 
@@ -294,6 +272,26 @@ class AdvancedSportyBetScraper:
             
         return []
     
+    def scrape_pages(self, pages):
+        """Scrape several (url, page_type) pairs, fetching them concurrently when possible"""
+        if self.use_selenium and self.setup_selenium():
+            # A single driver renders one page at a time
+            return [self.scrape_page(url, page_type) for url, page_type in pages]
+        
+        results = self.fetch_engine.fetch_all([url for url, _ in pages])
+        
+        page_matches = []
+        for (url, page_type), result in zip(pages, results):
+            self.logger.info(f"Scraping {page_type} from: {url}")
+            if not result.ok:
+                self.logger.error(f"Error fetching {url}: {result.error}")
+                page_matches.append([])
+                continue
+            matches = self.parse_matches_requests(result.text)
+            self.logger.info(f"Found {len(matches)} matches using requests")
+            page_matches.append(matches)
+        return page_matches
+    
     def save_data(self):
         """Save scraped data to file"""
         if not self.matches_data:
@@ -316,6 +314,7 @@ class AdvancedSportyBetScraper:
         # Also save as CSV if we have structured data
         if self.matches_data:
             try:
+                import pandas as pd
                 df = pd.DataFrame(self.matches_data)
                 csv_path = json_path.with_suffix('.csv')
                 df.to_csv(csv_path, index=False)
@@ -328,13 +327,13 @@ class AdvancedSportyBetScraper:
         self.logger.info("🚀 Starting Advanced SportyBet scraper...")
         
         try:
-            # Scrape upcoming matches
-            upcoming_matches = self.scrape_page(SPORTYBET_UPCOMING_URL, "upcoming matches")
-            self.matches_data.extend(upcoming_matches)
-            
-            # Scrape live matches
-            live_matches = self.scrape_page(SPORTYBET_LIVE_URL, "live matches")
-            self.matches_data.extend(live_matches)
+            # Scrape upcoming and live matches
+            pages = [
+                (SPORTYBET_UPCOMING_URL, "upcoming matches"),
+                (SPORTYBET_LIVE_URL, "live matches")
+            ]
+            for matches in self.scrape_pages(pages):
+                self.matches_data.extend(matches)
             
             # Save all data
             self.save_data()
@@ -345,10 +344,12 @@ class AdvancedSportyBetScraper:
             self.logger.error(f"❌ Error during scraping: {e}")
             raise
         finally:
-            # Clean up Selenium
+            # Hand the driver back to the pool
             if self.driver:
-                self.driver.quit()
-                self.logger.info("🔧 WebDriver closed")
+                get_driver_pool(headless=self.headless).release(self.driver)
+                self.driver = None
+                self.logger.info("🔧 WebDriver returned to pool")
+            self.fetch_engine.close()
 
 def main():
     """Main function with options"""
@@ -357,6 +358,8 @@ def main():
     parser = argparse.ArgumentParser(description='Advanced SportyBet Scraper')
     parser.add_argument('--no-selenium', action='store_true', help='Use only requests (no Selenium)')
     parser.add_argument('--no-headless', action='store_true', help='Show browser window (not headless)')
+    parser.add_argument('--max-pages', type=int, default=0,
+                        help='Stop after this many page loads (e.g. 2 while testing; default: no limit)')
     
     args = parser.parse_args()
     
@@ -364,7 +367,8 @@ def main():
     headless = not args.no_headless
     
     scraper = AdvancedSportyBetScraper(use_selenium=use_selenium, headless=headless)
-    scraper.run()
+    with scraper.scheduler.page_budget(args.max_pages):
+        scraper.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,40 +4,50 @@ SportyBet API Scraper
 This scraper finds and uses SportyBet's API endpoints directly
 """
 
-import requests
 import json
 import time
 import logging
+import threading
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 import sys
 import os
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from fetch_engine import FetchEngine
+from driver_pool import get_driver_pool
+from page_readiness import NetworkIdle, DomQuiet
+from network_capture import NetworkCapture
+from http_transport import create_session
+from json_stream import iter_response_matches
+from match_walker import MatchLayout, SchemaChanged, field_plan, iter_match_objects
+from rate_limiter import get_scheduler
+from source_scanner import scan_source
+
 try:
-    from settings import HEADERS, SPORTYBET_BASE_URL, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
+    from settings import HEADERS, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
+    from settings import PROBE_TIMEOUT, PROBE_TOTAL_TIMEOUT
 except ImportError:
     print("Using default settings...")
     HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     SPORTYBET_UPCOMING_URL = "https://sportybet.com/ng/sport/football/sr:category:1/today"
     SPORTYBET_LIVE_URL = "https://sportybet.com/ng/sport/football/sr:category:1/live"
+    PROBE_TIMEOUT = 15
+    PROBE_TOTAL_TIMEOUT = 60
 
 class SportyBetAPIecraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = create_session()
+        self.fetch_engine = FetchEngine(session=self.session)
+        self.scheduler = get_scheduler()
         self.setup_logging()
         self.matches_data = []
         self.api_endpoints = []
+        self.websocket_feeds = []
+        self.match_layouts = {}  # source URL -> MatchLayout learned from its first payload
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -56,59 +66,28 @@ class SportyBetAPIecraper:
 
     def intercept_network_requests(self, url, timeout=60):
         """Use Selenium to intercept network requests and find API endpoints"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        
-        # Enable logging to capture network requests
-        chrome_options.add_argument("--enable-logging")
-        chrome_options.add_argument("--log-level=0")
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        
+        pool = get_driver_pool()
         driver = None
+        broken = False
         api_calls = []
         
         try:
-            driver = webdriver.Chrome(options=chrome_options)
+            driver = pool.acquire()
             self.logger.info(f"🔍 Intercepting network requests for: {url}")
             
-            # Enable performance logging to capture network events
-            driver.execute_cdp_cmd('Network.enable', {})
-            
-            # Navigate to the page
-            driver.get(url)
+            # Follow the CDP Network events while the page loads, keeping API response bodies
+            capture = NetworkCapture(driver)
+            capture.capture(url, NetworkIdle() & DomQuiet(), timeout=timeout, scheduler=self.scheduler)
             
-            # Wait for page to start loading
-            time.sleep(5)
-            
-            # Get network logs
-            logs = driver.get_log('performance')
-            
-            for log in logs:
-                message = json.loads(log['message'])
-                if message['message']['method'] == 'Network.responseReceived':
-                    response_url = message['message']['params']['response']['url']
-                    
-                    # Look for API endpoints
-                    if any(keyword in response_url.lower() for keyword in ['api', 'ajax', 'json', 'data', 'match', 'event', 'odds']):
-                        api_calls.append({
-                            'url': response_url,
-                            'method': message['message']['params']['response'].get('method', 'GET'),
-                            'status': message['message']['params']['response']['status'],
-                            'type': message['message']['params']['type']
-                        })
-                        self.logger.info(f"📡 Found API call: {response_url}")
+            for response in capture.responses:
+                api_calls.append(response.to_dict(include_body=True))
+                self.logger.info(f"📡 Found API call: {response.url}")
+            for feed in capture.websockets.values():
+                self.websocket_feeds.append(feed['url'])
+                self.logger.info(f"🔌 Found live feed: {feed['url']}")
             
             # Also try to wait for specific elements that might trigger API calls
             try:
-                # Wait for any content to load
-                WebDriverWait(driver, 30).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                
                 # Look for data in window variables
                 js_data = driver.execute_script("""
                     var data = {};
@@ -134,176 +113,211 @@ class SportyBetAPIecraper:
                 
         except Exception as e:
             self.logger.error(f"❌ Error intercepting requests: {e}")
+            broken = True
             
         finally:
-            if driver:
-                driver.quit()
+            pool.release(driver, broken=broken)
                 
         return None, api_calls
 
-    def find_api_endpoints_from_source(self, url):
+    def find_api_endpoints_from_source(self, url, save_source=True):
         """Extract potential API endpoints from page source"""
         try:
-            response = self.session.get(url, timeout=30)
+            response = self.session.get(url)
             content = response.text
             
             # Save source for inspection
-            temp_dir = Path("temp")
-            temp_dir.mkdir(exist_ok=True)
-            source_file = temp_dir / f"source_{datetime.now().strftime('%H%M%S')}.html"
-            with open(source_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            self.logger.info(f"📄 Source saved to: {source_file}")
-            
-            # Look for API endpoints in JavaScript
-            api_patterns = [
-                r'["\']https?://[^"\']*api[^"\']*["\']',
-                r'["\']https?://[^"\']*ajax[^"\']*["\']',
-                r'["\']https?://[^"\']*data[^"\']*["\']',
-                r'["\']https?://[^"\']*match[^"\']*["\']',
-                r'["\']https?://[^"\']*event[^"\']*["\']',
-                r'["\']https?://[^"\']*odds[^"\']*["\']',
-                r'baseUrl["\']?\s*:\s*["\'][^"\']+["\']',
-                r'apiUrl["\']?\s*:\s*["\'][^"\']+["\']',
-                r'endpoint["\']?\s*:\s*["\'][^"\']+["\']'
-            ]
+            if save_source:
+                temp_dir = Path("temp")
+                temp_dir.mkdir(exist_ok=True)
+                source_file = temp_dir / f"source_{datetime.now().strftime('%H%M%S')}.html"
+                with open(source_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                
+                self.logger.info(f"📄 Source saved to: {source_file}")
             
-            endpoints = set()
-            for pattern in api_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    # Clean up the match
-                    endpoint = match.strip('\'"')
-                    if endpoint.startswith('http'):
-                        endpoints.add(endpoint)
-                        self.logger.info(f"🎯 Found potential endpoint: {endpoint}")
+            # One pass over the source finds API-looking URLs, baseUrl/apiUrl/endpoint
+            # config values and the JSON embedded in script tags
+            scan = scan_source(content)
+            for endpoint in scan.endpoints:
+                self.logger.info(f"🎯 Found potential endpoint: {endpoint}")
             
-            # Look for JSON data in script tags
             script_data = []
-            scripts = re.findall(r'<script[^>]*>(.*?)</script>', content, re.DOTALL)
-            for script in scripts:
-                if any(keyword in script.lower() for keyword in ['match', 'event', 'odds', 'team', 'fixture']):
-                    # Try to extract JSON objects
-                    json_patterns = [
-                        r'\{[^{}]*(?:"(?:match|event|odds|team|fixture)")[^{}]*\}',
-                        r'\[[^\[\]]*(?:"(?:match|event|odds|team|fixture)")[^\[\]]*\]'
-                    ]
-                    
-                    for json_pattern in json_patterns:
-                        json_matches = re.findall(json_pattern, script, re.IGNORECASE)
-                        for json_match in json_matches:
-                            try:
-                                data = json.loads(json_match)
-                                script_data.append(data)
-                                self.logger.info(f"📊 Found JSON data: {type(data)} with {len(data) if isinstance(data, (list, dict)) else 0} items")
-                            except:
-                                pass
+            for data, start, end in scan.json_values:
+                script_data.append(data)
+                self.logger.info(f"📊 Found JSON data: {type(data)} with {len(data)} items")
             
-            return list(endpoints), script_data
+            return scan.endpoints, script_data
             
         except Exception as e:
             self.logger.error(f"❌ Error analyzing source: {e}")
             return [], []
 
-    def test_api_endpoints(self, endpoints):
-        """Test discovered API endpoints"""
-        working_endpoints = []
+    def test_api_endpoints(self, endpoints, total_timeout=PROBE_TOTAL_TIMEOUT):
+        """Test discovered API endpoints in parallel"""
+        # Try different headers; the first variant that works wins for its endpoint
+        test_headers = [
+            dict(self.session.headers),
+            {**self.session.headers, 'Accept': 'application/json'},
+            {**self.session.headers, 'X-Requested-With': 'XMLHttpRequest'},
+            {**self.session.headers, 'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}
+        ]
         
+        # Cancelling a task does not stop a request already running in a
+        # worker thread, so every probe also gets the shared deadline and its
+        # endpoint's "settled" flag, and gives up on its own once either trips
+        deadline = time.monotonic() + total_timeout
+        settled = {endpoint: threading.Event() for endpoint in endpoints}
+        jobs = {}
         for endpoint in endpoints:
-            try:
-                self.logger.info(f"🧪 Testing endpoint: {endpoint}")
-                
-                # Try different HTTP methods and headers
-                test_headers = [
-                    self.session.headers,
-                    {**self.session.headers, 'Accept': 'application/json'},
-                    {**self.session.headers, 'X-Requested-With': 'XMLHttpRequest'},
-                    {**self.session.headers, 'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}
-                ]
-                
-                for headers in test_headers:
-                    try:
-                        response = self.session.get(endpoint, headers=headers, timeout=15)
-                        
-                        if response.status_code == 200:
-                            content_type = response.headers.get('content-type', '').lower()
-                            
-                            if 'json' in content_type:
-                                try:
-                                    data = response.json()
-                                    if data:  # Not empty
-                                        working_endpoints.append({
-                                            'url': endpoint,
-                                            'headers': headers,
-                                            'response_size': len(response.text),
-                                            'data_type': type(data).__name__,
-                                            'sample_keys': list(data.keys()) if isinstance(data, dict) else None
-                                        })
-                                        self.logger.info(f"✅ Working endpoint: {endpoint}")
-                                        break
-                                except:
-                                    pass
-                            elif len(response.text) > 1000:  # Significant content
-                                working_endpoints.append({
-                                    'url': endpoint,
-                                    'headers': headers,
-                                    'response_size': len(response.text),
-                                    'data_type': 'text',
-                                    'sample_keys': None
-                                })
-                                self.logger.info(f"✅ Working endpoint (text): {endpoint}")
-                                break
-                                
-                    except Exception as e:
-                        continue
-                        
-            except Exception as e:
-                self.logger.warning(f"⚠️ Error testing {endpoint}: {e}")
-                
+            self.logger.info(f"🧪 Testing endpoint: {endpoint}")
+            jobs[endpoint] = [
+                lambda endpoint=endpoint, headers=headers: self.probe_endpoint(
+                    endpoint, headers, settled=settled[endpoint], deadline=deadline)
+                for headers in test_headers
+            ]
+        
+        try:
+            results = self.fetch_engine.race_all(jobs, timeout=total_timeout)
+        finally:
+            for flag in settled.values():
+                flag.set()
+        
+        # Keep the discovery order
+        working_endpoints = []
+        for endpoint in endpoints:
+            if endpoint in results:
+                kind = " (text)" if results[endpoint]['data_type'] == 'text' else ""
+                self.logger.info(f"✅ Working endpoint{kind}: {endpoint}")
+                working_endpoints.append(results[endpoint])
         return working_endpoints
 
+    def probe_endpoint(self, endpoint, headers, settled=None, deadline=None):
+        """Try one header variant against an endpoint, returning its info if it works.
+
+        Returns None without sending, or before reading the body, once
+        `settled` is set (another variant already won) or the monotonic
+        `deadline` has passed; the request itself never outlives the deadline.
+        """
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if (settled is not None and settled.is_set()) or (remaining is not None and remaining <= 0):
+            return None
+        response = self.session.get(endpoint, headers=headers, timeout=PROBE_TIMEOUT,
+                                    deadline=remaining, stream=True)
+        
+        if response.status_code != 200 or (settled is not None and settled.is_set()):
+            response.close()
+            return None
+            
+        content_type = response.headers.get('content-type', '').lower()
+        info = None
+        
+        if 'json' in content_type:
+            try:
+                data = response.json()
+            except ValueError:
+                return None
+            if data:  # Not empty
+                info = {
+                    'url': endpoint,
+                    'headers': headers,
+                    'response_size': len(response.text),
+                    'data_type': type(data).__name__,
+                    'sample_keys': list(data.keys()) if isinstance(data, dict) else None
+                }
+        elif len(response.text) > 1000:  # Significant content
+            info = {
+                'url': endpoint,
+                'headers': headers,
+                'response_size': len(response.text),
+                'data_type': 'text',
+                'sample_keys': None
+            }
+            
+        if info and settled is not None:
+            settled.set()
+        return info
+
+    def captured_endpoint_info(self, call):
+        """Endpoint info, in probe_endpoint's format, for a response captured in the browser"""
+        data = call['data']
+        return {
+            'url': call['url'],
+            'headers': call.get('request_headers', {}),
+            'response_size': len(json.dumps(data)),
+            'data_type': type(data).__name__,
+            'sample_keys': list(data.keys()) if isinstance(data, dict) else None,
+            'captured': True
+        }
+
     def extract_matches_from_api(self, endpoint_info):
-        """Extract match data from working API endpoint"""
+        """Extract match data from working API endpoint, yielding each match
+        while a JSON response is still downloading"""
         try:
             response = self.session.get(
                 endpoint_info['url'], 
-                headers=endpoint_info['headers'], 
-                timeout=30
+                headers=endpoint_info['headers'],
+                stream=True
             )
             
             if 'json' in response.headers.get('content-type', '').lower():
-                data = response.json()
-                return self.parse_json_matches(data)
+                yield from self.iter_streamed_matches(response)
             else:
                 # Try to parse as HTML or other format
-                return self.parse_text_matches(response.text)
+                yield from self.parse_text_matches(response.text)
                 
         except Exception as e:
             self.logger.error(f"❌ Error extracting from API: {e}")
-            return []
 
-    def parse_json_matches(self, data):
-        """Parse matches from JSON data"""
+    def iter_streamed_matches(self, response):
+        """Match records from a JSON response opened with stream=True, yielded
+        while it downloads instead of after response.json() has read it all"""
+        for obj in iter_response_matches(response):
+            match = self.extract_match_from_object(obj)
+            if match:
+                yield match
+
+    def parse_json_matches(self, data, source=None):
+        """Parse matches from JSON data (decoded, or the response text).
+
+        With a source (the endpoint URL), the first payload is walked in full
+        and its layout learned; later payloads from that source are read
+        through the layout, and walked again only when it no longer fits.
+        """
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                return []
+
+        layout = self.match_layouts.get(source) if source else None
+        if layout is not None:
+            try:
+                objects = layout.locate(data)
+            except SchemaChanged as e:
+                self.logger.info(f"🔄 {source} changed shape ({e}), re-learning")
+                del self.match_layouts[source]
+            else:
+                scraped_at = datetime.now().isoformat()
+                matches = []
+                for obj in objects:
+                    fields = layout.extract(obj)
+                    if fields:
+                        matches.append({'scraped_at': scraped_at, 'source': 'api', **fields})
+                return matches
+
+        if source:
+            layout, objects = MatchLayout.learn(data)
+            if layout:
+                self.match_layouts[source] = layout
+        else:
+            objects = iter_match_objects(data)
+
         matches = []
-        
-        def extract_matches_recursive(obj, path=""):
-            if isinstance(obj, dict):
-                # Look for match-like objects
-                if any(key in obj for key in ['home', 'away', 'team1', 'team2', 'homeTeam', 'awayTeam']):
-                    match = self.extract_match_from_object(obj)
-                    if match:
-                        matches.append(match)
-                
-                # Recurse into nested objects
-                for key, value in obj.items():
-                    extract_matches_recursive(value, f"{path}.{key}" if path else key)
-                    
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    extract_matches_recursive(item, f"{path}[{i}]" if path else f"[{i}]")
-        
-        extract_matches_recursive(data)
+        for obj in objects:
+            match = self.extract_match_from_object(obj)
+            if match:
+                matches.append(match)
         return matches
 
     def extract_match_from_object(self, obj):
@@ -314,46 +328,11 @@ class SportyBetAPIecraper:
                 'source': 'api'
             }
             
-            # Extract teams
-            team_keys = [
-                ('home', 'away'), ('home_team', 'away_team'),
-                ('homeTeam', 'awayTeam'), ('team1', 'team2'),
-                ('home_name', 'away_name')
-            ]
-            
-            for home_key, away_key in team_keys:
-                if home_key in obj and away_key in obj:
-                    match['home_team'] = str(obj[home_key])
-                    match['away_team'] = str(obj[away_key])
-                    break
-            
-            # Extract time/date
-            time_keys = ['time', 'start_time', 'kick_off', 'match_time', 'date', 'startTime']
-            for key in time_keys:
-                if key in obj:
-                    match['match_time'] = str(obj[key])
-                    break
-            
-            # Extract odds
-            if 'odds' in obj:
-                match['odds'] = obj['odds']
-            
-            # Extract competition/league
-            comp_keys = ['competition', 'league', 'tournament', 'category']
-            for key in comp_keys:
-                if key in obj:
-                    match['competition'] = str(obj[key])
-                    break
-            
-            # Extract match ID
-            id_keys = ['id', 'match_id', 'event_id', 'fixture_id']
-            for key in id_keys:
-                if key in obj:
-                    match['match_id'] = str(obj[key])
-                    break
-            
-            # Only return if we have at least teams
-            if 'home_team' in match and 'away_team' in match:
+            # Teams, then time, odds, competition and ID, by key preference
+            plan = field_plan(obj)
+            if plan:
+                for field, key, stringify in plan:
+                    match[field] = str(obj[key]) if stringify else obj[key]
                 return match
                 
         except Exception as e:
@@ -405,6 +384,7 @@ class SportyBetAPIecraper:
             
             # Save as CSV
             try:
+                import pandas as pd
                 df = pd.DataFrame(self.matches_data)
                 csv_path = json_path.with_suffix('.csv')
                 df.to_csv(csv_path, index=False)
@@ -434,6 +414,15 @@ class SportyBetAPIecraper:
                     matches = self.parse_json_matches(data)
                     self.matches_data.extend(matches)
             
+            # Bodies captured during the page load need no second request
+            captured_urls = set()
+            for call in network_calls:
+                if call.get('data'):
+                    self.logger.info(f"📦 Parsing captured response: {call['url']}")
+                    self.matches_data.extend(self.parse_json_matches(call['data']))
+                    captured_urls.add(call['url'])
+                    self.api_endpoints.append(self.captured_endpoint_info(call))
+            
             # Step 2: Find API endpoints from source
             self.logger.info("🔍 Step 2: Analyzing page source for endpoints...")
             endpoints, script_data = self.find_api_endpoints_from_source(SPORTYBET_UPCOMING_URL)
@@ -445,16 +434,16 @@ class SportyBetAPIecraper:
                     self.matches_data.extend(matches)
             
             # Step 3: Test discovered endpoints
-            all_endpoints = list(set(endpoints + [call['url'] for call in network_calls]))
+            all_endpoints = list(set(endpoints + [call['url'] for call in network_calls]) - captured_urls)
             if all_endpoints:
                 self.logger.info(f"🧪 Step 3: Testing {len(all_endpoints)} discovered endpoints...")
                 working_endpoints = self.test_api_endpoints(all_endpoints)
-                self.api_endpoints = working_endpoints
+                self.api_endpoints.extend(working_endpoints)
                 
                 # Extract data from working endpoints
                 for endpoint in working_endpoints:
-                    matches = self.extract_matches_from_api(endpoint)
-                    self.matches_data.extend(matches)
+                    for match in self.extract_matches_from_api(endpoint):
+                        self.matches_data.append(match)
             
             # Save results
             self.save_data()
@@ -462,10 +451,13 @@ class SportyBetAPIecraper:
             self.logger.info(f"✅ API scraping completed!")
             self.logger.info(f"📊 Total matches found: {len(self.matches_data)}")
             self.logger.info(f"🔗 Working API endpoints: {len(self.api_endpoints)}")
+            self.logger.info(f"🔌 Live feeds found: {len(self.websocket_feeds)}")
             
         except Exception as e:
             self.logger.error(f"❌ Error during API scraping: {e}")
             raise
+        finally:
+            self.fetch_engine.close()
 
 if __name__ == "__main__":
     scraper = SportyBetAPIecraper()
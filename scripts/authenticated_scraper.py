@@ -4,43 +4,47 @@ Authenticated SportyBet Scraper
 This scraper logs in first, then accesses protected content and APIs
 """
 
-import requests
 import json
 import time
 import logging
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 import sys
 import os
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
 
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from http_transport import create_session
+from driver_pool import get_driver_pool
+from html_parser import iter_scripts
+from json_extract import iter_json_assignments
+from json_stream import MatchStream, iter_response_matches
+from match_walker import iter_match_objects
+from page_readiness import navigate_and_wait, page_settled, NetworkIdle, DomQuiet
+from rate_limiter import PageBudgetExceeded, get_scheduler
+
 try:
     from settings import HEADERS, SPORTYBET_BASE_URL, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
+    from settings import PROBE_TIMEOUT
 except ImportError:
     print("Using default settings...")
     HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     SPORTYBET_BASE_URL = "https://sportybet.com/ng"
     SPORTYBET_UPCOMING_URL = "https://sportybet.com/ng/sport/football/sr:category:1/today"
     SPORTYBET_LIVE_URL = "https://sportybet.com/ng/sport/football/sr:category:1/live"
+    PROBE_TIMEOUT = 15
+
+# Script variables that carry match data on the authenticated pages
+JSON_ASSIGNMENT_NAMES = ('matches', 'events', 'fixtures', 'data')
 
 class AuthenticatedSportyBetScraper:
     def __init__(self, headless=True, save_session=True):
         self.headless = headless
         self.save_session = save_session
         self.driver = None
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = create_session()
+        self.scheduler = get_scheduler()
         self.setup_logging()
         self.matches_data = []
         self.network_requests = []
@@ -63,38 +67,13 @@ class AuthenticatedSportyBetScraper:
         self.logger = logging.getLogger(__name__)
 
     def setup_selenium(self):
-        """Setup Selenium WebDriver with network logging"""
+        """Check out a warm WebDriver (interactive blocking profile) from the shared pool"""
         if self.driver:
             return True
             
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            
-            # Performance and stability options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(f"--user-agent={HEADERS['User-Agent']}")
-            
-            # Enable network logging (different approach for compatibility)
-            chrome_options.add_argument("--enable-logging")
-            chrome_options.add_argument("--log-level=0")
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            
-            # Add prefs to handle notifications, etc.
-            prefs = {
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0,
-                "profile.managed_default_content_settings.images": 2
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.logger.info("✅ Chrome WebDriver initialized for authentication")
+            self.driver = get_driver_pool(headless=self.headless, blocking='interactive').acquire()
+            self.logger.info("✅ Chrome WebDriver ready for authentication")
             return True
             
         except Exception as e:
@@ -105,6 +84,9 @@ class AuthenticatedSportyBetScraper:
         """Login to SportyBet - will prompt for credentials if not provided"""
         if not self.setup_selenium():
             return False
+        
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
             
         try:
             self.logger.info("🔐 Starting SportyBet login process...")
@@ -112,7 +94,7 @@ class AuthenticatedSportyBetScraper:
             # Navigate to login page
             login_url = f"{SPORTYBET_BASE_URL}/auth/login"
             self.logger.info(f"📱 Navigating to login page: {login_url}")
-            self.driver.get(login_url)
+            self.scheduler.navigate(self.driver, login_url)
             
             # Wait for page to load
             time.sleep(3)
@@ -325,11 +307,9 @@ class AuthenticatedSportyBetScraper:
         try:
             self.logger.info(f"📡 Capturing network requests for: {url}")
             
-            # Navigate to the page
-            self.driver.get(url)
-            
-            # Wait for page to load and capture any AJAX requests
-            time.sleep(wait_time)
+            # Navigate and let AJAX requests finish (wait_time is only the upper bound)
+            navigate_and_wait(self.driver, url, NetworkIdle() & DomQuiet(),
+                              timeout=wait_time, scheduler=self.scheduler)
             
             # Execute JavaScript to capture any fetch/xhr requests
             # This is a workaround since performance logs didn't work
@@ -373,28 +353,33 @@ class AuthenticatedSportyBetScraper:
         try:
             self.logger.info(f"🔓 Scraping authenticated content: {url}")
             
-            # Method 1: Use Selenium to get fully loaded page
+            # Method 1: Use Selenium to get fully loaded page; a failure here
+            # still leaves the requests session below to try
             if self.driver:
-                self.driver.get(url)
-                time.sleep(10)  # Wait longer for authenticated content
-                
-                # Save the authenticated page source
-                auth_source_file = Path("temp") / f"auth_source_{datetime.now().strftime('%H%M%S')}.html"
-                auth_source_file.parent.mkdir(exist_ok=True)
-                with open(auth_source_file, 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                self.logger.info(f"💾 Authenticated page saved to: {auth_source_file}")
-                
-                # Parse the authenticated page
-                matches.extend(self.parse_authenticated_page(self.driver.page_source))
-                
-                # Capture network requests
-                network_requests = self.capture_network_requests(url, wait_time=15)
-                self.network_requests.extend(network_requests)
+                try:
+                    navigate_and_wait(self.driver, url, page_settled("#app"), scheduler=self.scheduler)
+                    
+                    # Save the authenticated page source
+                    auth_source_file = Path("temp") / f"auth_source_{datetime.now().strftime('%H%M%S')}.html"
+                    auth_source_file.parent.mkdir(exist_ok=True)
+                    with open(auth_source_file, 'w', encoding='utf-8') as f:
+                        f.write(self.driver.page_source)
+                    self.logger.info(f"💾 Authenticated page saved to: {auth_source_file}")
+                    
+                    # Parse the authenticated page
+                    matches.extend(self.parse_authenticated_page(self.driver.page_source))
+                    
+                    # Capture network requests
+                    network_requests = self.capture_network_requests(url, wait_time=15)
+                    self.network_requests.extend(network_requests)
+                except PageBudgetExceeded as e:
+                    self.logger.warning(f"⚠️ Browser page skipped, trying the requests session: {e}")
+                except Exception as e:
+                    self.logger.error(f"❌ Browser scrape failed, trying the requests session: {e}")
             
             # Method 2: Use requests session with cookies
             try:
-                response = self.session.get(url, timeout=30)
+                response = self.session.get(url)
                 if response.status_code == 200:
                     self.logger.info(f"✅ Requests session access successful: {len(response.text)} chars")
                     matches.extend(self.parse_authenticated_page(response.text))
@@ -413,42 +398,24 @@ class AuthenticatedSportyBetScraper:
         matches = []
         
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
             # Look for match data in the authenticated content
             # This would be similar to previous parsing but might find more content
             
-            # Check for JavaScript variables with match data
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string:
-                    script_content = script.string
-                    
-                    # Look for JSON data structures
-                    json_patterns = [
-                        r'matches\s*[:=]\s*(\[.*?\])',
-                        r'events\s*[:=]\s*(\[.*?\])',
-                        r'fixtures\s*[:=]\s*(\[.*?\])',
-                        r'data\s*[:=]\s*(\{.*?\})'
-                    ]
-                    
-                    for pattern in json_patterns:
-                        json_matches = re.findall(pattern, script_content, re.DOTALL)
-                        for json_match in json_matches:
-                            try:
-                                data = json.loads(json_match)
-                                if isinstance(data, list):
-                                    for item in data:
-                                        match = self.extract_match_from_data(item)
-                                        if match:
-                                            matches.append(match)
-                                elif isinstance(data, dict):
-                                    match = self.extract_match_from_data(data)
-                                    if match:
-                                        matches.append(match)
-                            except:
-                                continue
+            # Check for JavaScript variables with match data; only the script
+            # bodies are needed, so the page is never parsed into a tree
+            for script in iter_scripts(html_content):
+                if script.text:
+                    # Whole JSON values assigned to matches/events/fixtures/data
+                    for name, data, start, end in iter_json_assignments(script.text, JSON_ASSIGNMENT_NAMES):
+                        if isinstance(data, list):
+                            for item in data:
+                                match = self.extract_match_from_data(item)
+                                if match:
+                                    matches.append(match)
+                        elif isinstance(data, dict):
+                            match = self.extract_match_from_data(data)
+                            if match:
+                                matches.append(match)
             
             self.logger.info(f"📊 Parsed {len(matches)} matches from authenticated content")
             
@@ -522,25 +489,30 @@ class AuthenticatedSportyBetScraper:
         for endpoint in api_endpoints:
             try:
                 self.logger.info(f"🧪 Testing authenticated API: {endpoint}")
-                response = self.session.get(endpoint, timeout=15)
+                response = self.session.get(endpoint, timeout=PROBE_TIMEOUT, stream=True)
                 
                 if response.status_code == 200:
                     try:
-                        data = response.json()
-                        if data:
+                        # Parse matches from API response as it downloads
+                        stream = MatchStream()
+                        api_matches = []
+                        for obj in iter_response_matches(response, stream=stream):
+                            match = self.extract_match_from_data(obj)
+                            if match:
+                                api_matches.append(match)
+                        if stream.root and not stream.empty:
                             working_endpoints.append({
                                 'url': endpoint,
                                 'status': response.status_code,
-                                'data_type': type(data).__name__,
-                                'content_length': len(response.text)
+                                'data_type': stream.root,
+                                'content_length': stream.received
                             })
                             self.logger.info(f"✅ Working authenticated API: {endpoint}")
-                            
-                            # Parse matches from API response
-                            api_matches = self.parse_json_matches(data)
                             self.matches_data.extend(api_matches)
                     except:
                         pass
+                else:
+                    response.close()
                         
             except Exception as e:
                 self.logger.warning(f"⚠️ API test failed for {endpoint}: {e}")
@@ -550,19 +522,10 @@ class AuthenticatedSportyBetScraper:
     def parse_json_matches(self, data):
         """Parse matches from JSON API response"""
         matches = []
-        
-        def recursive_parse(obj):
-            if isinstance(obj, dict):
-                match = self.extract_match_from_data(obj)
-                if match:
-                    matches.append(match)
-                for value in obj.values():
-                    recursive_parse(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    recursive_parse(item)
-        
-        recursive_parse(data)
+        for obj in iter_match_objects(data):
+            match = self.extract_match_from_data(obj)
+            if match:
+                matches.append(match)
         return matches
 
     def save_data(self):
@@ -584,6 +547,7 @@ class AuthenticatedSportyBetScraper:
             
             # Save as CSV
             try:
+                import pandas as pd
                 df = pd.DataFrame(self.matches_data)
                 csv_file = matches_file.with_suffix('.csv')
                 df.to_csv(csv_file, index=False)
@@ -602,6 +566,11 @@ class AuthenticatedSportyBetScraper:
         """Main execution method"""
         self.logger.info("🚀 Starting Authenticated SportyBet scraper...")
         
+        # Login and its follow-up page loads are one flow: never page-budgeted
+        with self.scheduler.page_budget(0):
+            return self._run(username, password, use_saved_session)
+
+    def _run(self, username, password, use_saved_session):
         try:
             # Try to load saved session first
             if use_saved_session and self.load_session_data():
@@ -639,8 +608,9 @@ class AuthenticatedSportyBetScraper:
             
         finally:
             if self.driver:
-                self.driver.quit()
-                self.logger.info("🔧 WebDriver closed")
+                get_driver_pool(headless=self.headless, blocking='interactive').release(self.driver)
+                self.driver = None
+                self.logger.info("🔧 WebDriver returned to pool")
 
 def main():
     """Main function with command line options"""
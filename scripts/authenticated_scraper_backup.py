@@ -14,17 +14,13 @@ from pathlib import Path
 import sys
 import os
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
 
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from driver_pool import get_driver_pool
+
 try:
     from settings import HEADERS, SPORTYBET_BASE_URL, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
 except ImportError:
@@ -63,38 +59,13 @@ class AuthenticatedSportyBetScraper:
         self.logger = logging.getLogger(__name__)
 
     def setup_selenium(self):
-        """Setup Selenium WebDriver with network logging"""
+        """Check out a warm WebDriver (interactive blocking profile) from the shared pool"""
         if self.driver:
             return True
             
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            
-            # Performance and stability options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(f"--user-agent={HEADERS['User-Agent']}")
-            
-            # Enable network logging (different approach for compatibility)
-            chrome_options.add_argument("--enable-logging")
-            chrome_options.add_argument("--log-level=0")
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            
-            # Add prefs to handle notifications, etc.
-            prefs = {
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0,
-                "profile.managed_default_content_settings.images": 2
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.logger.info("✅ Chrome WebDriver initialized for authentication")
+            self.driver = get_driver_pool(headless=self.headless, blocking='interactive').acquire()
+            self.logger.info("✅ Chrome WebDriver ready for authentication")
             return True
             
         except Exception as e:
@@ -639,8 +610,9 @@ class AuthenticatedSportyBetScraper:
             
         finally:
             if self.driver:
-                self.driver.quit()
-                self.logger.info("🔧 WebDriver closed")
+                get_driver_pool(headless=self.headless, blocking='interactive').release(self.driver)
+                self.driver = None
+                self.logger.info("🔧 WebDriver returned to pool")
 
 def main():
     """Main function with command line options"""
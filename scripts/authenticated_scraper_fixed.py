@@ -5,26 +5,22 @@ Uses navigation approach instead of direct login URLs
 Based on analysis findings: login buttons exist on home page
 """
 
-import requests
 import json
 import time
 import logging
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 import sys
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
 
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from http_transport import create_session
+from driver_pool import get_driver_pool
+from page_readiness import navigate_and_wait, wait_until, page_settled, SelectorCount, NetworkIdle, DomQuiet
+from rate_limiter import get_scheduler
+
 try:
     from settings import HEADERS, SPORTYBET_BASE_URL
 except ImportError:
@@ -36,8 +32,8 @@ class FixedAuthenticatedSportyBetScraper:
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = create_session()
+        self.scheduler = get_scheduler()
         self.setup_logging()
         self.is_logged_in = False
         
@@ -57,26 +53,13 @@ class FixedAuthenticatedSportyBetScraper:
         self.logger = logging.getLogger(__name__)
 
     def setup_selenium(self):
-        """Setup Selenium WebDriver"""
+        """Check out a warm WebDriver from the shared pool"""
+        if self.driver:
+            return True
+            
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(f"--user-agent={HEADERS['User-Agent']}")
-            
-            # Additional options for better compatibility
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            self.logger.info("✅ Chrome WebDriver initialized")
+            self.driver = get_driver_pool(headless=self.headless, blocking='interactive').acquire()
+            self.logger.info("✅ Chrome WebDriver ready")
             return True
             
         except Exception as e:
@@ -87,6 +70,12 @@ class FixedAuthenticatedSportyBetScraper:
         """Fixed login using navigation approach - based on analysis findings"""
         if not self.setup_selenium():
             return False
+        
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
             
         try:
             self.logger.info("🔐 Starting FIXED SportyBet login...")
@@ -94,11 +83,11 @@ class FixedAuthenticatedSportyBetScraper:
             # Step 1: Load home page (we know this works)
             home_url = f"{SPORTYBET_BASE_URL}"
             self.logger.info(f"📱 Loading home page: {home_url}")
-            self.driver.get(home_url)
             
-            # Step 2: Wait for SPA to fully load (critical!)
-            self.logger.info("⏳ Waiting 15 seconds for SPA to fully load...")
-            time.sleep(15)  # Based on analysis - this is required
+            # Step 2: Wait for SPA to fully load (critical!) - settled app or a rendered login button
+            self.logger.info("⏳ Waiting for SPA to fully load...")
+            spa_loaded = page_settled("#app") | (SelectorCount("button[class*='login']") & DomQuiet())
+            navigate_and_wait(self.driver, home_url, spa_loaded, scheduler=self.scheduler)
             
             # Step 3: Look for login button (we found these work)
             self.logger.info("🔍 Looking for login button...")
@@ -141,7 +130,9 @@ class FixedAuthenticatedSportyBetScraper:
             
             # Step 5: Wait for login form to appear
             self.logger.info("⏳ Waiting for login form to appear...")
-            time.sleep(5)  # Wait for modal/form to load
+            form_ready = wait_until(self.driver, SelectorCount("input[type='password']") & DomQuiet(), timeout=30)
+            self.logger.info(f"⏱️ Login form {'ready' if form_ready else 'still missing'} "
+                             f"after {form_ready.waited:.2f}s")
             
             # Step 6: Find login form fields
             self.logger.info("📝 Looking for login form fields...")
@@ -252,7 +243,11 @@ class FixedAuthenticatedSportyBetScraper:
             
             # Step 10: Wait for login to complete
             self.logger.info("⏳ Waiting for login to complete...")
-            time.sleep(10)
+            # Submitting mutates the form at once, so a full second without DOM or
+            # network activity means the login request has come back
+            settled = wait_until(self.driver, NetworkIdle(1.0) & DomQuiet(1.0), timeout=30)
+            self.logger.info(f"⏱️ Page {'settled' if settled else 'still busy'} "
+                             f"{settled.waited:.2f}s after submitting")
             
             # Step 11: Check if login was successful
             current_url = self.driver.current_url
@@ -327,8 +322,7 @@ class FixedAuthenticatedSportyBetScraper:
         for url in pages_to_scrape:
             try:
                 self.logger.info(f"📖 Scraping: {url}")
-                self.driver.get(url)
-                time.sleep(10)  # Wait for content to load
+                navigate_and_wait(self.driver, url, page_settled("#app"), scheduler=self.scheduler)
                 
                 # Save authenticated page
                 page_name = url.split('/')[-1]
@@ -397,8 +391,9 @@ class FixedAuthenticatedSportyBetScraper:
             
         finally:
             if self.driver:
-                self.driver.quit()
-                self.logger.info("🔧 WebDriver closed")
+                get_driver_pool(headless=self.headless, blocking='interactive').release(self.driver)
+                self.driver = None
+                self.logger.info("🔧 WebDriver returned to pool")
 
 def main():
     """Main function for testing"""
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Warm WebDriver Pool
+Hands out pre-configured Chrome drivers, resets their state between uses and
+recycles each one after DRIVER_MAX_USES checkouts
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from page_readiness import INSTRUMENT_JS
+from resource_blocking import BlockingProfile
+
+try:
+    from settings import HEADERS, DRIVER_POOL_SIZE, DRIVER_MAX_USES
+except ImportError:
+    HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+    DRIVER_POOL_SIZE = 2
+    DRIVER_MAX_USES = 20
+
+logger = logging.getLogger(__name__)
+
+# Hide navigator.webdriver on every document, not just the first one
+HIDE_WEBDRIVER_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+
+def build_chrome_options(headless=True, user_agent=None):
+    """Chrome options shared by every Selenium script"""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={user_agent or HEADERS['User-Agent']}")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    prefs = {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+
+    # Network.* events for network_capture.py, read back with get_log('performance')
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+class DriverPool:
+    """Bounded pool of warm Chrome drivers.
+
+    acquire() returns an idle driver, starting a new one only while fewer than
+    `size` exist, and otherwise blocks until one is released. release() wipes
+    cookies and storage and parks the driver on about:blank. A driver is quit
+    once it has served `max_uses` checkouts or is released as broken.
+
+    Every driver gets the `blocking` resource profile (see resource_blocking.py).
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, options_factory=None,
+                 blocking='scrape', **option_kwargs):
+        self.size = size
+        self.max_uses = max_uses
+        self.options_factory = options_factory or (lambda: build_chrome_options(**option_kwargs))
+        self.blocking = blocking if isinstance(blocking, BlockingProfile) else BlockingProfile.named(blocking)
+        self.idle = queue.LifoQueue()
+        self.uses = {}
+        self.created = 0
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def _start_driver(self):
+        from selenium import webdriver
+
+        driver = webdriver.Chrome(options=self.options_factory())
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': HIDE_WEBDRIVER_JS})
+            # Readiness instrumentation must see requests fired during page load
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_JS})
+        except Exception as e:
+            logger.debug(f"Could not install page scripts: {e}")
+        try:
+            self.blocking.apply(driver)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not apply the '{self.blocking.name}' blocking profile, pages load unblocked: {e}")
+        self.uses[id(driver)] = 0
+        logger.info(f"✅ Chrome WebDriver started ({self.created}/{self.size} in pool)")
+        return driver
+
+    def warm(self, count=None):
+        """Start drivers ahead of time so the first acquire() is instant"""
+        started = []
+        for _ in range(min(count or self.size, self.size)):
+            with self.lock:
+                if self.created >= self.size:
+                    break
+                self.created += 1
+            try:
+                started.append(self._start_driver())
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+        for driver in started:
+            self.idle.put(driver)
+
+    def acquire(self, timeout=None):
+        """Check out a driver, starting one if the pool is not full yet"""
+        if self.closed:
+            raise RuntimeError("Driver pool is closed")
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            can_start = self.created < self.size
+            if can_start:
+                self.created += 1
+        if can_start:
+            try:
+                return self._start_driver()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No WebDriver free after {timeout}s")
+
+    def release(self, driver, broken=False):
+        """Return a driver to the pool, resetting or recycling it"""
+        if driver is None:
+            return
+        self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+
+        if not broken and not self.closed and self.uses[id(driver)] < self.max_uses:
+            try:
+                self.reset(driver)
+                self.idle.put(driver)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ WebDriver reset failed, recycling it: {e}")
+
+        self._discard(driver)
+
+    def reset(self, driver):
+        """Wipe cookies, storage and extra windows so the next user starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        parts = urlsplit(driver.current_url)
+        if parts.scheme in ('http', 'https'):
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': f"{parts.scheme}://{parts.netloc}",
+                'storageTypes': 'all'
+            })
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.get('about:blank')
+        driver.get_log('performance')  # drop buffered network events
+
+    def _discard(self, driver):
+        self.uses.pop(id(driver), None)
+        with self.lock:
+            self.created -= 1
+        try:
+            driver.quit()
+            logger.info("🔧 WebDriver recycled")
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """with pool.driver() as driver: ... (released as broken if the block raises)"""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """Quit every idle driver; drivers still checked out are quit on release"""
+        self.closed = True
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(headless=True, blocking='scrape'):
+    """Process-wide pool for one Chrome profile, closed automatically at exit"""
+    key = (headless, blocking)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = DriverPool(headless=headless, blocking=blocking)
+        return _pools[key]
+
+
+@atexit.register
+def _close_all_pools():
+    for pool in list(_pools.values()):
+        pool.close()
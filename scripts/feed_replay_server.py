@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Feed Replay Server
+Local stand-in for the live odds WebSocket: replays frames recorded by
+live_feed.py --record (or any JSONL of {"t": seconds, "frame": text}) to every
+client, so the feed consumer can be exercised offline
+
+  python scripts/feed_replay_server.py data/stream/feed.jsonl --port 8765 --drop-after 50
+  python scripts/live_feed.py --url ws://localhost:8765 --duration 30
+"""
+
+import argparse
+import json
+import logging
+
+import trio
+from trio_websocket import serve_websocket, ConnectionClosed
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def load_frames(path):
+    """[(offset_seconds, frame)] from a recording; bare lines are replayed as-is"""
+    frames = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if isinstance(entry, dict) and 'frame' in entry:
+                frames.append((float(entry.get('t', 0)), entry['frame']))
+            else:
+                frames.append((frames[-1][0] if frames else 0.0, line))
+    return frames
+
+
+async def replay(request, frames, speed, drop_after):
+    ws = await request.accept()
+    peer = f"{ws.remote.address}:{ws.remote.port}"
+
+    async def log_subscriptions():
+        try:
+            while True:
+                logger.info(f"📨 {peer} sent: {await ws.get_message()}")
+        except ConnectionClosed:
+            pass
+
+    logger.info(f"🔌 Client connected: {peer}")
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(log_subscriptions)
+        previous = frames[0][0] if frames else 0.0
+        try:
+            for sent, (offset, frame) in enumerate(frames, start=1):
+                await trio.sleep(max(0.0, offset - previous) / speed)
+                previous = offset
+                await ws.send_message(frame)
+                if drop_after and sent >= drop_after:
+                    logger.info(f"✂️ Dropping {peer} after {sent} frames")
+                    break
+        except ConnectionClosed:
+            pass
+        await ws.aclose()
+        nursery.cancel_scope.cancel()
+    logger.info(f"👋 {peer} done")
+
+
+async def serve(frames, host, port, speed, drop_after):
+    async def handler(request):
+        await replay(request, frames, speed, drop_after)
+
+    logger.info(f"🚀 Replaying {len(frames)} frames on ws://{host}:{port}")
+    await serve_websocket(handler, host, port, ssl_context=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded live-feed frames over WebSocket')
+    parser.add_argument('recording', help='JSONL recording from live_feed.py --record')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier')
+    parser.add_argument('--drop-after', type=int, default=0,
+                        help='Close each connection after N frames to exercise reconnects')
+    args = parser.parse_args()
+
+    frames = load_frames(args.recording)
+    try:
+        trio.run(serve, frames, args.host, args.port, args.speed, args.drop_after)
+    except KeyboardInterrupt:
+        logger.info("⏹️ Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Concurrent Fetch Engine
+Shared asyncio engine that fetches many pages at once with bounded per-host concurrency
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from http_transport import create_session
+from rate_limiter import get_scheduler
+
+try:
+    from settings import MAX_CONCURRENT_PER_HOST, MAX_FETCH_WORKERS
+except ImportError:
+    MAX_CONCURRENT_PER_HOST = 4
+    MAX_FETCH_WORKERS = 16
+
+logger = logging.getLogger(__name__)
+
+
+class FetchResult:
+    """Outcome of a single fetch"""
+
+    def __init__(self, url, text=None, status=None, elapsed=0.0, error=None):
+        self.url = url
+        self.text = text
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.text is not None
+
+    def __repr__(self):
+        return f"FetchResult({self.url!r}, status={self.status}, elapsed={self.elapsed:.2f}s, error={self.error!r})"
+
+
+class FetchEngine:
+    """Run blocking fetchers concurrently, at most `max_per_host` at a time per host.
+
+    The engine owns a thread pool and drives it from asyncio, so any blocking
+    fetcher (a requests session, a Selenium driver) can be fanned out. A cycle
+    over N pages then takes about as long as the slowest page instead of the sum.
+    The default session fetcher counts each page against the scheduler's page
+    budget, if the run set one; crawls pass `budgeted=False`.
+    """
+
+    def __init__(self, session=None, fetcher=None, max_per_host=MAX_CONCURRENT_PER_HOST,
+                 max_workers=MAX_FETCH_WORKERS, budgeted=True):
+        self.session = session
+        self.budgeted = budgeted
+        self.fetcher = fetcher or self._fetch_with_session
+        self.max_per_host = max_per_host
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._host_slots = {}
+        self._slots_loop = None
+
+    # ------------------------------------------------------------------
+    # Blocking fetcher used when none is supplied
+    # ------------------------------------------------------------------
+    def _fetch_with_session(self, url):
+        if self.session is None:
+            self.session = create_session()
+        if self.budgeted:
+            get_scheduler().claim_page(url)
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.text, response.status_code
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+    def _slot_for(self, url):
+        """Per-host semaphore, recreated whenever a new event loop drives the engine"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._slots_loop:
+            self._host_slots = {}
+            self._slots_loop = loop
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    async def run(self, url, func, *args):
+        """Run a blocking call for `url` in the pool while holding that host's slot"""
+        async with self._slot_for(url):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    def _timed_fetch(self, url):
+        started = time.perf_counter()
+        outcome = self.fetcher(url)
+        return outcome, time.perf_counter() - started
+
+    async def fetch(self, url):
+        """Fetch one URL and wrap the outcome in a FetchResult (never raises)"""
+        started = time.perf_counter()
+        try:
+            outcome, elapsed = await self.run(url, self._timed_fetch, url)
+            text, status = outcome if isinstance(outcome, tuple) else (outcome, None)
+            return FetchResult(url, text=text, status=status, elapsed=elapsed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return FetchResult(url, elapsed=time.perf_counter() - started, error=e)
+
+    async def fetch_many(self, urls):
+        """Fetch all URLs concurrently, results in input order"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    async def first_success(self, url, calls):
+        """Run alternative blocking calls for one URL and return the first non-None result.
+
+        As soon as one call succeeds the others are cancelled, but only calls
+        still waiting for a host slot or a worker thread are actually stopped:
+        a blocking call already running in a thread runs to completion, so
+        calls that should stop early must watch their own flag or deadline
+        (see SportyBetAPIecraper.probe_endpoint).
+        """
+        tasks = [asyncio.ensure_future(self.run(url, call)) for call in calls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.debug(f"Attempt for {url} failed: {e}")
+                    continue
+                if result is not None:
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ------------------------------------------------------------------
+    # Sync entry points for the scraper classes
+    # ------------------------------------------------------------------
+    def fetch_all(self, urls):
+        """Blocking wrapper around fetch_many()"""
+        started = time.perf_counter()
+        results = asyncio.run(self.fetch_many(list(urls)))
+        elapsed = time.perf_counter() - started
+        sequential = sum(r.elapsed for r in results)
+        logger.info(f"⚡ Fetched {len(results)} pages in {elapsed:.2f}s (sequential would be ~{sequential:.2f}s)")
+        return results
+
+    def race_all(self, jobs, timeout=None):
+        """Blocking wrapper: first_success() for every {url: [calls]} entry at once.
+
+        Whatever has not finished after `timeout` seconds stops being waited
+        for (calls already running in threads are not interrupted; give them a
+        deadline of their own). Returns {url: result} for the URLs that
+        produced a result.
+        """
+        async def _race():
+            tasks = {url: asyncio.ensure_future(self.first_success(url, calls))
+                     for url, calls in jobs.items()}
+            if not tasks:
+                return {}
+            done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"⏱️ {len(pending)} of {len(tasks)} probes cut off after {timeout}s")
+                await asyncio.gather(*pending, return_exceptions=True)
+            return {url: task.result() for url, task in tasks.items()
+                    if task in done and task.result() is not None}
+
+        return asyncio.run(_race())
+
+    def close(self):
+        """Shut down the worker threads"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends
+One entry point, parse_html(), for every place we turn a page into a tree.
+The returned document answers the small BeautifulSoup subset the scrapers use
+(title, find, find_all, select, get, get_text, string, name, attrs, parent)
+whichever backend built it:
+
+  selectolax    lexbor/modest C parser with its own CSS engine (fastest)
+  lxml          BeautifulSoup over the lxml tree builder
+  html.parser   BeautifulSoup over the pure-Python parser (always available)
+
+"auto" picks the first one that is installed, in that order.
+
+SelectorIndex answers the scrapers' selector probes ('tbody tr',
+'[class*="match"]', '[data-event]', ...) from a single walk of the tree, and
+iter_scripts() pulls <script> bodies out of a page without building one.
+load_document() ties them together: one cached Document per page content,
+so every analysis step shares a single parse.
+"""
+
+import hashlib
+import re
+import sys
+import os
+import threading
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from functools import cached_property, lru_cache
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+try:
+    from settings import HTML_PARSER_BACKEND, HTML_DOCUMENT_CACHE_SIZE
+except ImportError:
+    HTML_PARSER_BACKEND = "auto"
+    HTML_DOCUMENT_CACHE_SIZE = 32
+
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+# Attributes BeautifulSoup splits on whitespace and hands back as lists
+MULTI_VALUED_ATTRIBUTES = frozenset({'class', 'rel', 'rev', 'accept-charset', 'headers', 'accesskey'})
+
+
+def _installed(backend):
+    try:
+        if backend == 'selectolax':
+            import selectolax  # noqa: F401
+        elif backend == 'lxml':
+            import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+_resolved = {}
+
+
+def resolve_backend(backend=None):
+    """Concrete backend name for `backend` (default: HTML_PARSER_BACKEND)"""
+    backend = backend or HTML_PARSER_BACKEND
+    if backend not in _resolved:
+        if backend == 'auto':
+            _resolved[backend] = next(b for b in BACKENDS if _installed(b))
+        elif backend not in BACKENDS:
+            raise ValueError(f"Unknown HTML parser backend {backend!r}; expected 'auto' or one of {BACKENDS}")
+        elif not _installed(backend):
+            raise ImportError(f"HTML parser backend {backend!r} is not installed")
+        else:
+            _resolved[backend] = backend
+    return _resolved[backend]
+
+
+def parse_html(html, backend=None):
+    """Parse `html` with the configured (or given) backend"""
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        return SelectolaxDocument(html)
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, backend)
+
+
+# ----------------------------------------------------------------------
+# Script-only extraction
+# ----------------------------------------------------------------------
+# Script bodies are raw text that ends at the first </script, so a scanner
+# can lift them out directly; comments are matched first so commented-out
+# tags are skipped, as a parser would
+SCRIPT_OR_COMMENT = re.compile(r'<!--|<script\b([^>]*)>', re.IGNORECASE)
+SCRIPT_END = re.compile(r'</script\s*>', re.IGNORECASE)
+TAG_ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+Script = namedtuple('Script', ['attrs', 'text'])
+
+
+def iter_scripts(html):
+    """Script(attrs, text) for every <script> in `html`, in document order,
+    without parsing the rest of the page"""
+    position = 0
+    while True:
+        found = SCRIPT_OR_COMMENT.search(html, position)
+        if found is None:
+            return
+        if found.group(1) is None:
+            end = html.find('-->', found.end())
+            position = len(html) if end < 0 else end + 3
+            continue
+        end = SCRIPT_END.search(html, found.end())
+        attrs = {name.lower(): double or single or bare
+                 for name, double, single, bare in TAG_ATTRIBUTE.findall(found.group(1))}
+        yield Script(attrs, html[found.end():end.start() if end else len(html)])
+        position = end.end() if end else len(html)
+
+
+# ----------------------------------------------------------------------
+# selectolax adapter
+# ----------------------------------------------------------------------
+class TextNode(str):
+    """A text node as a plain string that knows its parent element"""
+
+    def __new__(cls, value, parent):
+        text = super().__new__(cls, value)
+        text.parent = parent
+        return text
+
+
+class SelectolaxNode:
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def __bool__(self):
+        return True
+
+    def __str__(self):
+        return self.node.html or ''
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    @property
+    def attrs(self):
+        attrs = {}
+        for key, value in self.node.attributes.items():
+            value = value or ''
+            attrs[key] = value.split() if key in MULTI_VALUED_ATTRIBUTES else value
+        return attrs
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    @property
+    def parent(self):
+        parent = self.node.parent
+        return SelectolaxNode(parent) if parent is not None and parent.tag != '-undef' else None
+
+    @property
+    def string(self):
+        """The only text child's text (BeautifulSoup's .string), else None"""
+        child = self.node.child
+        if child is not None and child.next is None and child.tag == '-text':
+            return child.text_content
+        return None
+
+    def get_text(self, separator='', strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def select(self, selector):
+        return [SelectolaxNode(n) for n in self.node.css(selector)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find_all(self, name=None, attrs=None, string=None, text=None):
+        string = string if string is not None else text
+        if string is True:
+            return [TextNode(n.text_content, SelectolaxNode(n.parent))
+                    for n in self.node.traverse(include_text=True)
+                    if n.tag == '-text']
+        found = [SelectolaxNode(n) for n in self.node.css(name or '*')]
+        if attrs:
+            found = [n for n in found if all(n.node.attributes.get(k) == v for k, v in attrs.items())]
+        return found
+
+    def find(self, name=None, attrs=None):
+        if not attrs:
+            return self.select_one(name or '*')
+        found = self.find_all(name, attrs)
+        return found[0] if found else None
+
+
+class SelectolaxDocument(SelectolaxNode):
+    """The parsed page; element lookups search the whole document"""
+    __slots__ = ('tree',)
+
+    def __init__(self, html):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as Parser
+        except ImportError:
+            from selectolax.parser import HTMLParser as Parser
+        self.tree = Parser(html)
+        super().__init__(self.tree.root)
+
+    def __str__(self):
+        return self.tree.html or ''
+
+    @property
+    def title(self):
+        return self.find('title')
+
+
+# ----------------------------------------------------------------------
+# Selector index
+# ----------------------------------------------------------------------
+COMPOUND = re.compile(r'(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$')
+CLASS = re.compile(r'\.([\w-]+)')
+ATTRIBUTE = re.compile(r'\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]*)))?\s*\]')
+
+ATTRIBUTE_TESTS = {
+    None: lambda value, wanted: True,
+    '=': lambda value, wanted: value == wanted,
+    '*=': lambda value, wanted: bool(wanted) and wanted in value,
+    '^=': lambda value, wanted: bool(wanted) and value.startswith(wanted),
+    '$=': lambda value, wanted: bool(wanted) and value.endswith(wanted),
+    '~=': lambda value, wanted: wanted in value.split(),
+}
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector):
+    """[(tag, classes, conditions)] per descendant step, or None when the
+    selector needs more than tags, classes, attributes and descendant
+    combinators (those fall back to a regular select)"""
+    if re.search(r'[,>+~:()]', ATTRIBUTE.sub('', selector)):
+        return None
+    steps = []
+    for part in re.split(r'\s+(?![^\[]*\])', selector.strip()):
+        compound = COMPOUND.match(part)
+        if not part or not compound:
+            return None
+        rest = compound['rest']
+        if CLASS.sub('', ATTRIBUTE.sub('', rest)):
+            return None
+        conditions = []
+        for name, op, double, single, bare in ATTRIBUTE.findall(rest):
+            conditions.append((name.lower(), op or None, (double or single or bare) if op else None))
+        tag = compound['tag'].lower() if compound['tag'] not in (None, '*') else None
+        steps.append((tag, tuple(CLASS.findall(ATTRIBUTE.sub('', rest))), tuple(conditions)))
+    return steps or None
+
+
+def _walk(soup):
+    """(element, tag, {attribute: string value}, parent position) in document
+    order; positions count the elements yielded so far"""
+    position = 0
+    if isinstance(soup, SelectolaxNode):
+        # traverse() walks in C; parents are found again through their mem_id
+        positions = {}
+        own = None if isinstance(soup, SelectolaxDocument) else soup.node.mem_id
+        for node in soup.node.traverse():
+            if node.tag[0] in '-_!' or node.mem_id == own:
+                continue
+            positions[node.mem_id] = position
+            parent = node.parent
+            parent = positions.get(parent.mem_id, -1) if parent is not None else -1
+            yield SelectolaxNode(node), node.tag, {k: v or '' for k, v in node.attributes.items()}, parent
+            position += 1
+    else:
+        from bs4 import Tag
+        stack = [(child, -1) for child in reversed(soup.contents) if isinstance(child, Tag)]
+        while stack:
+            tag, parent = stack.pop()
+            yield tag, tag.name, {k: ' '.join(v) if isinstance(v, list) else v for k, v in tag.attrs.items()}, parent
+            stack.extend((child, position) for child in reversed(tag.contents) if isinstance(child, Tag))
+            position += 1
+
+
+class SelectorIndex:
+    """Tags, classes and attribute values of every element, collected in one
+    walk, so each probe selector is a few dictionary lookups instead of a
+    full tree traversal. Results come back in document order, like select().
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.elements = []
+        self.tags = []
+        self.attrs = []
+        self.parents = []
+        self.by_tag = defaultdict(list)
+        self.by_class = defaultdict(list)
+        self.by_value = defaultdict(lambda: defaultdict(list))  # attribute -> value -> positions
+
+        for position, (element, tag, attrs, parent) in enumerate(_walk(soup)):
+            self.elements.append(element)
+            self.tags.append(tag)
+            self.attrs.append(attrs)
+            self.parents.append(parent)
+            self.by_tag[tag].append(position)
+            for name, value in attrs.items():
+                self.by_value[name][value].append(position)
+            for name in attrs.get('class', '').split():
+                self.by_class[name].append(position)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def select(self, selector):
+        steps = compile_selector(selector)
+        if steps is None:
+            return self.soup.select(selector)
+        *ancestors, last = steps
+        return [self.elements[p] for p in self._candidates(last) if self._has_ancestors(p, ancestors)]
+
+    def count(self, selector):
+        return len(self.select(selector))
+
+    def first_match(self, selectors):
+        """(selector, elements) for the first selector that matches anything"""
+        for selector in selectors:
+            elements = self.select(selector)
+            if elements:
+                return selector, elements
+        return None, []
+
+    def _matches(self, position, step):
+        tag, classes, conditions = step
+        if tag and self.tags[position] != tag:
+            return False
+        attrs = self.attrs[position]
+        if classes and not set(classes) <= set(attrs.get('class', '').split()):
+            return False
+        return all(name in attrs and ATTRIBUTE_TESTS[op](attrs[name], value) for name, op, value in conditions)
+
+    def _candidates(self, step):
+        tag, classes, conditions = step
+        pools = [self.by_class.get(name, []) for name in classes]
+        if tag:
+            pools.append(self.by_tag.get(tag, []))
+        if pools:
+            base = min(pools, key=len)
+        elif conditions:
+            # Distinct values of one attribute are far fewer than elements
+            name, op, value = conditions[0]
+            base = sorted(p for v, positions in self.by_value.get(name, {}).items()
+                          if ATTRIBUTE_TESTS[op](v, value) for p in positions)
+        else:
+            base = range(len(self.elements))
+        return [p for p in base if self._matches(p, step)]
+
+    def _has_ancestors(self, position, steps):
+        for step in reversed(steps):
+            position = self.parents[position]
+            while position >= 0 and not self._matches(position, step):
+                position = self.parents[position]
+            if position < 0:
+                return False
+        return True
+
+
+# ----------------------------------------------------------------------
+# Parse-once document cache
+# ----------------------------------------------------------------------
+class Document:
+    """One page's HTML with its tree, selector index, tag counts and scripts,
+    each built on first use and then reused by every later step"""
+
+    def __init__(self, html, backend=None):
+        self.html = html
+        self.backend = resolve_backend(backend)
+
+    @cached_property
+    def soup(self):
+        return parse_html(self.html, self.backend)
+
+    @cached_property
+    def index(self):
+        return SelectorIndex(self.soup)
+
+    @cached_property
+    def tag_counts(self):
+        return Counter(self.index.tags)
+
+    @cached_property
+    def scripts(self):
+        return list(iter_scripts(self.html))
+
+    @cached_property
+    def title(self):
+        title = self.soup.title
+        return title.string if title else None
+
+    def count(self, tag=None):
+        """Elements in the page, or only those with `tag` (find_all(tag) without the walk)"""
+        return self.tag_counts[tag] if tag else len(self.index)
+
+    def select(self, selector):
+        return self.index.select(selector)
+
+
+_documents = OrderedDict()
+_documents_lock = threading.Lock()
+_document_stats = {'hits': 0, 'misses': 0}
+
+
+def load_document(html, backend=None):
+    """The cached Document for this exact content (and backend), creating it
+    on a miss; the least recently used pages are evicted past
+    HTML_DOCUMENT_CACHE_SIZE"""
+    backend = resolve_backend(backend)
+    key = (hashlib.sha1(html.encode('utf-8', 'surrogatepass')).hexdigest(), backend)
+    with _documents_lock:
+        document = _documents.get(key)
+        if document is not None:
+            _documents.move_to_end(key)
+            _document_stats['hits'] += 1
+            return document
+        _document_stats['misses'] += 1
+        document = _documents[key] = Document(html, backend)
+        while len(_documents) > HTML_DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+    return document
+
+
+def document_cache_info():
+    with _documents_lock:
+        return dict(_document_stats, size=len(_documents))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP Conditional-Request Cache
+Stores ETag / Last-Modified validators and bodies on disk, revalidates with
+If-None-Match / If-Modified-Since and serves the stored body on a 304
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import sys
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+try:
+    from settings import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+except ImportError:
+    HTTP_CACHE_DIR = "data/cache/http"
+    HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding, not the stored (decoded) body
+WIRE_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+class HttpCache:
+    """Disk store of validated responses with size-based LRU eviction.
+
+    Each entry is a `<key>.json` metadata file plus a `<key>.body` file. File
+    mtimes record recency, so the LRU order survives restarts.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        bodies = sorted(self.directory.glob("*.body"), key=lambda p: p.stat().st_mtime)
+        for body in bodies:
+            size = body.stat().st_size
+            self.entries[body.stem] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def key_for(request):
+        """Cache key: method, URL and Accept header (endpoints answer per Accept)"""
+        accept = request.headers.get('Accept', '')
+        return hashlib.sha256(f"{request.method} {request.url} {accept}".encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, key):
+        """Return (meta, body) for a stored entry and mark it recently used"""
+        with self.lock:
+            if key not in self.entries:
+                return None
+            meta_path, body_path = self._paths(key)
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                body = body_path.read_bytes()
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            now = time.time()
+            os.utime(body_path, (now, now))
+            self.entries.move_to_end(key)
+            return meta, body
+
+    def put(self, key, response):
+        """Store a 200 response that carries at least one validator"""
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in WIRE_HEADERS}
+        meta = {
+            'url': response.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'encoding': response.encoding,
+            'headers': headers,
+            'stored_at': time.time()
+        }
+        body = response.content
+        with self.lock:
+            meta_path, body_path = self._paths(key)
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            body_path.write_bytes(body)
+            self.entries[key] = len(body)
+            self.total_bytes += len(body)
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            logger.debug(f"🗑️ Evicted cache entry {oldest[:12]}")
+
+    def _remove(self, key):
+        self.total_bytes -= self.entries.pop(key, 0)
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GETs against an HttpCache.
+
+    Mount it on a session (create_session(cache=True) does this) and every
+    plain GET sends the stored validators. A 304 comes back to the caller as
+    the stored 200 with `response.from_cache = True`. Streaming requests skip
+    the cache so their bodies are never buffered.
+    """
+
+    def __init__(self, cache=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache or HttpCache()
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self.cache.key_for(request)
+        cached = self.cache.get(key)
+        if cached:
+            meta, _ = cached
+            stored = CaseInsensitiveDict(meta['headers'])
+            if 'ETag' in stored and 'If-None-Match' not in request.headers:
+                request.headers['If-None-Match'] = stored['ETag']
+            if 'Last-Modified' in stored and 'If-Modified-Since' not in request.headers:
+                request.headers['If-Modified-Since'] = stored['Last-Modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and cached:
+            self.cache.hits += 1
+            return self._from_cache(response, *cached)
+
+        self.cache.misses += 1
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self.cache.put(key, response)
+        return response
+
+    @staticmethod
+    def _from_cache(response, meta, body):
+        """Turn a 304 into the stored 200, refreshed with the 304's headers"""
+        headers = CaseInsensitiveDict(meta['headers'])
+        for name, value in response.headers.items():
+            if name.lower() not in WIRE_HEADERS:
+                headers[name] = value
+        response.status_code = meta['status']
+        response.reason = meta['reason']
+        response.headers = headers
+        response.encoding = meta['encoding']
+        response._content = body
+        response.from_cache = True
+        return response
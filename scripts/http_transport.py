@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Transport
+One tuned requests session for every script: pooled keep-alive connections,
+retries with jittered exponential backoff and a per-request deadline
+"""
+
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from http_cache import CachingAdapter, HttpCache
+from rate_limiter import get_scheduler
+
+try:
+    from settings import HEADERS, MAX_RETRIES, TIMEOUT
+    from settings import CONNECT_TIMEOUT, REQUEST_DEADLINE, BACKOFF_FACTOR, BACKOFF_MAX
+    from settings import POOL_CONNECTIONS, POOL_MAXSIZE
+    from settings import HTTP_CACHE_ENABLED
+except ImportError:
+    HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+    MAX_RETRIES = 3
+    TIMEOUT = 30
+    CONNECT_TIMEOUT = 5
+    REQUEST_DEADLINE = 60
+    BACKOFF_FACTOR = 0.5
+    BACKOFF_MAX = 10
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 16
+    HTTP_CACHE_ENABLED = False
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+def backoff_delay(attempt, factor=BACKOFF_FACTOR, cap=BACKOFF_MAX):
+    """Full-jitter exponential backoff: uniform(0, min(cap, factor * 2**attempt))"""
+    return random.uniform(0, min(cap, factor * (2 ** attempt)))
+
+
+def retry_after_seconds(response):
+    """Seconds asked for by a Retry-After header, or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ScraperSession(requests.Session):
+    """requests.Session with pooled adapters, default timeouts, retries and a deadline.
+
+    Every call gets `timeout=(CONNECT_TIMEOUT, TIMEOUT)` unless one is passed.
+    Idempotent requests that fail with a connection error, a timeout or a
+    retryable status are retried up to `max_retries` times. Retries reuse the
+    pooled keep-alive connection and sleep with jittered exponential backoff.
+    The whole call, retries included, stops at `deadline` seconds (pass
+    `deadline=` per call to override).
+
+    With `cache=True` (or an HttpCache instance) GETs go through the on-disk
+    conditional-request cache in http_cache.py. Every attempt first waits for
+    its host's token in the shared RequestScheduler.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, timeout=TIMEOUT, connect_timeout=CONNECT_TIMEOUT,
+                 deadline=REQUEST_DEADLINE, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 cache=HTTP_CACHE_ENABLED, scheduler=None):
+        super().__init__()
+        self.scheduler = scheduler or get_scheduler()
+        self.max_retries = max_retries
+        self.default_timeout = (connect_timeout, timeout)
+        self.deadline = deadline
+
+        pool_options = dict(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        if cache:
+            self.cache = cache if isinstance(cache, HttpCache) else HttpCache()
+            adapter = CachingAdapter(self.cache, **pool_options)
+        else:
+            self.cache = None
+            adapter = HTTPAdapter(**pool_options)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def _attempt_timeout(self, timeout, remaining):
+        """Clamp the per-attempt timeout so it never outlives the deadline"""
+        if remaining is None:
+            return timeout
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return (min(connect, remaining) if connect else remaining,
+                    min(read, remaining) if read else remaining)
+        return min(timeout, remaining) if timeout else remaining
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.pop('timeout', None) or self.default_timeout
+        deadline = kwargs.pop('deadline', self.deadline)
+        retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            remaining = None if deadline is None else deadline - (time.monotonic() - started)
+            if self.scheduler.acquire(url, max_wait=remaining) is None:
+                # Reserved up front, so the pacing wait never runs past the deadline
+                raise requests.exceptions.Timeout(f"{method} {url}: next request slot is past the {deadline}s deadline")
+            if remaining is not None:
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f"{method} {url}: {deadline}s deadline passed waiting for a request slot")
+            try:
+                response = super().request(method, url,
+                                           timeout=self._attempt_timeout(timeout, remaining), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                delay = backoff_delay(attempt)
+                if not self._has_time_for(started, deadline, delay):
+                    raise
+                logger.warning(f"🔁 {method} {url} failed ({e.__class__.__name__}), retry {attempt + 1}/{retries} in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                if not self._has_time_for(started, deadline, delay):
+                    return response
+                logger.warning(f"🔁 {method} {url} returned {response.status_code}, retry {attempt + 1}/{retries} in {delay:.1f}s")
+                # Hand the connection back to the pool before sleeping
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _has_time_for(started, deadline, delay):
+        if deadline is None:
+            return True
+        return time.monotonic() - started + delay < deadline
+
+
+def create_session(headers=None, **kwargs):
+    """Build the shared transport session used by every scraper"""
+    session = ScraperSession(**kwargs)
+    session.headers.update(HEADERS if headers is None else headers)
+    return session
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+SportyBet Hybrid Scraper
+Boots a browser once to collect cookies, request headers and the API URLs the
+page really calls, then polls those APIs with the plain HTTP session. The
+browser only comes back when the site rejects the session or a cookie expires.
+"""
+
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from api_scraper import SportyBetAPIecraper
+from driver_pool import get_driver_pool
+from network_capture import NetworkCapture
+from page_readiness import NetworkIdle, DomQuiet
+from odds_delta import DeltaEngine, summarize
+
+try:
+    from settings import SPORTYBET_UPCOMING_URL, SPORTYBET_LIVE_URL
+    from settings import HYBRID_POLL_INTERVAL, HYBRID_MAX_REBOOTSTRAPS, DELTA_STATE_PATH
+except ImportError:
+    SPORTYBET_UPCOMING_URL = "https://sportybet.com/ng/sport/football/sr:category:1/today"
+    SPORTYBET_LIVE_URL = "https://sportybet.com/ng/sport/football/sr:category:1/live"
+    HYBRID_POLL_INTERVAL = 1
+    HYBRID_MAX_REBOOTSTRAPS = 3
+    DELTA_STATE_PATH = "data/state/odds_state.json"
+
+# Statuses that mean the session (cookies/tokens) is no longer accepted
+REJECTED_STATUSES = frozenset({401, 403, 419, 440})
+
+# Cookies that carry the login/session; only their expiry forces a new
+# bootstrap (analytics and tracking cookies come and go on their own)
+SESSION_COOKIE = re.compile(r'sess|sid|token|auth|jwt|login|refresh', re.IGNORECASE)
+
+# Browser request headers that must not be replayed verbatim
+UNREPLAYABLE_HEADERS = frozenset({'host', 'content-length', 'connection', 'cookie', 'accept-encoding'})
+
+
+class SessionRejected(RuntimeError):
+    """The API refused the bootstrapped session; the browser has to run again"""
+
+
+class HybridScraper(SportyBetAPIecraper):
+    """Browser for bootstrap, requests for the steady state"""
+
+    def __init__(self, pages=None, max_rebootstraps=HYBRID_MAX_REBOOTSTRAPS):
+        super().__init__()
+        self.pages = pages or [SPORTYBET_UPCOMING_URL, SPORTYBET_LIVE_URL]
+        self.max_rebootstraps = max_rebootstraps
+        self.fetch_engine.fetcher = self.fetch_endpoint
+        self.endpoints = {}  # API url -> headers the browser sent
+        self.websockets = {}  # push feeds the page opened, with the frames it sent
+        self.session_expires = None
+        self.bootstraps = 0
+        self.rejections = 0  # consecutive polls refused since the last good one
+
+    # ------------------------------------------------------------------
+    # Browser bootstrap
+    # ------------------------------------------------------------------
+    def bootstrap(self):
+        """Load the pages in Chrome and copy its session into the HTTP client.
+
+        Returns the matches parsed from the bodies captured during the load,
+        so the bootstrap cycle costs no extra API requests.
+        """
+        self.bootstraps += 1
+        self.logger.info(f"🌐 Bootstrapping session in the browser (#{self.bootstraps})...")
+        pool = get_driver_pool()
+        driver = pool.acquire()
+        broken = False
+        matches = []
+        endpoints = {}
+
+        try:
+            capture = NetworkCapture(driver)
+            # A bootstrap may come round any number of times in a long run, so
+            # its page loads are never held to a page budget
+            with self.scheduler.page_budget(0):
+                for page in self.pages:
+                    capture.capture(page, NetworkIdle() & DomQuiet(), scheduler=self.scheduler)
+                    for response in capture.json_responses():
+                        endpoints[response.url] = {
+                            name: value for name, value in response.request_headers.items()
+                            if not name.startswith(':') and name.lower() not in UNREPLAYABLE_HEADERS
+                        }
+                        matches.extend(self.parse_json_matches(response.data, source=response.url))
+            self.websockets = {feed['url']: feed for feed in capture.websockets.values()}
+
+            self.session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent")
+            self.session.cookies.clear()
+            expiries = []
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(cookie['name'], cookie['value'],
+                                         domain=cookie.get('domain'), path=cookie.get('path', '/'))
+                if cookie.get('expiry') and SESSION_COOKIE.search(cookie['name']):
+                    expiries.append(cookie['expiry'])
+            self.session_expires = min(expiries) if expiries else None
+
+        except Exception:
+            broken = True
+            raise
+        finally:
+            pool.release(driver, broken=broken)
+
+        if not endpoints:
+            # Nothing captured: fall back to the endpoints found in the page source
+            self.logger.warning("⚠️ No API responses captured, probing page source endpoints")
+            found, _ = self.find_api_endpoints_from_source(self.pages[0])
+            for info in self.test_api_endpoints(found):
+                if info['data_type'] != 'text':
+                    endpoints[info['url']] = info['headers']
+
+        self.endpoints = endpoints
+        self.logger.info(f"✅ Bootstrap complete: {len(endpoints)} API endpoints, "
+                         f"{len(self.session.cookies)} cookies, {len(matches)} matches")
+        return matches
+
+    def session_expired(self):
+        return self.session_expires is not None and time.time() >= self.session_expires
+
+    # ------------------------------------------------------------------
+    # HTTP steady state
+    # ------------------------------------------------------------------
+    def fetch_endpoint(self, url):
+        """Fetcher for the engine: one API call with the browser's headers,
+        returning the body text for parse_json_matches to decode"""
+        response = self.session.get(url, headers=self.endpoints.get(url))
+        if response.status_code in REJECTED_STATUSES:
+            raise SessionRejected(f"{response.status_code} from {url}")
+        response.raise_for_status()
+        if 'json' not in response.headers.get('content-type', '').lower():
+            # A login wall or challenge page instead of the API payload
+            raise SessionRejected(f"Non-JSON response from {url}")
+        return response.text, response.status_code
+
+    def poll_once(self):
+        """Fetch every known endpoint once, bootstrapping instead when the session is gone"""
+        return [match for matches in self.poll_sources().values() for match in matches]
+
+    def poll_sources(self):
+        """poll_once's matches by endpoint, for the endpoints that answered.
+
+        A failed endpoint is left out rather than reported empty. After a
+        bootstrap the matches come under None: they are whatever the page
+        loads happened to capture, not any one endpoint's complete list.
+        """
+        if self.endpoints and not self.session_expired():
+            results = self.fetch_engine.fetch_all(list(self.endpoints))
+            rejected = [r for r in results if isinstance(r.error, SessionRejected)]
+            if not rejected:
+                self.rejections = 0
+                by_source = {}
+                for result in results:
+                    if result.ok:
+                        by_source[result.url] = self.parse_json_matches(result.text, source=result.url)
+                    else:
+                        self.logger.warning(f"⚠️ {result.url} failed: {result.error}")
+                return by_source
+
+            return {None: self.recover(rejected[0].error)}
+
+        return {None: self.bootstrap()}
+
+    def recover(self, error):
+        """Bootstrap again after a rejected poll, giving up after too many in a row"""
+        self.rejections += 1
+        if self.rejections > self.max_rebootstraps:
+            raise SessionRejected(f"Session still rejected after {self.max_rebootstraps} bootstraps")
+        self.logger.warning(f"🔒 Session rejected ({error}), bootstrapping again")
+        return self.bootstrap()
+
+    def run(self, cycles=1, interval=HYBRID_POLL_INTERVAL):
+        """Bootstrap, then poll the APIs `cycles` times (None = until interrupted).
+
+        Each cycle appends only its odds changes to a deltas JSONL file; the
+        full snapshot is saved once, at the end. Every endpoint is diffed on
+        its own, so an endpoint that fails a cycle reports no removals.
+        """
+        self.logger.info("🚀 Starting SportyBet hybrid scraper...")
+        deltas = DeltaEngine(DELTA_STATE_PATH)
+        output_dir = Path("data/raw")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        delta_path = output_dir / f"sportybet_deltas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        cycle = 0
+        try:
+            with open(delta_path, 'w', encoding='utf-8', buffering=1) as delta_file:
+                while cycles is None or cycle < cycles:
+                    started = time.monotonic()
+                    by_source = self.poll_sources()
+                    deltas.retain_scopes(self.endpoints)
+                    records = []
+                    for source, matches in by_source.items():
+                        records.extend(deltas.diff(matches, scope=source))
+                    self.matches_data = [match for matches in by_source.values() for match in matches]
+                    for record in records:
+                        delta_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    cycle += 1
+                    elapsed = time.monotonic() - started
+                    self.logger.info(f"🔄 Cycle {cycle}: {len(self.matches_data)} matches in {elapsed:.2f}s, "
+                                     f"changes {summarize(records)}")
+                    if cycles is None or cycle < cycles:
+                        time.sleep(max(0.0, interval - elapsed))
+        except KeyboardInterrupt:
+            self.logger.info("⏹️ Stopped by user")
+        except SessionRejected as e:
+            self.logger.error(f"❌ Stopping: {e}")
+        finally:
+            self.fetch_engine.close()
+            deltas.save()
+
+        self.logger.info(f"✅ Deltas saved to {delta_path}")
+        self.api_endpoints = [{'url': url, 'headers': headers} for url, headers in self.endpoints.items()]
+        self.save_data()
+        self.logger.info(f"✅ Hybrid scraping completed after {cycle} cycles and {self.bootstraps} bootstraps")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Browser-bootstrapped API polling')
+    parser.add_argument('--cycles', type=int, default=1, help='Polling cycles, 0 = run until interrupted')
+    parser.add_argument('--interval', type=float, default=HYBRID_POLL_INTERVAL, help='Seconds between cycles')
+    args = parser.parse_args()
+
+    scraper = HybridScraper()
+    scraper.run(cycles=args.cycles or None, interval=args.interval)
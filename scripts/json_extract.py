@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Embedded JSON Extractor
+Pulls whole JSON objects and arrays out of script text in one forward pass.
+A cheap regex finds the places a value can start (an assignment such as
+`matches = [` or `"events": {`, or any `{"` / `[{` opener) and
+json.JSONDecoder.raw_decode reads the complete, properly nested value from
+there; scanning resumes after its end, so no byte is decoded twice.
+"""
+
+import json
+import re
+
+_decoder = json.JSONDecoder()
+
+# `name =`, `name:`, `"name":` or `'name':` right before an object or array
+# (not `==` or `=>`). Starting the pattern at the name keeps the search fast;
+# a name glued to a longer identifier (`rematches`) is rejected afterwards
+ASSIGNMENT = r'(?P<name>{names})["\']?\s*(?::|=(?![=>]))\s*(?=[\[{{])'
+ANY_NAME = r'[A-Za-z_$][\w$]*'
+
+# Where a JSON object or array (as opposed to a JS block or index) can start
+OPENER = re.compile(r'\{(?=\s*")|\[(?=\s*[{\["\d-])')
+
+
+def _assignment_pattern(names):
+    if names is None:
+        return re.compile(ASSIGNMENT.format(names=ANY_NAME))
+    return re.compile(ASSIGNMENT.format(names='|'.join(re.escape(n) for n in names)))
+
+
+def iter_json_assignments(text, names=None):
+    """(name, value, start, end) for each JSON value assigned to one of `names`
+    (any identifier when None). Values that are not strict JSON (JS object
+    literals with bare keys, single quotes, functions) are skipped."""
+    pattern = _assignment_pattern(names)
+    position = 0
+    while True:
+        found = pattern.search(text, position)
+        if found is None:
+            return
+        start = found.start()
+        if start and (text[start - 1].isalnum() or text[start - 1] in '_$'):
+            position = found.end()
+            continue
+        try:
+            value, end = _decoder.raw_decode(text, found.end())
+        except ValueError:
+            position = found.end()
+            continue
+        yield found.group('name'), value, found.end(), end
+        position = end
+
+
+def _key_pattern(keywords):
+    if not keywords:
+        return None
+    return re.compile(r'"[^"\\]*(?:{})[^"\\]*"\s*:'.format('|'.join(map(re.escape, keywords))), re.IGNORECASE)
+
+
+def iter_json_values(text, keywords=None):
+    """(value, start, end) for each outermost JSON object/array in `text`;
+    with `keywords`, only those with a key containing one of them"""
+    keys = _key_pattern(keywords)
+    position = 0
+    while True:
+        found = OPENER.search(text, position)
+        if found is None:
+            return
+        try:
+            value, end = _decoder.raw_decode(text, found.start())
+        except ValueError:
+            position = found.end()
+            continue
+        position = end
+        if keys is None or keys.search(text, found.start(), end):
+            yield value, found.start(), end
+
+
+def decode_candidates(text, starts, keywords=None):
+    """Like iter_json_values, for opener positions a caller's own scan has
+    already found (ascending); starts inside a decoded value are skipped"""
+    keys = _key_pattern(keywords)
+    end = 0
+    for start in starts:
+        if start < end:
+            continue
+        try:
+            value, stop = _decoder.raw_decode(text, start)
+        except ValueError:
+            continue
+        end = stop
+        if keys is None or keys.search(text, start, stop):
+            yield value, start, stop
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Match Reader
+Finds match objects in a JSON response while it downloads, without holding
+the whole body. A light tokenizer follows the nesting (brackets, strings and
+object keys only; numbers and literals are never looked at) until an object
+shows a team key, then json.JSONDecoder.raw_decode reads that object whole
+as soon as its closing brace has arrived. The object and any matches nested in it
+come out through match_walker.iter_match_objects, so a streamed response
+yields the same objects, in the same order, as walking the decoded body.
+Whether an object is a match, and so whether its detail subtrees (odds,
+score, ...) are skipped, is only known once it shows a team key or closes;
+matches found inside a still-undecided object are held back until then.
+
+Only the text from the oldest still-open candidate object onwards is kept.
+An object counts as a candidate for its first JSON_STREAM_MATCH_WINDOW
+characters; one that has shown no team key by then is treated as a plain
+container and its text is let go, which is what keeps memory flat however
+large the feed. A match whose first team key comes later than that is missed.
+"""
+
+import codecs
+import json
+import re
+import sys
+import os
+
+from match_walker import DETAIL_KEYS, TEAM_KEYS, iter_match_objects
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+try:
+    from settings import JSON_STREAM_CHUNK_SIZE, JSON_STREAM_MATCH_WINDOW
+except ImportError:
+    JSON_STREAM_CHUNK_SIZE = 64 * 1024
+    JSON_STREAM_MATCH_WINDOW = 32 * 1024
+
+_decoder = json.JSONDecoder()
+
+# A complete string, with the colon that makes it a key; a bracket; or a
+# lone quote, which means the string continues in a chunk not yet received
+TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"(?:\s*(:))?|[{}\[\]]|"', re.DOTALL)
+TO_END = re.compile(r'\s*\Z')
+
+# Frame fields: [bracket, absolute start, is match (None = undecided),
+#                matches found inside it while undecided]
+BRACKET, START, MATCH, HELD = range(4)
+
+
+class MatchStream:
+    """Feed it text as it arrives; each call returns the match objects
+    completed so far.
+
+        stream = MatchStream()
+        for chunk in chunks:
+            for obj in stream.feed(chunk):
+                ...
+        stream.close()
+    """
+
+    def __init__(self, team_keys=TEAM_KEYS, detail_keys=DETAIL_KEYS, window=JSON_STREAM_MATCH_WINDOW):
+        self.team_keys = team_keys
+        self.detail_keys = detail_keys
+        self.window = window
+        self.buffer = ''
+        self.base = 0       # absolute offset of buffer[0]
+        self.position = 0   # absolute offset the tokenizer resumes from
+        self.stack = []
+        self.pending = 0    # characters of an unfinished match tried last time
+        self.root = None    # 'dict' or 'list' once the first bracket is seen, '' when not JSON
+        self.empty = True   # the root has no members
+        self.received = 0
+        self.peak_buffer = 0
+
+    def feed(self, text, final=False):
+        """Match objects completed by this text; pass final=True with the last
+        piece of the body"""
+        self.received += len(text)
+        if self.root is None and text.strip() and text.lstrip()[0] not in '{[':
+            self.root = ''
+        if self.root == '':
+            return []
+        self.buffer += text
+        self.peak_buffer = max(self.peak_buffer, len(self.buffer))
+        found = self._scan(final)
+        self._trim(found)
+        return found
+
+    def close(self):
+        """Matches still held when the body ended are incomplete; drop them"""
+        self.stack.clear()
+        self.buffer = ''
+
+    def _scan(self, final):
+        found = []
+        buffer, base, stack = self.buffer, self.base, self.stack
+        position = self.position
+
+        if self.pending:
+            # Retry an unfinished match only once its buffered text has
+            # doubled, so a match split over many small chunks is decoded a
+            # bounded number of times instead of once per chunk
+            frame = stack[-1]
+            if not final and base + len(buffer) - frame[START] < 2 * self.pending:
+                return found
+            position = self._decode(frame, found)
+            if position is None:
+                return found
+
+        while True:
+            token = TOKEN.search(buffer, position - base)
+            if token is None:
+                position = base + len(buffer)
+                break
+            text = token.group()
+            if text == '"':
+                position = base + token.start()
+                break
+
+            if text[0] == '"':
+                if token.group(2) is None and not final and TO_END.match(buffer, token.end()):
+                    # A colon may still follow in the next chunk, after any whitespace
+                    position = base + token.start()
+                    break
+                position = base + token.end()
+                if stack:
+                    self.empty = False
+                    frame = stack[-1]
+                    if token.group(2) and frame[MATCH] is None and token.group(1) in self.team_keys:
+                        frame[MATCH] = True
+                        position = self._decode(frame, found)
+                        if position is None:
+                            position = frame[START]
+                            break
+                continue
+
+            position = base + token.end()
+            if text in '{[':
+                if stack:
+                    self.empty = False
+                else:
+                    self.root = 'dict' if text == '{' else 'list'
+                # Arrays are never matches; objects stay undecided until a key says so
+                stack.append([text, base + token.start(), False if text == '[' else None, []])
+            elif stack:
+                # Closed without a team key: not a match, so what it held stands
+                self._release(stack.pop(), found)
+
+        self.position = position
+        return found
+
+    def _decode(self, frame, found):
+        """Read a match object whole and pop it; the position after it, or
+        None (the match left pending) while its end has not arrived"""
+        try:
+            value, end = _decoder.raw_decode(self.buffer, frame[START] - self.base)
+        except ValueError:
+            self.pending = self.base + len(self.buffer) - frame[START]
+            return None
+        self.pending = 0
+        self.stack.pop()
+        # Anything held inside the match is in `value` again
+        self._hold(iter_match_objects(value, self.team_keys, self.detail_keys), found)
+        return self.base + end
+
+    def _hold(self, matches, found):
+        """Pass matches on, or hold them in the innermost undecided object:
+        should it turn out to be a match, it is decoded whole instead"""
+        for frame in reversed(self.stack):
+            if frame[MATCH] is None:
+                frame[HELD].extend(matches)
+                return
+        found.extend(matches)
+
+    def _release(self, frame, found):
+        if frame[HELD]:
+            self._hold(frame[HELD], found)
+            frame[HELD] = []
+
+    def _trim(self, found):
+        """Drop text no open candidate can need again"""
+        keep = self.position
+        for frame in self.stack:
+            if frame[MATCH] is None:
+                if self.position - frame[START] > self.window:
+                    # Every object outside it is decided already
+                    frame[MATCH] = False
+                    found.extend(frame[HELD])
+                    frame[HELD] = []
+                else:
+                    keep = min(keep, frame[START])
+                    break
+            elif frame[MATCH]:
+                keep = min(keep, frame[START])
+                break
+        if keep > self.base:
+            self.buffer = self.buffer[keep - self.base:]
+            self.base = keep
+
+
+def iter_response_matches(response, chunk_size=JSON_STREAM_CHUNK_SIZE, stream=None):
+    """Match objects from a requests response opened with stream=True, each
+    yielded as soon as its closing brace has downloaded. Pass a MatchStream
+    to read its root type and size counters afterwards."""
+    stream = stream or MatchStream()
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield from stream.feed(decoder.decode(chunk))
+        yield from stream.feed(decoder.decode(b'', final=True), final=True)
+    finally:
+        stream.close()
+        response.close()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Live Odds Feed Consumer
+Attaches to the site's push WebSocket (found by the browser bootstrap's CDP
+capture), replays the page's subscription frames and keeps an in-memory odds
+board current, reconnecting and resubscribing whenever the socket drops
+"""
+
+import json
+import logging
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.parse import urlsplit
+import sys
+import os
+
+import websocket
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from http_transport import backoff_delay
+from odds_delta import DeltaEngine, match_key
+
+try:
+    from settings import FEED_IDLE_TIMEOUT, FEED_MAX_RECONNECTS
+except ImportError:
+    FEED_IDLE_TIMEOUT = 30
+    FEED_MAX_RECONNECTS = 10
+
+# Engine.IO heartbeat packets (Socket.IO sockets expect a pong for every ping)
+ENGINE_IO_PING = '2'
+ENGINE_IO_PONG = '3'
+
+
+def decode_frame(message):
+    """JSON payload of a text frame, or None.
+
+    Socket.IO frames carry a numeric packet prefix ('42["odds", {...}]'); the
+    prefix is dropped and an event array is reduced to its data.
+    """
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', errors='replace')
+    body = message.lstrip('0123456789')
+    if not body:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if body != message and isinstance(payload, list) and payload and isinstance(payload[0], str):
+        payload = payload[1] if len(payload) == 2 else payload[1:]
+    return payload
+
+
+class OddsBoard:
+    """Latest known state of every match, merged from feed updates (thread-safe).
+
+    apply() returns the delta records for the update, so callers can forward
+    changes instead of re-reading the board.
+    """
+
+    def __init__(self):
+        self.matches = {}
+        self.deltas = DeltaEngine()
+        self.updates = 0
+        self.updated_at = None
+        self.lock = threading.Lock()
+
+    def apply(self, matches):
+        with self.lock:
+            merged = []
+            for match in matches:
+                key = match_key(match)
+                self.matches[key] = {**self.matches.get(key, {}), **match}
+                merged.append(self.matches[key])
+                self.updates += 1
+            self.updated_at = time.time()
+            return self.deltas.diff(merged)
+
+    def snapshot(self):
+        with self.lock:
+            return {key: dict(match) for key, match in self.matches.items()}
+
+    def __len__(self):
+        return len(self.matches)
+
+
+class FeedConsumer:
+    """Keeps one push feed attached and feeds its frames into an OddsBoard.
+
+    `subscriptions` are the frames to send after every (re)connect, normally
+    the ones the browser sent on the captured socket. `parse` turns a decoded
+    payload into match dicts (SportyBetAPIecraper.parse_json_matches).
+    A socket silent for `idle_timeout` seconds is treated as dead. After
+    `max_reconnects` failed connects in a row the consumer gives up.
+    With `record` set, every raw frame is appended to that JSONL file for
+    feed_replay_server.py. `on_delta` is called with each change record.
+    """
+
+    def __init__(self, url, parse, board=None, subscriptions=(), headers=None, cookie=None,
+                 idle_timeout=FEED_IDLE_TIMEOUT, max_reconnects=FEED_MAX_RECONNECTS, record=None,
+                 on_delta=None, logger=None):
+        self.url = url
+        self.parse = parse
+        self.board = board if board is not None else OddsBoard()
+        self.subscriptions = [s for s in subscriptions if s]
+        self.headers = headers or {}
+        self.cookie = cookie
+        self.idle_timeout = idle_timeout
+        self.max_reconnects = max_reconnects
+        self.record = record
+        self.on_delta = on_delta
+        self.logger = logger or logging.getLogger(__name__)
+        self.ws = None
+        self.stopping = False
+        self.connects = 0
+        self.frames = 0
+        self.thread = None
+
+    def connect(self):
+        ws = websocket.create_connection(
+            self.url,
+            header=[f"{name}: {value}" for name, value in self.headers.items()],
+            cookie=self.cookie,
+            timeout=self.idle_timeout
+        )
+        for message in self.subscriptions:
+            ws.send(message)
+        self.connects += 1
+        self.logger.info(f"🔌 Connected to {self.url} ({len(self.subscriptions)} subscriptions sent)")
+        return ws
+
+    def handle(self, message, recorder=None, started=0.0):
+        self.frames += 1
+        if recorder:
+            recorder.write(json.dumps({'t': round(time.monotonic() - started, 3), 'frame': message}) + "\n")
+        if message == ENGINE_IO_PING:
+            self.ws.send(ENGINE_IO_PONG)
+            return
+        payload = decode_frame(message)
+        if payload is None:
+            return
+        matches = self.parse(payload)
+        if matches:
+            for record in self.board.apply(matches):
+                if self.on_delta:
+                    self.on_delta(record)
+
+    def run(self, duration=None):
+        """Consume until stop(), `duration` seconds, or too many failed reconnects"""
+        started = time.monotonic()
+        failures = 0
+        recorder = open(self.record, 'a', encoding='utf-8', buffering=1) if self.record else None
+
+        def expired():
+            return duration is not None and time.monotonic() - started >= duration
+
+        try:
+            while not self.stopping and not expired():
+                try:
+                    self.ws = self.connect()
+                    failures = 0
+                    while not self.stopping and not expired():
+                        self.handle(self.ws.recv(), recorder, started)
+                except websocket.WebSocketTimeoutException:
+                    self.logger.warning(f"⚠️ No frames for {self.idle_timeout}s, reconnecting")
+                except (websocket.WebSocketException, OSError) as e:
+                    if self.stopping:
+                        break
+                    failures += 1
+                    if failures > self.max_reconnects:
+                        self.logger.error(f"❌ Feed unreachable after {self.max_reconnects} reconnects: {e}")
+                        raise
+                    delay = backoff_delay(failures)
+                    self.logger.warning(f"⚠️ Feed dropped ({e}), reconnecting in {delay:.1f}s")
+                    time.sleep(delay)
+                finally:
+                    if self.ws:
+                        self.ws.close()
+                        self.ws = None
+        finally:
+            if recorder:
+                recorder.close()
+
+        self.logger.info(f"✅ Feed stopped: {self.frames} frames over {self.connects} connections, "
+                         f"{len(self.board)} matches on the board")
+
+    def start(self, duration=None):
+        """Run in a background thread; read `board` while it runs"""
+        self.thread = threading.Thread(target=self.run, args=(duration,), name="live-feed", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        self.stopping = True
+        ws = self.ws
+        if ws:
+            ws.close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+
+def cookie_header(jar: CookieJar, url):
+    """Cookie header value with the jar's cookies for the feed's host"""
+    host = urlsplit(url).hostname or ''
+    return '; '.join(f"{c.name}={c.value}" for c in jar
+                     if host.endswith((c.domain or '').lstrip('.')))
+
+
+def consumer_from_bootstrap(scraper, url=None, **kwargs):
+    """FeedConsumer for a socket captured by HybridScraper.bootstrap(), with its session"""
+    if not scraper.websockets:
+        scraper.bootstrap()
+    if not scraper.websockets and not url:
+        raise RuntimeError("The page opened no WebSocket feed")
+    feed = scraper.websockets.get(url) or next(iter(scraper.websockets.values()), {})
+    url = url or feed['url']
+    origin = urlsplit(scraper.pages[0])
+    return FeedConsumer(
+        url,
+        parse=scraper.parse_json_matches,
+        subscriptions=feed.get('sent', []),
+        headers={'User-Agent': scraper.session.headers['User-Agent'],
+                 'Origin': f"{origin.scheme}://{origin.netloc}"},
+        cookie=cookie_header(scraper.session.cookies, url),
+        logger=scraper.logger,
+        **kwargs
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Consume the live odds WebSocket feed')
+    parser.add_argument('--url', help='Feed URL (default: the socket the page opens)')
+    parser.add_argument('--subscribe', action='append', default=[], help='Frame to send after connecting (repeatable)')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds')
+    parser.add_argument('--record', help='Append raw frames to this JSONL file')
+    parser.add_argument('--deltas', help='Append odds change records to this JSONL file')
+    args = parser.parse_args()
+
+    from hybrid_scraper import HybridScraper
+    scraper = HybridScraper()
+    if args.url and args.url.startswith(('ws://localhost', 'ws://127.0.0.1')):
+        # Local replay server: no browser bootstrap needed
+        consumer = FeedConsumer(args.url, parse=scraper.parse_json_matches, subscriptions=args.subscribe,
+                                record=args.record, logger=scraper.logger)
+    else:
+        consumer = consumer_from_bootstrap(scraper, url=args.url, record=args.record)
+        consumer.subscriptions += args.subscribe
+
+    delta_file = open(args.deltas, 'a', encoding='utf-8', buffering=1) if args.deltas else None
+    if delta_file:
+        consumer.on_delta = lambda record: delta_file.write(json.dumps(record, default=str) + "\n")
+
+    try:
+        consumer.run(duration=args.duration)
+    except KeyboardInterrupt:
+        consumer.stop()
+    scraper.fetch_engine.close()
+    if delta_file:
+        delta_file.close()
+
+    board = consumer.board.snapshot()
+    scraper.matches_data = list(board.values())
+    scraper.save_data()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+JSON Match Walker
+Finds the match-like objects in a decoded API payload with an explicit
+stack instead of recursion, so arbitrarily deep payloads cannot raise
+RecursionError. Key membership uses precomputed frozensets, scalars are never
+pushed, and a match object's own detail subtrees (odds markets, scores,
+statistics) are not descended into.
+
+MatchLayout learns, from one full walk, where an endpoint's match objects sit
+and which keys hold their teams, time, odds, competition and id, so later
+payloads of the same shape are read directly instead of walked.
+"""
+
+from itertools import chain
+from operator import itemgetter
+
+# A dict with any of these keys is offered to the extractor
+TEAM_KEYS = frozenset({'home', 'away', 'team1', 'team2', 'homeTeam', 'awayTeam',
+                       'home_team', 'away_team', 'home_name', 'away_name'})
+
+# Under a match object, values at these keys are parts of that match, never
+# lists of matches; their {"home": 1, "away": 0} shapes would otherwise come
+# back as bogus matches. The same keys elsewhere in a payload are walked.
+DETAIL_KEYS = frozenset({'odds', 'markets', 'market', 'outcomes', 'selections', 'score', 'scores',
+                         'setScore', 'gameScore', 'periodScores', 'statistics', 'stats', 'lineups',
+                         'homeTeamScore', 'awayTeamScore'})
+
+CONTAINERS = (dict, list)
+JSON_CONTAINERS = frozenset(CONTAINERS)
+
+# Match fields and the payload keys they come from, in order of preference
+TEAM_PAIRS = (('home', 'away'), ('home_team', 'away_team'), ('homeTeam', 'awayTeam'),
+              ('team1', 'team2'), ('home_name', 'away_name'))
+TIME_KEYS = ('time', 'start_time', 'kick_off', 'match_time', 'date', 'startTime')
+COMPETITION_KEYS = ('competition', 'league', 'tournament', 'category')
+ID_KEYS = ('id', 'match_id', 'event_id', 'fixture_id')
+STATUS_KEYS = ('matchStatus', 'status', 'eventStatus')
+
+# Every key the field plan can depend on; objects with the same subset of
+# these keys are extracted the same way
+FIELD_KEYS = frozenset([key for pair in TEAM_PAIRS for key in pair] + list(TIME_KEYS)
+                       + list(COMPETITION_KEYS) + list(ID_KEYS) + list(STATUS_KEYS) + ['odds'])
+WILDCARD = '*'
+
+
+def iter_match_objects(data, team_keys=TEAM_KEYS, detail_keys=DETAIL_KEYS):
+    """Dicts with a team-like key, depth-first in document order"""
+    stack = [data] if isinstance(data, CONTAINERS) else []
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        if isinstance(node, dict):
+            if team_keys.isdisjoint(node):
+                children = [v for v in node.values() if isinstance(v, CONTAINERS)]
+            else:
+                yield node
+                children = [v for k, v in node.items() if isinstance(v, CONTAINERS) and k not in detail_keys]
+        else:
+            children = [v for v in node if isinstance(v, CONTAINERS)]
+        if children:
+            children.reverse()
+            extend(children)
+
+
+def count_nodes(data):
+    """Every value in the payload, containers and scalars (for throughput figures)"""
+    count = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def field_plan(keys):
+    """[(match field, payload key, stringify)] for an object with these keys,
+    the same choices extract_match_from_object makes; None without a team pair"""
+    pair = next(((home, away) for home, away in TEAM_PAIRS if home in keys and away in keys), None)
+    if pair is None:
+        return None
+    plan = [('home_team', pair[0], True), ('away_team', pair[1], True)]
+    for field, candidates in (('match_time', TIME_KEYS), ('odds', ('odds',)),
+                              ('competition', COMPETITION_KEYS), ('match_id', ID_KEYS),
+                              ('status', STATUS_KEYS)):
+        key = next((k for k in candidates if k in keys), None)
+        if key is not None:
+            plan.append((field, key, field != 'odds'))
+    return plan
+
+
+class SchemaChanged(Exception):
+    """A payload no longer has the shape its MatchLayout was learned from"""
+
+
+class MatchLayout:
+    """Where one endpoint's match objects sit, learned from a full walk.
+
+    The routes from the payload root to every match object are kept as a trie
+    whose list positions are WILDCARD, e.g. data -> tournaments -> * -> events
+    -> *. `locate` follows only those routes, in the order they were learned,
+    and validates as it goes: the root keys must be unchanged, every step must
+    reach the same kind of container, a position that only ever held matches
+    must still hold one and no match may turn up anywhere else on the route.
+    Containers off the routes are checked too: a key never seen holding one
+    fails, and one seen without matches (an empty "live" list, say) is walked
+    and fails if it holds a match now. Anything else raises SchemaChanged so
+    the caller can walk and re-learn.
+
+    What a dict at a route position checks is worked out once per tuple of
+    its keys and cached on the trie node. A list at a position that only
+    ever held matches is usually checked whole (one key tuple, no container
+    off the route) rather than event by event, which is where locating gets
+    ahead of the plain walk.
+
+    Field plans (which keys give the teams, time, odds, competition and id)
+    are cached per set of FIELD_KEYS an object carries, so extraction is a
+    handful of direct lookups per match.
+    """
+
+    def __init__(self, routes, root_keys):
+        self.routes = routes  # [container type, match flag, {key: child}, container keys seen, shape checks]
+        self.root_keys = root_keys
+        self.plans = {}
+
+    @classmethod
+    def learn(cls, data, team_keys=TEAM_KEYS, detail_keys=DETAIL_KEYS):
+        """(layout or None, match objects in document order) from one full walk;
+        None when the payload holds no complete match to learn from"""
+        found = []
+        seen = {}  # path -> [container type, matches, other dicts, keys walked into]
+        stack = [(data, ())] if isinstance(data, CONTAINERS) else []
+        while stack:
+            node, path = stack.pop()
+            counts = seen.setdefault(path, [type(node), 0, 0, set()])
+            if counts[0] is not type(node):
+                return None, list(iter_match_objects(data, team_keys, detail_keys))
+            if isinstance(node, dict):
+                if team_keys.isdisjoint(node):
+                    counts[2] += 1
+                    children = [(v, path + (k,)) for k, v in node.items() if isinstance(v, CONTAINERS)]
+                else:
+                    counts[1] += 1
+                    found.append(node)
+                    children = [(v, path + (k,)) for k, v in node.items()
+                                if isinstance(v, CONTAINERS) and k not in detail_keys]
+                counts[3].update(child_path[-1] for _, child_path in children)
+            else:
+                children = [(v, path + (WILDCARD,)) for v in node if isinstance(v, CONTAINERS)]
+            if children:
+                children.reverse()
+                stack.extend(children)
+
+        if not any(field_plan(obj) for obj in found):
+            return None, found
+
+        # Keep only the routes that lead to a match, in first-seen order; a
+        # position's flag is True when it only ever held matches, False when
+        # matches were mixed with other dicts and None when it held none
+        root = [type(data), None, {}, seen[()][3], {}]
+        for path, (kind, matches, others, keys) in seen.items():
+            if not matches:
+                continue
+            trie = root
+            for depth, key in enumerate(path):
+                step = seen[path[:depth + 1]]
+                trie = trie[2].setdefault(key, [step[0], None, {}, step[3], {}])
+            trie[1] = not others
+        root_keys = frozenset(data) if isinstance(data, dict) else None
+        return cls(root, root_keys), found
+
+    def locate(self, data, team_keys=TEAM_KEYS, detail_keys=DETAIL_KEYS):
+        """Match objects along the learned routes, in document order"""
+        if type(data) is not self.routes[0]:
+            raise SchemaChanged(f"payload is a {type(data).__name__}")
+        if self.root_keys is not None and frozenset(data) != self.root_keys:
+            raise SchemaChanged(f"top-level keys changed to {sorted(data)}")
+
+        found = []
+        stack = [(data, self.routes)]
+        while stack:
+            node, (kind, holds_matches, children, walked, shapes) = stack.pop()
+            is_match, off_route = False, ()
+            if kind is dict:
+                shape = tuple(node)
+                check = shapes.get(shape)
+                if check is None:
+                    check = shapes[shape] = self.shape_check(shape, children, team_keys, detail_keys)
+                is_match, off_route = check
+            if is_match:
+                if holds_matches is None:
+                    raise SchemaChanged(f"match in a new place: {sorted(node)[:8]}")
+                found.append(node)
+            elif holds_matches:
+                raise SchemaChanged(f"expected a match, got keys {sorted(node)[:8]}")
+
+            # Decoded JSON holds plain dicts and lists, so the common case of
+            # no container off the route is one set test over the value types
+            if off_route and not JSON_CONTAINERS.isdisjoint(map(type, map(node.__getitem__, off_route))):
+                for key in off_route:
+                    value = node[key]
+                    if not isinstance(value, CONTAINERS):
+                        continue
+                    if key not in walked:
+                        raise SchemaChanged(f"new container under {key!r}")
+                    if next(iter_match_objects(value, team_keys, detail_keys), None) is not None:
+                        raise SchemaChanged(f"matches under {key!r}, which had none")
+
+            if kind is dict:
+                steps = [(node[key], branch) for key, branch in children.items()]
+            elif WILDCARD in children:
+                branch = children[WILDCARD]
+                if self.all_matches(node, branch, team_keys, detail_keys):
+                    found.extend(node)
+                    continue
+                steps = [(item, branch) for item in node if isinstance(item, CONTAINERS)]
+            else:
+                continue
+            for child, branch in steps:
+                if type(child) is not branch[0]:
+                    raise SchemaChanged(f"expected a {branch[0].__name__}, got a {type(child).__name__}")
+            if steps:
+                steps.reverse()
+                stack.extend(steps)
+        return found
+
+    def all_matches(self, items, branch, team_keys, detail_keys):
+        """Whether a list at a position that only ever held matches passes its
+        checks as a whole: all dicts, all of one key tuple, all matches and no
+        container off the route. A list of events checked this way costs a few
+        C-level passes instead of a loop per event; anything else (mixed
+        shapes, a nested container) goes item by item."""
+        kind, holds_matches, children, _, shapes = branch
+        if not (items and holds_matches and kind is dict and not children) or set(map(type, items)) != {dict}:
+            return False
+        keys = set(map(tuple, items))
+        if len(keys) != 1:
+            return False
+        shape = keys.pop()
+        check = shapes.get(shape)
+        if check is None:
+            check = shapes[shape] = self.shape_check(shape, children, team_keys, detail_keys)
+        is_match, off_route = check
+        if not is_match:
+            return False
+        if off_route:
+            values = map(itemgetter(*off_route), items)
+            if len(off_route) > 1:
+                values = chain.from_iterable(values)
+            return JSON_CONTAINERS.isdisjoint(map(type, values))
+        return True
+
+    @staticmethod
+    def shape_check(shape, children, team_keys, detail_keys):
+        """(is a match, keys to check for containers off the route) for a dict
+        with these keys at a route position; cached per position and key tuple"""
+        missing = [key for key in children if key not in shape]
+        if missing:
+            raise SchemaChanged(f"missing key {missing[0]!r}")
+        is_match = not team_keys.isdisjoint(shape)
+        off_route = tuple(key for key in shape if key not in children and not (is_match and key in detail_keys))
+        return is_match, off_route
+
+    def plan_for(self, obj):
+        """The cached field plan for an object's set of FIELD_KEYS"""
+        signature = FIELD_KEYS.intersection(obj)
+        plan = self.plans.get(signature)
+        if plan is None and signature not in self.plans:
+            plan = self.plans[signature] = field_plan(signature)
+        return plan
+
+    def extract(self, obj):
+        """{match field: value} for a located object, None without a team pair"""
+        plan = self.plan_for(obj)
+        if plan is None:
+            return None
+        return {field: str(obj[key]) if stringify else obj[key] for field, key, stringify in plan}
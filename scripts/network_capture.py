@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+CDP Network Capture
+Follows the Chrome DevTools Network event stream while a page loads and keeps
+the bodies of matching XHR/fetch responses via Network.getResponseBody
+"""
+
+import base64
+import json
+import logging
+import time
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from page_readiness import STATE_JS, NetworkIdle, DomQuiet
+
+try:
+    from settings import READY_TIMEOUT
+except ImportError:
+    READY_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+API_KEYWORDS = ('api', 'ajax', 'json', 'data', 'match', 'event', 'odds')
+CAPTURED_TYPES = frozenset({'XHR', 'Fetch'})
+
+
+class CapturedResponse:
+    """One network response seen during a capture"""
+
+    def __init__(self, request_id, url, method='GET', resource_type=None, request_headers=None):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.request_headers = request_headers or {}
+        self.status = None
+        self.mime_type = None
+        self.response_headers = {}
+        self.body = None
+        self.data = None
+
+    def to_dict(self, include_body=False):
+        info = {
+            'url': self.url,
+            'method': self.method,
+            'status': self.status,
+            'type': self.resource_type,
+            'mime_type': self.mime_type,
+            'request_headers': self.request_headers,
+            'has_body': self.body is not None
+        }
+        if include_body:
+            info['data'] = self.data
+        return info
+
+
+class NetworkCapture:
+    """Collects Network.* events from Chrome's performance log as they arrive.
+
+    The driver needs the `goog:loggingPrefs: {'performance': 'ALL'}` capability
+    (build_chrome_options sets it). Bodies are pulled on Network.loadingFinished,
+    while Chrome still holds them, for responses whose type is XHR/Fetch and
+    whose URL contains one of `keywords`.
+    """
+
+    def __init__(self, driver, keywords=API_KEYWORDS, resource_types=CAPTURED_TYPES):
+        self.driver = driver
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.resource_types = resource_types
+        self.pending = {}
+        self.responses = []
+        self.websockets = {}
+
+    def wanted(self, url, resource_type):
+        return resource_type in self.resource_types and any(k in url.lower() for k in self.keywords)
+
+    def drain(self):
+        """Process every event logged since the last drain"""
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            handler = getattr(self, '_on_' + message.get('method', '').replace('.', '_'), None)
+            if handler:
+                handler(message.get('params', {}))
+
+    # ------------------------------------------------------------------
+    # Event handlers
+    # ------------------------------------------------------------------
+    def _on_Network_requestWillBeSent(self, params):
+        request = params.get('request', {})
+        url = request.get('url', '')
+        resource_type = params.get('type')
+        if self.wanted(url, resource_type):
+            self.pending[params['requestId']] = CapturedResponse(
+                params['requestId'], url, request.get('method', 'GET'), resource_type, request.get('headers'))
+
+    def _on_Network_responseReceived(self, params):
+        captured = self.pending.get(params.get('requestId'))
+        if captured:
+            response = params.get('response', {})
+            captured.status = response.get('status')
+            captured.mime_type = response.get('mimeType')
+            captured.response_headers = response.get('headers', {})
+
+    def _on_Network_loadingFinished(self, params):
+        captured = self.pending.pop(params.get('requestId'), None)
+        if not captured:
+            return
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': captured.request_id})
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            captured.body = body
+            if 'json' in (captured.mime_type or '') or body[:1] in ('{', '['):
+                try:
+                    captured.data = json.loads(body)
+                except ValueError:
+                    pass
+        except Exception as e:
+            logger.debug(f"No body for {captured.url}: {e}")
+        self.responses.append(captured)
+        logger.info(f"📡 Captured {captured.status} {captured.url}" + (" (JSON body)" if captured.data is not None else ""))
+
+    def _on_Network_loadingFailed(self, params):
+        self.pending.pop(params.get('requestId'), None)
+
+    def _on_Network_webSocketCreated(self, params):
+        self.websockets[params['requestId']] = {'url': params.get('url'), 'sent': [], 'received': []}
+        logger.info(f"🔌 WebSocket opened: {params.get('url')}")
+
+    def _on_Network_webSocketFrameSent(self, params):
+        socket = self.websockets.get(params.get('requestId'))
+        if socket is not None:
+            socket['sent'].append(params.get('response', {}).get('payloadData'))
+
+    def _on_Network_webSocketFrameReceived(self, params):
+        socket = self.websockets.get(params.get('requestId'))
+        if socket is not None:
+            socket['received'].append(params.get('response', {}).get('payloadData'))
+
+    # ------------------------------------------------------------------
+    # Driving a page load
+    # ------------------------------------------------------------------
+    def capture(self, url, condition=None, timeout=READY_TIMEOUT, scheduler=None, poll=0.2):
+        """Navigate to `url` and collect responses until the page settles"""
+        condition = condition or (NetworkIdle() & DomQuiet())
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        # Discard, unprocessed, whatever the previous page logged, and forget
+        # its requests that never finished, so they cannot hold this one open
+        self.driver.get_log('performance')
+        self.pending = {}
+        self.responses = []
+
+        if scheduler:
+            scheduler.navigate(self.driver, url)
+        else:
+            self.driver.get(url)
+
+        selectors = list(dict.fromkeys(condition.selectors()))
+        started = time.monotonic()
+        while True:
+            self.drain()
+            try:
+                state = self.driver.execute_script(STATE_JS, selectors)
+            except Exception:
+                state = None
+            waited = time.monotonic() - started
+            if (state and condition.met(state) and not self.pending) or waited >= timeout:
+                break
+            time.sleep(poll)
+
+        self.drain()
+        with_bodies = sum(1 for r in self.responses if r.data is not None)
+        logger.info(f"⏱️ Capture of {url} finished after {waited:.2f}s: "
+                    f"{len(self.responses)} responses, {with_bodies} JSON bodies")
+        return self.responses
+
+    def json_responses(self):
+        return [r for r in self.responses if r.data is not None]
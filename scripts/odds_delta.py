@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Odds Delta Engine
+Keeps the last-seen price of every match/market/selection and turns each new
+batch of scraped matches into compact change records instead of full snapshots
+"""
+
+import json
+import time
+from pathlib import Path
+
+# Keys that hold a market's selections, a selection's name and its price, in the
+# shapes the scraped APIs use ({"1": 1.5}, [{"desc": ..., "outcomes": [...]}], ...)
+OUTCOME_KEYS = ('outcomes', 'selections', 'odds')
+NAME_KEYS = ('desc', 'name', 'id', 'marketId', 'outcomeId')
+PRICE_KEYS = ('odds', 'price', 'value')
+SUSPENDED = 'suspended'
+
+# Fields kept on an "added" record; volatile bookkeeping like scraped_at is dropped
+VOLATILE_FIELDS = frozenset({'scraped_at', 'polled_at'})
+
+
+def _name(obj, fallback):
+    for key in NAME_KEYS:
+        if obj.get(key) not in (None, ''):
+            return str(obj[key])
+    return str(fallback)
+
+
+def _is_suspended(obj):
+    for key in ('isActive', 'active'):
+        if key in obj and not obj[key]:
+            return True
+    status = obj.get('status')
+    return isinstance(status, str) and status.lower() in ('suspended', 'closed', 'locked')
+
+
+def _price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_odds(odds, market='main'):
+    """{(market, selection): price or SUSPENDED} for any of the odds shapes we scrape"""
+    flat = {}
+    if isinstance(odds, dict):
+        for key, value in odds.items():
+            if isinstance(value, (dict, list)):
+                flat.update(flatten_odds(value, market=str(key) if market == 'main' else f"{market}/{key}"))
+            elif _price(value) is not None:
+                flat[(market, str(key))] = _price(value)
+    elif isinstance(odds, list):
+        for index, item in enumerate(odds):
+            if not isinstance(item, dict):
+                if _price(item) is not None:
+                    flat[(market, str(index))] = _price(item)
+                continue
+            outcomes = next((item[k] for k in OUTCOME_KEYS if isinstance(item.get(k), list)), None)
+            if outcomes is not None:
+                # A market with its selections
+                name = _name(item, index)
+                suspended = _is_suspended(item)
+                for position, outcome in enumerate(outcomes):
+                    if not isinstance(outcome, dict):
+                        continue
+                    key = (name, _name(outcome, position))
+                    price = next((_price(outcome[k]) for k in PRICE_KEYS if k in outcome), None)
+                    flat[key] = SUSPENDED if suspended or _is_suspended(outcome) else price
+            else:
+                # A bare selection
+                price = next((_price(item[k]) for k in PRICE_KEYS if k in item), None)
+                flat[(market, _name(item, index))] = SUSPENDED if _is_suspended(item) else price
+    return flat
+
+
+def match_key(match):
+    return match.get('match_id') or f"{match.get('home_team')}|{match.get('away_team')}"
+
+
+class DeltaEngine:
+    """Diff successive batches of matches into change records.
+
+    Record types: 'added' (a match or selection appeared), 'removed' (it went
+    away), 'price_moved', 'suspended' and 'resumed'. Match-level records carry
+    `match_id`; selection-level ones add `market`, `selection` and the
+    old/new price. Removals are only reported within a `scope` (one source
+    that always returns its complete list), since a partial batch says nothing
+    about matches it does not mention, and only once no scope holds the match.
+
+    With `state_path`, the last-seen state survives restarts, so one-shot
+    scripts emit deltas against their previous run.
+    """
+
+    def __init__(self, state_path=None):
+        self.state_path = Path(state_path) if state_path else None
+        self.prices = {}  # match key -> {(market, selection): price}
+        self.scopes = {}  # scope -> set of match keys it returned last time
+        if self.state_path and self.state_path.exists():
+            self.load()
+
+    def diff(self, matches, scope=None):
+        now = time.time()
+        records = []
+        seen = set()
+        for match in matches:
+            key = match_key(match)
+            seen.add(key)
+            current = flatten_odds(match.get('odds'))
+            previous = self.prices.get(key)
+            self.prices[key] = current
+
+            if previous is None:
+                info = {k: v for k, v in match.items() if k not in VOLATILE_FIELDS and k != 'odds'}
+                records.append({'type': 'added', 'match_id': key, 'at': now, 'match': info,
+                                'odds': [[m, s, p] for (m, s), p in current.items()]})
+                continue
+
+            for selection, price in current.items():
+                old = previous.get(selection)
+                if selection not in previous:
+                    kind = 'added'
+                elif old == price:
+                    continue
+                elif price == SUSPENDED:
+                    kind = 'suspended'
+                elif old == SUSPENDED:
+                    kind = 'resumed'
+                else:
+                    kind = 'price_moved'
+                records.append({'type': kind, 'match_id': key, 'at': now, 'market': selection[0],
+                                'selection': selection[1], 'old': old, 'new': price})
+            for selection in previous.keys() - current.keys():
+                records.append({'type': 'removed', 'match_id': key, 'at': now, 'market': selection[0],
+                                'selection': selection[1], 'old': previous[selection]})
+
+        if scope is not None:
+            for key in self.scopes.get(scope, set()) - seen:
+                # Gone from this source only: another one still carries it
+                if any(key in keys for name, keys in self.scopes.items() if name != scope):
+                    continue
+                self.prices.pop(key, None)
+                records.append({'type': 'removed', 'match_id': key, 'at': now})
+            self.scopes[scope] = seen
+        return records
+
+    def retain_scopes(self, names):
+        """Forget every scope not in `names` (sources no longer polled), so a
+        stale scope stops holding on to its matches"""
+        for name in self.scopes.keys() - set(names):
+            del self.scopes[name]
+
+    def load(self):
+        with open(self.state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        self.prices = {key: {(m, s): p for m, s, p in rows} for key, rows in state.get('prices', {}).items()}
+        self.scopes = {scope: set(keys) for scope, keys in state.get('scopes', {}).items()}
+
+    def save(self):
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'prices': {key: [[m, s, p] for (m, s), p in rows.items()] for key, rows in self.prices.items()},
+            'scopes': {scope: sorted(keys) for scope, keys in self.scopes.items()}
+        }
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        tmp.replace(self.state_path)
+
+
+def summarize(records):
+    """{'added': n, 'price_moved': n, ...} for a log line"""
+    counts = {}
+    for record in records:
+        counts[record['type']] = counts.get(record['type'], 0) + 1
+    return counts
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Adaptive Live-Odds Poller
+Long-running daemon that re-polls each odds source on its own schedule: often
+for live matches, matches near kickoff and matches whose odds keep moving,
+rarely for stable pre-match fixtures. Odds changes are streamed as JSON lines.
+"""
+
+import heapq
+import json
+import signal
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from hybrid_scraper import HybridScraper, SessionRejected
+from odds_delta import DeltaEngine, match_key, summarize
+
+try:
+    from settings import LIVE_POLL_INTERVAL, NEAR_KICKOFF_POLL_INTERVAL, PREMATCH_POLL_INTERVAL
+    from settings import MIN_POLL_INTERVAL, KICKOFF_WINDOW_MINUTES, MATCH_ODDS_URL, ODDS_STREAM_PATH
+    from settings import POLL_MAX_FAILURES
+except ImportError:
+    LIVE_POLL_INTERVAL = 5
+    NEAR_KICKOFF_POLL_INTERVAL = 15
+    PREMATCH_POLL_INTERVAL = 300
+    MIN_POLL_INTERVAL = 2
+    KICKOFF_WINDOW_MINUTES = 30
+    MATCH_ODDS_URL = None
+    ODDS_STREAM_PATH = "data/stream/odds.jsonl"
+    POLL_MAX_FAILURES = 5
+
+# Match statuses (the payload's status/matchStatus, see match_walker.STATUS_KEYS)
+# that mean the match is in play: SportyBet's numeric 1 or a phase name
+LIVE_STATUSES = frozenset({'1', 'live', 'inplay', 'in_play', 'in play', 'in progress', 'running', 'started',
+                           'h1', 'h2', '1h', '2h', 'ht', 'halftime', 'et', 'pen'})
+
+
+def is_live(match):
+    status = match.get('status')
+    return status is not None and str(status).strip().lower() in LIVE_STATUSES
+
+
+def parse_kickoff(value):
+    """Kickoff as a UTC datetime from epoch seconds/milliseconds or an ISO string"""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+        if number > 1e11:  # milliseconds
+            number /= 1000
+        return datetime.fromtimestamp(number, tz=timezone.utc)
+    except (TypeError, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class PollPolicy:
+    """How often to poll a match.
+
+    The base interval comes from the match phase (live, near kickoff, pre-match).
+    Moving odds halve the current interval down to `minimum`; unchanged odds
+    stretch it by half again, back up to the base.
+    """
+
+    def __init__(self, live=LIVE_POLL_INTERVAL, near_kickoff=NEAR_KICKOFF_POLL_INTERVAL,
+                 prematch=PREMATCH_POLL_INTERVAL, minimum=MIN_POLL_INTERVAL,
+                 kickoff_window=KICKOFF_WINDOW_MINUTES * 60):
+        self.live = live
+        self.near_kickoff = near_kickoff
+        self.prematch = prematch
+        self.minimum = minimum
+        self.kickoff_window = kickoff_window
+
+    def base_interval(self, state, now=None):
+        if state.live:
+            return self.live
+        if state.kickoff is not None:
+            seconds_to_kickoff = state.kickoff.timestamp() - (now or time.time())
+            if seconds_to_kickoff <= 0:
+                return self.live
+            if seconds_to_kickoff <= self.kickoff_window:
+                return self.near_kickoff
+        return self.prematch
+
+    def next_interval(self, state, changed):
+        base = self.base_interval(state)
+        if state.interval is None:
+            return base
+        if changed:
+            return max(self.minimum, min(base, state.interval / 2))
+        return min(base, state.interval * 1.5)
+
+
+class MatchState:
+    """Phase and polling cadence for one match"""
+
+    def __init__(self, key):
+        self.key = key
+        self.live = False
+        self.kickoff = None
+        self.interval = None
+        self.polls = 0
+        self.changes = 0
+
+    def update(self, match, changed):
+        """Take in a fresh copy of the match and whether its odds moved"""
+        self.live = is_live(match)
+        self.kickoff = parse_kickoff(match.get('match_time')) or self.kickoff
+        self.polls += 1
+        self.changes += changed
+
+
+class AdaptivePoller:
+    """Schedules odds sources on a heap keyed by their next due time.
+
+    A source is an API URL captured by the hybrid scraper's browser bootstrap
+    (a list of matches) or, when MATCH_ODDS_URL is set, a per-match odds URL.
+    A source is due as often as the most urgent match it carries. A source
+    that keeps failing backs off, doubling its interval, and is dropped after
+    `max_failures` failures in a row (a per-match URL that 404s once the
+    match is over) until the next bootstrap.
+    """
+
+    def __init__(self, scraper=None, policy=None, output=ODDS_STREAM_PATH, match_url=MATCH_ODDS_URL,
+                 max_failures=POLL_MAX_FAILURES):
+        self.scraper = scraper or HybridScraper()
+        self.logger = self.scraper.logger
+        self.policy = policy or PollPolicy()
+        self.output_path = Path(output)
+        self.match_url = match_url
+        self.matches = {}
+        self.deltas = DeltaEngine()
+        self.delta_counts = {}
+        self.source_intervals = {}
+        self.max_failures = max_failures
+        self.failures = {}
+        self.dropped = set()
+        self.heap = []
+        self.stopping = False
+        self.output = None
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def schedule(self, source, interval):
+        self.source_intervals[source] = interval
+        heapq.heappush(self.heap, (time.monotonic() + interval, source))
+
+    def seed(self, matches):
+        """(Re)build the schedule after a bootstrap.
+
+        Captured list endpoints are polled at the near-kickoff rate to start
+        with; after their first poll they follow the matches they carry. With
+        MATCH_ODDS_URL each match also gets its own source, and the list
+        endpoints drop to the pre-match rate, only picking up new fixtures.
+        """
+        self.heap = []
+        self.source_intervals = {}
+        self.failures = {}
+        self.dropped = set()
+        self.deltas.retain_scopes(self.scraper.endpoints)
+        self.ingest(None, matches)
+        for source in self.scraper.endpoints:
+            self.schedule(source, self.policy.prematch if self.match_url else self.policy.near_kickoff)
+        if self.match_url:
+            for key, state in self.matches.items():
+                self.schedule(self.match_url.format(match_id=key), self.policy.base_interval(state))
+
+    def due_sources(self):
+        """Pop every source whose time has come (dropping stale heap entries)"""
+        now = time.monotonic()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, source = heapq.heappop(self.heap)
+            if source in self.source_intervals and source not in due:
+                due.append(source)
+        return due
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+    def ingest(self, source, matches):
+        """Update match states from one source and stream its deltas; returns its next interval"""
+        scope = source if source in self.scraper.endpoints else None
+        records = self.deltas.diff(matches, scope=scope)
+        moved = {r['match_id'] for r in records if 'market' in r}
+        for kind, count in summarize(records).items():
+            self.delta_counts[kind] = self.delta_counts.get(kind, 0) + count
+        for record in records:
+            self.emit(record)
+            if record['type'] == 'removed' and 'market' not in record:
+                self.matches.pop(record['match_id'], None)
+                if self.match_url:
+                    self.source_intervals.pop(self.match_url.format(match_id=record['match_id']), None)
+
+        intervals = []
+        for match in matches:
+            key = match_key(match)
+            state = self.matches.get(key)
+            if state is None:
+                state = self.matches[key] = MatchState(key)
+            changed = key in moved
+            state.update(match, changed)
+            state.interval = self.policy.next_interval(state, changed)
+            intervals.append(state.interval)
+        return min(intervals) if intervals else self.policy.prematch
+
+    def poll(self, sources):
+        if self.scraper.session_expired():
+            self.seed(self.scraper.bootstrap())
+            return
+        results = self.scraper.fetch_engine.fetch_all(sources)
+        rejected = [r for r in results if isinstance(r.error, SessionRejected)]
+        if rejected:
+            self.seed(self.scraper.recover(rejected[0].error))
+            return
+        self.scraper.rejections = 0
+
+        for result in results:
+            if result.ok:
+                self.failures.pop(result.url, None)
+                interval = self.ingest(result.url, self.scraper.parse_json_matches(result.text, source=result.url))
+                if self.match_url and result.url in self.scraper.endpoints:
+                    interval = self.policy.prematch
+                    self.schedule_new_matches()
+            else:
+                failures = self.failures[result.url] = self.failures.get(result.url, 0) + 1
+                if failures >= self.max_failures:
+                    self.logger.warning(f"🗑️ Dropping {result.url} after {failures} failed polls: {result.error}")
+                    self.failures.pop(result.url)
+                    self.source_intervals.pop(result.url, None)
+                    self.dropped.add(result.url)
+                    continue
+                interval = min(self.policy.prematch,
+                               2 * self.source_intervals.get(result.url, self.policy.near_kickoff))
+                self.logger.warning(f"⚠️ {result.url} failed ({failures}/{self.max_failures}), "
+                                    f"next try in {interval:.0f}s: {result.error}")
+            self.schedule(result.url, interval)
+
+    def schedule_new_matches(self):
+        """Give matches first seen on a list endpoint their own per-match source"""
+        for key, state in self.matches.items():
+            source = self.match_url.format(match_id=key)
+            if source not in self.source_intervals and source not in self.dropped:
+                self.schedule(source, self.policy.base_interval(state))
+
+    def emit(self, record):
+        self.output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    # ------------------------------------------------------------------
+    # Daemon loop
+    # ------------------------------------------------------------------
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self, duration=None):
+        """Poll until stopped (SIGINT/SIGTERM) or `duration` seconds have passed"""
+        signal.signal(signal.SIGTERM, self.stop)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        self.logger.info(f"🚀 Adaptive odds poller streaming to {self.output_path}")
+
+        # A daemon re-bootstraps as often as the session demands: no page budget
+        with open(self.output_path, 'a', encoding='utf-8', buffering=1) as self.output, \
+                self.scraper.scheduler.page_budget(0):
+            try:
+                self.seed(self.scraper.bootstrap())
+                while not self.stopping and (duration is None or time.monotonic() - started < duration):
+                    due = self.due_sources()
+                    if due:
+                        self.poll(due)
+                        continue
+                    wait = self.heap[0][0] - time.monotonic() if self.heap else self.policy.prematch
+                    time.sleep(min(max(wait, 0.05), 1.0))
+            except KeyboardInterrupt:
+                self.logger.info("⏹️ Stopped by user")
+            except SessionRejected as e:
+                # recover() has used up max_rebootstraps
+                self.logger.error(f"❌ Stopping: {e}")
+            finally:
+                self.scraper.fetch_engine.close()
+
+        live = sum(1 for s in self.matches.values() if s.live)
+        polls = sum(s.polls for s in self.matches.values())
+        changes = sum(s.changes for s in self.matches.values())
+        self.logger.info(f"✅ Poller stopped: {len(self.matches)} matches ({live} live), "
+                         f"{polls} match polls, {changes} with moving odds, deltas {self.delta_counts}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Adaptive live-odds polling daemon')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds')
+    parser.add_argument('--output', default=ODDS_STREAM_PATH, help='JSONL stream path')
+    args = parser.parse_args()
+
+    AdaptivePoller(output=args.output).run(duration=args.duration)
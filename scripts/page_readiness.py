@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Page Readiness Engine
+Composable conditions (selector counts, network idle, DOM quiet period) that
+replace fixed sleeps after Selenium navigations
+"""
+
+import logging
+import time
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+try:
+    from settings import READY_TIMEOUT, NETWORK_IDLE_SECONDS, DOM_QUIET_SECONDS
+except ImportError:
+    READY_TIMEOUT = 30
+    NETWORK_IDLE_SECONDS = 0.5
+    DOM_QUIET_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+# Counts in-flight fetch/XHR calls and records the last network and DOM activity.
+# The driver pool installs it on every new document; STATE_JS installs it late if missing.
+INSTRUMENT_JS = """
+(function () {
+  if (window.__sbReadiness) { return; }
+  var state = window.__sbReadiness = {inflight: 0, lastNetwork: Date.now(), lastMutation: Date.now()};
+  function started() { state.inflight++; state.lastNetwork = Date.now(); }
+  function finished() { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = Date.now(); }
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+      started();
+      return originalFetch.apply(this, arguments).then(
+        function (response) { finished(); return response; },
+        function (error) { finished(); throw error; });
+    };
+  }
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    started();
+    this.addEventListener('loadend', finished);
+    return originalSend.apply(this, arguments);
+  };
+  new MutationObserver(function () { state.lastMutation = Date.now(); })
+    .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+# One round trip per poll: activity timestamps plus every selector count the conditions need
+STATE_JS = INSTRUMENT_JS + """
+var selectors = arguments[0];
+var state = window.__sbReadiness;
+var lastResource = 0;
+var entries = performance.getEntriesByType('resource');
+for (var i = 0; i < entries.length; i++) {
+  lastResource = Math.max(lastResource, entries[i].responseEnd);
+}
+var counts = {};
+for (var j = 0; j < selectors.length; j++) {
+  try { counts[selectors[j]] = document.querySelectorAll(selectors[j]).length; }
+  catch (e) { counts[selectors[j]] = 0; }
+}
+return {
+  now: Date.now(),
+  inflight: state.inflight,
+  lastNetwork: Math.max(state.lastNetwork, Math.round(performance.timeOrigin + lastResource)),
+  lastMutation: state.lastMutation,
+  readyState: document.readyState,
+  counts: counts
+};
+"""
+
+
+class Condition:
+    """Base readiness condition; combine with `&` and `|`"""
+
+    def selectors(self):
+        return []
+
+    def met(self, state):
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+
+class SelectorCount(Condition):
+    """At least `minimum` elements match a CSS selector"""
+
+    def __init__(self, selector, minimum=1):
+        self.selector = selector
+        self.minimum = minimum
+
+    def selectors(self):
+        return [self.selector]
+
+    def met(self, state):
+        return state['counts'].get(self.selector, 0) >= self.minimum
+
+    def __repr__(self):
+        return f"count({self.selector!r}) >= {self.minimum}"
+
+
+class NetworkIdle(Condition):
+    """Document loaded, no fetch/XHR in flight and no network activity for `idle` seconds"""
+
+    def __init__(self, idle=NETWORK_IDLE_SECONDS):
+        self.idle = idle
+
+    def met(self, state):
+        return (state['readyState'] == 'complete' and state['inflight'] == 0
+                and state['now'] - state['lastNetwork'] >= self.idle * 1000)
+
+    def __repr__(self):
+        return f"network idle {self.idle}s"
+
+
+class DomQuiet(Condition):
+    """No DOM mutation for `quiet` seconds"""
+
+    def __init__(self, quiet=DOM_QUIET_SECONDS):
+        self.quiet = quiet
+
+    def met(self, state):
+        return state['now'] - state['lastMutation'] >= self.quiet * 1000
+
+    def __repr__(self):
+        return f"DOM quiet {self.quiet}s"
+
+
+class AllOf(Condition):
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def selectors(self):
+        return [s for c in self.conditions for s in c.selectors()]
+
+    def met(self, state):
+        return all(c.met(state) for c in self.conditions)
+
+    def __repr__(self):
+        return "(" + " & ".join(map(repr, self.conditions)) + ")"
+
+
+class AnyOf(Condition):
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def selectors(self):
+        return [s for c in self.conditions for s in c.selectors()]
+
+    def met(self, state):
+        return any(c.met(state) for c in self.conditions)
+
+    def __repr__(self):
+        return "(" + " | ".join(map(repr, self.conditions)) + ")"
+
+
+def page_settled(*selectors):
+    """Default readiness for SPA pages: every selector present, network idle and DOM quiet"""
+    return AllOf(*(SelectorCount(s) for s in selectors), NetworkIdle(), DomQuiet())
+
+
+class ReadinessResult:
+    """How a wait ended and how long it really took"""
+
+    def __init__(self, ready, waited, condition, state=None):
+        self.ready = ready
+        self.waited = waited
+        self.condition = condition
+        self.state = state or {}
+
+    def __bool__(self):
+        return self.ready
+
+    def __repr__(self):
+        return f"ReadinessResult(ready={self.ready}, waited={self.waited:.2f}s, condition={self.condition!r})"
+
+
+def wait_until(driver, condition, timeout=READY_TIMEOUT, poll=0.1):
+    """Poll the page until `condition` holds or `timeout` seconds pass"""
+    selectors = list(dict.fromkeys(condition.selectors()))
+    started = time.monotonic()
+    state = None
+    while True:
+        try:
+            state = driver.execute_script(STATE_JS, selectors)
+        except Exception as e:
+            # Navigation in progress: the old document went away mid-script
+            logger.debug(f"Readiness probe failed: {e}")
+            state = None
+        waited = time.monotonic() - started
+        if state and condition.met(state):
+            return ReadinessResult(True, waited, condition, state)
+        if waited >= timeout:
+            return ReadinessResult(False, waited, condition, state)
+        time.sleep(poll)
+
+
+def navigate_and_wait(driver, url, condition=None, timeout=READY_TIMEOUT, scheduler=None):
+    """Navigate (through the scheduler when given) and wait for readiness, logging the real wait"""
+    condition = condition or page_settled()
+    if scheduler:
+        scheduler.navigate(driver, url)
+    else:
+        driver.get(url)
+    result = wait_until(driver, condition, timeout=timeout)
+    if result.ready:
+        logger.info(f"⏱️ {url} ready after {result.waited:.2f}s")
+    else:
+        logger.warning(f"⏱️ {url} not ready after {result.waited:.2f}s ({condition!r})")
+    return result
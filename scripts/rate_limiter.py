@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Per-Host Request Scheduler
+Token bucket per host that paces every HTTP request and Selenium navigation
+to DELAY_BETWEEN_REQUESTS. A page budget (e.g. test_settings'
+MAX_PAGES_TO_SCRAPE) is opt-in, for one run at a time: see page_budget().
+JSON API calls are paced separately, to API_REQUEST_DELAY, so
+polling loops are not held to the page-load rate.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+try:
+    from settings import RATE_LIMIT_BURST, API_REQUEST_DELAY, API_RATE_LIMIT_BURST
+except ImportError:
+    RATE_LIMIT_BURST = 3
+    API_REQUEST_DELAY = 0.25
+    API_RATE_LIMIT_BURST = 8
+
+try:
+    from test_settings import DELAY_BETWEEN_REQUESTS
+except ImportError:
+    DELAY_BETWEEN_REQUESTS = 2
+
+logger = logging.getLogger(__name__)
+
+
+def is_api_url(url):
+    """JSON API calls: a /api/ path or an api.* host"""
+    parts = urlsplit(url)
+    return '/api/' in parts.path.lower() or parts.netloc.lower().startswith('api.')
+
+
+class PageBudgetExceeded(RuntimeError):
+    """Raised when a run tries to load more pages than its page budget"""
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`.
+
+    Callers reserve a token and get back how long to wait for it. Tokens may go
+    negative, which queues concurrent callers fairly instead of letting them
+    all wake up at the same moment.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """Take one token and return the seconds until it is actually ours;
+        None, taking nothing, when that would be longer than `max_wait`"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """TokenBucket kept in shared memory, so that worker processes started
+    with it (e.g. through a pool initializer) all draw from the one bucket"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.state = multiprocessing.Array('d', [float(burst), time.monotonic()])
+
+    def reserve(self, max_wait=None):
+        with self.state.get_lock():
+            tokens, updated = self.state
+            now = time.monotonic()
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = max(0.0, (1 - tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                self.state[:] = [tokens, now]
+                return None
+            self.state[:] = [tokens - 1, now]
+            return wait
+
+
+class RequestScheduler:
+    """Paces requests per host and counts page loads against a budget.
+
+    `delay` is the steady-state gap between requests to one host; `burst`
+    requests may go out back to back after an idle spell. API calls (see
+    is_api_url) draw from a separate bucket per host with `api_delay` and
+    `api_burst`. A `max_pages` of 0 means no page budget, the default:
+    long-running code never has one, and a one-off run opts in with
+    page_budget().
+    """
+
+    def __init__(self, delay=DELAY_BETWEEN_REQUESTS, burst=RATE_LIMIT_BURST,
+                 max_pages=0,
+                 api_delay=API_REQUEST_DELAY, api_burst=API_RATE_LIMIT_BURST):
+        self.delay = delay
+        self.burst = burst
+        self.api_delay = api_delay
+        self.api_burst = api_burst
+        self.max_pages = max_pages
+        self.buckets = {}
+        self.pages_loaded = 0
+        self.lock = threading.Lock()
+
+    def _bucket_for(self, url, api):
+        key = (urlsplit(url).netloc.lower(), api)
+        with self.lock:
+            if key not in self.buckets:
+                delay, burst = (self.api_delay, self.api_burst) if api else (self.delay, self.burst)
+                self.buckets[key] = TokenBucket(1.0 / delay, burst)
+            return self.buckets[key]
+
+    def shared_buckets(self, url):
+        """Shared-memory page and API buckets for `url`'s host, to hand to
+        worker processes so the whole pool keeps this scheduler's pace"""
+        host = urlsplit(url).netloc.lower()
+        buckets = {}
+        if self.delay:
+            buckets[(host, False)] = SharedTokenBucket(1.0 / self.delay, self.burst)
+        if self.api_delay:
+            buckets[(host, True)] = SharedTokenBucket(1.0 / self.api_delay, self.api_burst)
+        return buckets
+
+    def use_buckets(self, buckets):
+        """Pace these hosts with the given (shared) buckets"""
+        with self.lock:
+            self.buckets.update(buckets)
+
+    def acquire(self, url, max_wait=None):
+        """Block until a request to `url`'s host is allowed; returns the time
+        waited, or None straight away if the slot is more than `max_wait` off"""
+        api = is_api_url(url)
+        if not (self.api_delay if api else self.delay):
+            return 0.0
+        wait = self._bucket_for(url, api).reserve(max_wait)
+        if wait:
+            logger.debug(f"⏳ Pacing {urlsplit(url).netloc}: waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def claim_page(self, url):
+        """Count one page load against the budget"""
+        with self.lock:
+            if self.max_pages and self.pages_loaded >= self.max_pages:
+                raise PageBudgetExceeded(f"Page budget of {self.max_pages} reached, not loading {url}")
+            self.pages_loaded += 1
+
+    def reset_budget(self):
+        with self.lock:
+            self.pages_loaded = 0
+
+    @contextmanager
+    def page_budget(self, max_pages):
+        """Cap page loads at `max_pages` (0 = no cap) for the body of the
+        with-block, counting from zero; the previous budget comes back after"""
+        with self.lock:
+            previous = self.max_pages, self.pages_loaded
+            self.max_pages, self.pages_loaded = max_pages or 0, 0
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.max_pages, self.pages_loaded = previous
+
+    def navigate(self, driver, url):
+        """Selenium driver.get() that respects the page budget and host pacing"""
+        self.claim_page(url)
+        self.acquire(url)
+        driver.get(url)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler shared by sessions and drivers"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+SportyBet Scraper Service
+Resident process that keeps the HTTP session, the Chrome pool, the discovered
+API endpoints and the odds board warm, and serves them over a local JSON API:
+
+  GET  /health                 uptime, pool and board sizes
+  GET  /board                  latest state of every match
+  GET  /deltas?since=<epoch>   change records newer than `since`
+  POST /scrape  {"url": ..., "mode": "http"|"browser"}
+  POST /discover               browser bootstrap: cookies, tokens, API endpoints
+  POST /poll                   one HTTP polling cycle over the discovered endpoints
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import sys
+import os
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from driver_pool import get_driver_pool
+from hybrid_scraper import HybridScraper
+from live_feed import OddsBoard
+from network_capture import NetworkCapture
+from page_readiness import NetworkIdle, DomQuiet
+
+try:
+    from settings import SERVICE_HOST, SERVICE_PORT, SERVICE_DELTA_HISTORY
+except ImportError:
+    SERVICE_HOST = "127.0.0.1"
+    SERVICE_PORT = 8750
+    SERVICE_DELTA_HISTORY = 10000
+
+
+class ScraperService:
+    """The warm state behind the API; one lock serialises work on the shared scraper.
+
+    Each request runs under page_budget(0): the service lives for days, so
+    no budget set on the process-wide scheduler may carry over between calls.
+    """
+
+    def __init__(self):
+        self.scraper = HybridScraper()
+        self.logger = self.scraper.logger
+        self.board = OddsBoard()
+        self.deltas = deque(maxlen=SERVICE_DELTA_HISTORY)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.feed = None
+
+    def record(self, matches):
+        changes = self.board.apply(matches)
+        self.deltas.extend(changes)
+        return changes
+
+    # ------------------------------------------------------------------
+    # Operations
+    # ------------------------------------------------------------------
+    def health(self):
+        return {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started, 1),
+            'drivers': get_driver_pool().created,
+            'endpoints': len(self.scraper.endpoints),
+            'board_matches': len(self.board),
+            'board_updated_at': self.board.updated_at,
+            'feed': bool(self.feed and self.feed.thread and self.feed.thread.is_alive())
+        }
+
+    def board_snapshot(self):
+        return {'matches': list(self.board.snapshot().values()), 'updated_at': self.board.updated_at}
+
+    def deltas_since(self, since=0.0):
+        return {'deltas': [d for d in list(self.deltas) if d['at'] > since]}
+
+    def scrape(self, url, mode='http'):
+        with self.lock, self.scraper.scheduler.page_budget(0):
+            if mode == 'browser':
+                with get_driver_pool().driver() as driver:
+                    capture = NetworkCapture(driver)
+                    capture.capture(url, NetworkIdle() & DomQuiet(), scheduler=self.scraper.scheduler)
+                    matches = [m for r in capture.json_responses() for m in self.scraper.parse_json_matches(r.data)]
+                endpoints = [r.url for r in capture.json_responses()]
+            else:
+                endpoints, script_data = self.scraper.find_api_endpoints_from_source(url, save_source=False)
+                matches = [m for data in script_data for m in self.scraper.parse_json_matches(data)]
+        changes = self.record(matches)
+        return {'url': url, 'mode': mode, 'matches': matches, 'endpoints': endpoints, 'changes': len(changes)}
+
+    def discover(self):
+        with self.lock, self.scraper.scheduler.page_budget(0):
+            matches = self.scraper.bootstrap()
+        changes = self.record(matches)
+        return {'endpoints': list(self.scraper.endpoints), 'feeds': list(self.scraper.websockets),
+                'matches': len(matches), 'changes': len(changes)}
+
+    def poll(self):
+        with self.lock, self.scraper.scheduler.page_budget(0):
+            matches = self.scraper.poll_once()
+        changes = self.record(matches)
+        return {'matches': len(matches), 'deltas': changes}
+
+    def start_feed(self):
+        """Attach the live feed (if the page opened one) to the shared board"""
+        from live_feed import consumer_from_bootstrap
+        with self.lock:
+            self.feed = consumer_from_bootstrap(self.scraper, board=self.board, on_delta=self.deltas.append)
+        self.feed.start()
+
+    def close(self):
+        if self.feed:
+            self.feed.stop()
+        self.scraper.fetch_engine.close()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, payload, started):
+        payload['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _dispatch(self, routes):
+        started = time.perf_counter()
+        parts = urlsplit(self.path)
+        route = routes.get(parts.path)
+        if route is None:
+            self._send(404, {'error': f"No route {self.command} {parts.path}"}, started)
+            return
+        try:
+            self._send(200, route(parse_qs(parts.query)), started)
+        except (ValueError, KeyError) as e:
+            self._send(400, {'error': str(e)}, started)
+        except Exception as e:
+            self.service.logger.error(f"❌ {self.command} {parts.path} failed: {e}")
+            self._send(500, {'error': str(e)}, started)
+
+    def do_GET(self):
+        service = self.service
+        self._dispatch({
+            '/health': lambda q: service.health(),
+            '/board': lambda q: service.board_snapshot(),
+            '/deltas': lambda q: service.deltas_since(float(q.get('since', ['0'])[0])),
+        })
+
+    def do_POST(self):
+        service = self.service
+        self._dispatch({
+            '/scrape': lambda q: service.scrape(**self._scrape_args()),
+            '/discover': lambda q: service.discover(),
+            '/poll': lambda q: service.poll(),
+        })
+
+    def _scrape_args(self):
+        body = self._body()
+        if 'url' not in body:
+            raise ValueError("'url' is required")
+        return {'url': body['url'], 'mode': body.get('mode', 'http')}
+
+    def log_message(self, format, *args):
+        self.service.logger.info(f"🌐 {self.address_string()} {format % args}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Resident scraper service with a local JSON API')
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--warm', action='store_true', help='Start Chrome and run discovery before serving')
+    parser.add_argument('--feed', action='store_true', help='Attach the live WebSocket feed to the board')
+    args = parser.parse_args()
+
+    service = ScraperService()
+    if args.warm or args.feed:
+        get_driver_pool().warm(1)
+        service.discover()
+    if args.feed:
+        service.start_feed()
+
+    ServiceHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    service.logger.info(f"🚀 Scraper service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        service.logger.info("⏹️ Stopped by user")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
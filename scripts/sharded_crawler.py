@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Sharded SportyBet Crawler
+Enumerates the sport -> category -> tournament tree from the site's own links,
+splits the pages across a process pool (each worker with its own session, or
+its own Chrome in browser mode) and merges the shard results into one output.
+
+All workers draw from one shared pacing bucket for the site, so the pool
+sends no more requests than a single process would: politeness, not the
+worker count, caps page throughput. Extra workers only overlap the parsing,
+API probing and browser rendering with the pacing waits.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Add config directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+from fetch_engine import FetchEngine
+from http_transport import create_session
+from odds_delta import match_key
+from rate_limiter import get_scheduler
+
+try:
+    from settings import SPORTYBET_BASE_URL, RATE_LIMIT_BURST
+    from settings import CRAWL_WORKERS, CRAWL_SHARD_SIZE, CRAWL_MAX_DISCOVERY_PAGES
+except ImportError:
+    SPORTYBET_BASE_URL = "https://sportybet.com/ng"
+    RATE_LIMIT_BURST = 3
+    CRAWL_WORKERS = 0
+    CRAWL_SHARD_SIZE = 20
+    CRAWL_MAX_DISCOVERY_PAGES = 200
+
+logger = logging.getLogger(__name__)
+
+# Desktop or mobile ("/m") sport links, with optional category and tournament
+# segments; multi-category links join ids with "_" (sr:category:3_sr:category:6)
+SPORT_LINK = re.compile(
+    r'https?://(?:www\.)?sportybet\.com/(?P<country>[a-z]{2})(?:/m)?/sport/(?P<sport>[a-z][a-z0-9_-]*)'
+    r'(?:/(?P<category>sr:category:\d+(?:_sr:category:\d+)*))?'
+    r'(?:/(?P<tournament>sr:tournament:\d+(?:_sr:tournament:\d+)*))?'
+)
+
+
+def sport_links(html, country):
+    """(sport, category, tournament) triples linked from a page, for one country"""
+    found = set()
+    for link in SPORT_LINK.finditer(html.replace('\\/', '/')):
+        if link['country'] == country:
+            found.add((link['sport'], link['category'], link['tournament']))
+    return found
+
+
+def node_url(base, sport, category=None, tournament=None):
+    return '/'.join(part for part in (base, 'sport', sport, category, tournament) if part)
+
+
+def discover_category_tree(base=SPORTYBET_BASE_URL, max_pages=CRAWL_MAX_DISCOVERY_PAGES):
+    """Breadth-first walk of the home, sport and category pages.
+
+    Returns crawl targets as dicts (sport, category, tournament, url): every
+    tournament, plus every category in which no tournament was linked.
+    """
+    country = urlsplit(base).path.strip('/').split('/')[0]
+    session = create_session()
+    nodes = set()
+    visited = set()
+    frontier = [base]
+
+    # Discovery walks the whole tree, so no page budget applies
+    with FetchEngine(session=session, budgeted=False) as engine:
+        while frontier and len(visited) < max_pages:
+            batch = frontier[:max_pages - len(visited)]
+            frontier = []
+            visited.update(batch)
+            for result in engine.fetch_all(batch):
+                if not result.ok:
+                    logger.warning(f"⚠️ Discovery fetch failed for {result.url}: {result.error}")
+                    continue
+                for sport, category, tournament in sport_links(result.text, country):
+                    nodes.add((sport, category, tournament))
+                    # Sport and category pages list the next level down
+                    if not tournament:
+                        url = node_url(base, sport, category)
+                        if url not in visited and url not in frontier:
+                            frontier.append(url)
+            logger.info(f"🌳 Discovery: {len(visited)} pages read, {len(nodes)} nodes, {len(frontier)} queued")
+
+    with_tournaments = {(s, c) for s, c, t in nodes if t}
+    targets = []
+    for sport, category, tournament in sorted(nodes, key=lambda n: tuple(x or '' for x in n)):
+        if tournament or (category and (sport, category) not in with_tournaments):
+            targets.append({'sport': sport, 'category': category, 'tournament': tournament,
+                            'url': node_url(base, sport, category, tournament)})
+    logger.info(f"✅ Category tree: {len(targets)} crawl targets across "
+                f"{len({t['sport'] for t in targets})} sports")
+    return targets
+
+
+def make_shards(targets, shard_size=CRAWL_SHARD_SIZE):
+    """Fixed-size shards; the pool hands them out as workers free up"""
+    return [targets[i:i + shard_size] for i in range(0, len(targets), shard_size)]
+
+
+# ----------------------------------------------------------------------
+# Worker process side
+# ----------------------------------------------------------------------
+_worker = {}
+
+
+def _init_worker(mode, workers, buckets):
+    """Per-process scraper and session, paced by the pool's shared buckets for
+    the site (any other host gets its rate split across workers) and with no
+    page budget: every target is meant to load"""
+    scheduler = get_scheduler()
+    scheduler.max_pages = 0
+    scheduler.use_buckets(buckets)
+    scheduler.delay = scheduler.delay * workers
+    scheduler.burst = max(1, RATE_LIMIT_BURST // workers)
+    if mode == 'browser':
+        from hybrid_scraper import HybridScraper
+        _worker['scraper'] = HybridScraper()
+    else:
+        from api_scraper import SportyBetAPIecraper
+        _worker['scraper'] = SportyBetAPIecraper()
+    _worker['mode'] = mode
+    _worker['tried'] = set()
+
+
+def fetch_new_endpoints(scraper, urls):
+    """Probe the endpoints this worker has not tried yet and yield the matches
+    from the ones that answer as they download; pages of one site share most
+    endpoints, so each is fetched once per worker rather than once per page"""
+    new = [url for url in urls if url not in _worker['tried']]
+    _worker['tried'].update(new)
+    if new:
+        for info in scraper.test_api_endpoints(new):
+            yield from scraper.extract_matches_from_api(info)
+
+
+def crawl_shard(shard):
+    """Scrape every target of one shard; returns matches tagged with their node"""
+    scraper = _worker['scraper']
+    started = time.monotonic()
+    matches, endpoints, errors = [], set(), []
+
+    for target in shard:
+        try:
+            if _worker['mode'] == 'browser':
+                scraper.pages = [target['url']]
+                found = scraper.bootstrap()
+                endpoints.update(scraper.endpoints)
+            else:
+                page_endpoints, script_data = scraper.find_api_endpoints_from_source(target['url'], save_source=False)
+                endpoints.update(page_endpoints)
+                # API matches are tagged as they stream in
+                found = chain((m for data in script_data for m in scraper.parse_json_matches(data)),
+                              fetch_new_endpoints(scraper, page_endpoints))
+            for match in found:
+                match.update({'sport': target['sport'], 'category': target['category'],
+                              'tournament': target['tournament']})
+                matches.append(match)
+        except Exception as e:
+            errors.append({'url': target['url'], 'error': str(e)})
+
+    return {'pid': os.getpid(), 'pages': len(shard), 'matches': matches, 'endpoints': sorted(endpoints),
+            'errors': errors, 'elapsed': time.monotonic() - started}
+
+
+# ----------------------------------------------------------------------
+# Coordinator
+# ----------------------------------------------------------------------
+def merge_results(results):
+    """One deduplicated view over all shards (the last copy of a match wins)"""
+    merged = {}
+    endpoints = set()
+    errors = []
+    for result in results:
+        for match in result['matches']:
+            merged[match_key(match)] = match
+        endpoints.update(result['endpoints'])
+        errors.extend(result['errors'])
+    return list(merged.values()), sorted(endpoints), errors
+
+
+def crawl(targets, workers=None, mode='http', shard_size=CRAWL_SHARD_SIZE):
+    workers = workers or CRAWL_WORKERS or os.cpu_count() or 1
+    shards = make_shards(targets, shard_size)
+    workers = min(workers, len(shards)) or 1
+    logger.info(f"🚀 Crawling {len(targets)} pages in {len(shards)} shards over {workers} processes ({mode})")
+
+    scheduler = get_scheduler()
+    buckets = scheduler.shared_buckets(SPORTYBET_BASE_URL)
+    started = time.monotonic()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(mode, workers, buckets)) as pool:
+        futures = [pool.submit(crawl_shard, shard) for shard in shards]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            logger.info(f"📦 Shard {done}/{len(shards)} from pid {result['pid']}: {result['pages']} pages, "
+                        f"{len(result['matches'])} matches in {result['elapsed']:.1f}s")
+
+    matches, endpoints, errors = merge_results(results)
+    elapsed = time.monotonic() - started
+    pace = f", pacing allows {1 / scheduler.delay:.2f}/s" if scheduler.delay else ""
+    logger.info(f"⚡ Crawled {len(targets)} pages in {elapsed:.1f}s ({len(targets) / elapsed:.2f} pages/s{pace}): "
+                f"{len(matches)} matches, {len(errors)} errors")
+    return matches, endpoints, errors
+
+
+def save_crawl(targets, matches, endpoints, errors):
+    output_dir = Path("data/raw")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    json_path = output_dir / f"sportybet_crawl_{timestamp}.json"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'targets': targets, 'matches': matches, 'endpoints': endpoints, 'errors': errors},
+                  f, indent=2, ensure_ascii=False)
+    logger.info(f"✅ Crawl saved to {json_path}")
+
+    if matches:
+        import pandas as pd
+        csv_path = output_dir / f"sportybet_crawl_matches_{timestamp}.csv"
+        pd.DataFrame(matches).to_csv(csv_path, index=False)
+        logger.info(f"✅ CSV saved to {csv_path}")
+
+
+def main():
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Crawl every sport and tournament across a process pool')
+    parser.add_argument('--workers', type=int, default=None, help='Processes (default: CRAWL_WORKERS or CPU count)')
+    parser.add_argument('--mode', choices=('http', 'browser'), default='http',
+                        help='http: page source and its API endpoints per worker session; browser: one Chrome per worker')
+    parser.add_argument('--shard-size', type=int, default=CRAWL_SHARD_SIZE)
+    parser.add_argument('--sport', action='append', help='Only crawl these sports (repeatable)')
+    parser.add_argument('--limit', type=int, help='Only crawl the first N targets')
+    args = parser.parse_args()
+
+    targets = discover_category_tree()
+    if args.sport:
+        targets = [t for t in targets if t['sport'] in args.sport]
+    if args.limit:
+        targets = targets[:args.limit]
+    if not targets:
+        logger.error("❌ No crawl targets discovered")
+        return
+
+    matches, endpoints, errors = crawl(targets, workers=args.workers, mode=args.mode, shard_size=args.shard_size)
+    save_crawl(targets, matches, endpoints, errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Page Source Scanner
+One compiled alternation walks a page's source once and reports everything
+find_api_endpoints_from_source looks for: quoted API-looking URLs, baseUrl /
+apiUrl / endpoint config values, <script> boundaries and the positions where
+a JSON object or array can start inside a script. The JSON candidates are
+then decoded whole with raw_decode (json_extract.decode_candidates).
+"""
+
+import re
+from collections import namedtuple
+
+from json_extract import decode_candidates
+
+# URL words that mark a quoted URL as a probable API endpoint
+URL_KEYWORDS = ('api', 'ajax', 'data', 'match', 'event', 'odds')
+CONFIG_KEYS = ('baseUrl', 'apiUrl', 'endpoint')
+# JSON keys that mark an embedded value as match data
+DATA_KEYWORDS = ('match', 'event', 'odds', 'team', 'fixture')
+
+# Every branch starts with one of a handful of characters; the leading
+# lookahead lets the regex engine skip straight between them. Config keys are
+# checked on the text just before a `: "value"` match, since an alternation of
+# words (case-insensitive) would have to be tried at every character. Script
+# tags are matched without their attributes so src URLs are still scanned
+SOURCE_TOKENS = re.compile(r'''
+    (?=["'<{\[:])
+    (?:
+          ["'](?P<url>https?://[^"']*)["']
+        | ["']?\s*:\s*["'](?P<value>[^"']+)["']
+        | (?P<open><script\b)
+        | (?P<close></script\b)
+        | (?P<json>\{(?=\s*")|\[(?=\s*[{\["\d-]))
+    )
+''', re.IGNORECASE | re.VERBOSE)
+
+URL_KEYWORD = re.compile('|'.join(URL_KEYWORDS), re.IGNORECASE)
+LOWER_CONFIG_KEYS = tuple(key.lower() for key in CONFIG_KEYS)
+LONGEST_KEY = max(map(len, CONFIG_KEYS))
+
+SourceScan = namedtuple('SourceScan', ['endpoints', 'config', 'json_values'])
+
+
+def scan_source(html, data_keywords=DATA_KEYWORDS):
+    """SourceScan(endpoints, config, json_values) for a page:
+
+    endpoints    absolute URLs, in first-seen order, that are quoted in the
+                 source and mention an API word, or are configured as a
+                 baseUrl/apiUrl/endpoint
+    config       {config key: [values]} for every baseUrl/apiUrl/endpoint
+    json_values  [(value, start, end)] for each outermost JSON object/array
+                 inside a <script> with a key mentioning a data keyword
+    """
+    endpoints = {}
+    config = {}
+    openers = []
+    in_script = False
+
+    for token in SOURCE_TOKENS.finditer(html):
+        kind = token.lastgroup
+        if kind == 'url' or kind == 'value':
+            value = token[kind]
+            configured = False
+            if kind == 'value':
+                # The key ends where the match starts (or at its closing quote)
+                start = token.start()
+                key = html[max(0, start - LONGEST_KEY - 4):start].rstrip().rstrip('"\'').rstrip()
+                if key.lower().endswith(LOWER_CONFIG_KEYS):
+                    name = next(k for k in CONFIG_KEYS if key.lower().endswith(k.lower()))
+                    config.setdefault(name, []).append(value)
+                    configured = True
+            if value.startswith('http') and (configured or URL_KEYWORD.search(value)):
+                endpoints.setdefault(value, None)
+        elif kind == 'open':
+            in_script = True
+        elif kind == 'close':
+            in_script = False
+        elif in_script:
+            openers.append(token.start())
+
+    json_values = list(decode_candidates(html, openers, data_keywords))
+    return SourceScan(list(endpoints), config, json_values)
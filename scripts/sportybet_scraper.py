@@ -4,13 +4,9 @@ SportyBet Scraper - Stage 3 Clean Version
 Ready for login issue resolution and proper implementation
 """
 
-import requests
 import json
-import time
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
-import pandas as pd
 from pathlib import Path
 import sys
 import os
@@ -18,8 +14,13 @@ import os
 # Add config directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
+from fetch_engine import FetchEngine
+from html_parser import load_document
+from http_transport import create_session
+from rate_limiter import get_scheduler
+
 try:
-    from settings import HEADERS, SPORTYBET_BASE_URL, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
+    from settings import HEADERS, SPORTYBET_LIVE_URL, SPORTYBET_UPCOMING_URL
 except ImportError as e:
     print(f"❌ Error importing settings: {e}")
     print("Using default settings...")
@@ -29,8 +30,8 @@ except ImportError as e:
 
 class SportyBetScraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = create_session()
+        self.fetch_engine = FetchEngine(session=self.session)
         self.setup_logging()
         self.matches_data = []
         
@@ -53,43 +54,62 @@ class SportyBetScraper:
         """Inspect page structure for development"""
         try:
             self.logger.info(f"🔍 Inspecting: {url}")
-            response = self.session.get(url, timeout=30)
+            get_scheduler().claim_page(url)
+            response = self.session.get(url)
             response.raise_for_status()
-            
-            # Save HTML for analysis
-            temp_dir = Path("temp")
-            temp_dir.mkdir(exist_ok=True)
-            
-            html_file = temp_dir / f"{save_name}_{datetime.now().strftime('%H%M%S')}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            
-            self.logger.info(f"📄 Page saved to: {html_file}")
-            self.logger.info(f"📏 Page size: {len(response.text):,} characters")
-            
-            # Quick analysis
-            soup = BeautifulSoup(response.text, 'html.parser')
-            self.logger.info(f"📊 Page analysis:")
-            self.logger.info(f"  • Title: {soup.title.string if soup.title else 'No title'}")
-            self.logger.info(f"  • Scripts: {len(soup.find_all('script'))}")
-            self.logger.info(f"  • Total elements: {len(soup.find_all())}")
-            
-            return response.text
+            return self.analyze_page_source(response.text, save_name)
             
         except Exception as e:
             self.logger.error(f"❌ Error inspecting {url}: {e}")
             return None
+            
+    def analyze_page_source(self, html, save_name):
+        """Save and summarise an already fetched page"""
+        # Save HTML for analysis
+        temp_dir = Path("temp")
+        temp_dir.mkdir(exist_ok=True)
+        
+        html_file = temp_dir / f"{save_name}_{datetime.now().strftime('%H%M%S')}.html"
+        with open(html_file, 'w', encoding='utf-8') as f:
+            f.write(html)
+        
+        self.logger.info(f"📄 Page saved to: {html_file}")
+        self.logger.info(f"📏 Page size: {len(html):,} characters")
+        
+        # Quick analysis
+        document = load_document(html)
+        self.logger.info(f"📊 Page analysis:")
+        self.logger.info(f"  • Title: {document.title or 'No title'}")
+        self.logger.info(f"  • Scripts: {document.count('script')}")
+        self.logger.info(f"  • Total elements: {document.count()}")
+        
+        return html
+        
+    def fetch_pages_concurrently(self, pages):
+        """Fetch (url, save_name) pairs in parallel and analyse each page"""
+        results = self.fetch_engine.fetch_all([url for url, _ in pages])
+        
+        html_by_name = {}
+        for (url, save_name), result in zip(pages, results):
+            if result.ok:
+                self.logger.info(f"🔍 Inspecting: {url} ({result.elapsed:.2f}s)")
+                html_by_name[save_name] = self.analyze_page_source(result.text, save_name)
+            else:
+                self.logger.error(f"❌ Error inspecting {url}: {result.error}")
+                html_by_name[save_name] = None
+        return html_by_name
         
     def parse_matches(self, html_content, source="unknown"):
         """Parse match data from HTML - PLACEHOLDER FOR IMPLEMENTATION"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Usually already parsed by analyze_page_source
+        document = load_document(html_content)
         matches = []
         
         self.logger.info(f"🔍 Analyzing {source} page structure...")
         
         # Check if this is the SPA loading page
-        app_div = soup.find('div', {'id': 'app'})
-        if app_div and 'logoLoading' in str(soup):
+        app_div = document.soup.find('div', {'id': 'app'})
+        if app_div and 'logoLoading' in html_content:
             self.logger.warning(f"⚠️ {source} is loading page, content is rendered by JavaScript")
             self.logger.info("💡 This confirms SportyBet uses a Single Page Application (SPA)")
             self.logger.info("🎯 Next step: Use Selenium or API endpoints for dynamic content")
@@ -103,7 +123,7 @@ class SportyBetScraper:
         ]
         
         for selector in potential_selectors:
-            elements = soup.select(selector)
+            elements = document.select(selector)
             if elements:
                 self.logger.info(f"✅ Found {len(elements)} elements with selector: {selector}")
                 break
@@ -112,24 +132,26 @@ class SportyBetScraper:
         
         return matches
         
-    def scrape_upcoming_matches(self):
-        """Scrape upcoming matches"""
+    def scrape_upcoming_matches(self, html=None):
+        """Scrape upcoming matches (pass prefetched html to skip the fetch)"""
         self.logger.info("🔍 Scraping upcoming matches...")
         
         # First inspect the page structure
-        html = self.inspect_page_structure(SPORTYBET_UPCOMING_URL, "upcoming_matches")
+        if html is None:
+            html = self.inspect_page_structure(SPORTYBET_UPCOMING_URL, "upcoming_matches")
         
         if html:
             matches = self.parse_matches(html, "upcoming")
             self.matches_data.extend(matches)
             self.logger.info(f"Found {len(matches)} upcoming matches")
             
-    def scrape_live_matches(self):
-        """Scrape live matches"""
+    def scrape_live_matches(self, html=None):
+        """Scrape live matches (pass prefetched html to skip the fetch)"""
         self.logger.info("🔍 Scraping live matches...")
         
         # First inspect the page structure  
-        html = self.inspect_page_structure(SPORTYBET_LIVE_URL, "live_matches")
+        if html is None:
+            html = self.inspect_page_structure(SPORTYBET_LIVE_URL, "live_matches")
         
         if html:
             matches = self.parse_matches(html, "live")
@@ -174,9 +196,15 @@ class SportyBetScraper:
         self.logger.info("🚀 Starting SportyBet Stage 3 Analysis...")
         
         try:
-            # Analyze both page types
-            self.scrape_upcoming_matches()
-            self.scrape_live_matches()
+            # Fetch both page types at once, then analyze them
+            pages = self.fetch_pages_concurrently([
+                (SPORTYBET_UPCOMING_URL, "upcoming_matches"),
+                (SPORTYBET_LIVE_URL, "live_matches")
+            ])
+            if pages["upcoming_matches"]:
+                self.scrape_upcoming_matches(pages["upcoming_matches"])
+            if pages["live_matches"]:
+                self.scrape_live_matches(pages["live_matches"])
             
             # Save analysis report
             self.save_data()
@@ -187,7 +215,17 @@ class SportyBetScraper:
         except Exception as e:
             self.logger.error(f"❌ Error during analysis: {e}")
             raise
+        finally:
+            self.fetch_engine.close()
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SportyBet page scraper')
+    parser.add_argument('--max-pages', type=int, default=0,
+                        help='Stop after this many page loads (e.g. 2 while testing; default: no limit)')
+    args = parser.parse_args()
+
     scraper = SportyBetScraper()
-    scraper.run()
+    with get_scheduler().page_budget(args.max_pages):
+        scraper.run()